@@ -1,51 +1,714 @@
-from dataclasses import dataclass
-from benday_rust import is_math_parsable, math_expression
+import operator
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Callable, Generator
+from backends import is_math_parsable, math_expression
 
-variables: dict[str, str | float | int | bool] = {}
+from math_foncs import PRECEDENCES, MathNode, parse_math_expression
+from Interpreter.Limits import Budget, ExecutionLimits, LARGE_INT, is_large
+from Interpreter.Trampoline import Recursion, trampoline
 
+Value = str | float | int | bool | None
+Frame = list[Value]
+"""Valeurs des variables d’une exécution, rangées selon le slot attribué à chaque nom."""
+Closure = Callable[[Frame], Value]
+"""Fermeture compilée d’un nœud - l’appeler avec une frame revient à exécuter le nœud."""
 
-def expand_variables(expression: str):
+UNDEFINED = object()
+"""Valeur d’un slot dont la variable n’a pas encore été assignée."""
+BUDGET_SLOT: int = 0
+"""Slot du décompte ('Budget') de l’exécution de la frame - les variables ont les slots suivants.
+Chaque exécution a ainsi son propre décompte, même quand plusieurs partagent le même programme."""
+
+# Événements d’une exécution : (genre, valeur)
+PRINT_EVENT: str = "print"  # valeur affichée
+ASSIGN_EVENT: str = "assign"  # (nom, valeur) de la variable assignée
+RETURN_EVENT: str = "return"  # valeur de retour du programme - fin de l’exécution
+ERROR_EVENT: str = "error"  # message de l’erreur - fin de l’exécution
+LIMIT_EVENT: str = "limit"  # limite dépassée ('LimitExceeded') - fin de l’exécution
+PROFILE_EVENT: str = "profile"  # mesures du profileur, avant la fin d’une exécution profilée
+
+# Types déclarés des variables (ceux de 'Constantes.TYPES')
+INT_TYPE: str = "Int"
+FLOAT_TYPE: str = "Float"
+BOOL_TYPE: str = "Bool"
+STRING_TYPE: str = "String"
+NUMBER_TYPE: str = "Number"
+"""Type connu avant l’exécution d’un calcul normalisé : un entier ou un flottant (voir 'static_type')."""
+
+NUMBER_TYPES: tuple[str, ...] = (INT_TYPE, FLOAT_TYPE, NUMBER_TYPE)
+
+VALUE_TYPES: dict[type, str] = {bool: BOOL_TYPE, int: INT_TYPE, float: FLOAT_TYPE, str: STRING_TYPE, type(None): "None"}
+
+Event = tuple[str, Value | tuple[str, Value]]
+Steps = Generator[Event | None, None, Value]
+"""Exécution pas à pas d’un nœud : chaque instruction produit son événement (ou None),
+et la valeur renvoyée à la fin est celle de 'execute'."""
+
+
+@dataclass(slots=True)
+class Template:
+	"""Texte découpé une seule fois en morceaux littéraux et en noms de variables ('{nom}').
+	Le rendu remplit les trous et joint les morceaux en une seule opération."""
+	parts: list[str]
+	holes: tuple[tuple[int, str], ...]
+	"""Index dans 'parts' et nom de la variable de chaque trou."""
+	may_be_math: bool
+	"""Indique si le texte rendu peut être un calcul - sinon il est gardé tel quel,
+	sans passer par 'is_math_parsable' et 'math_expression'."""
+	
+	def __init__(self, text: str):
+		self.parts = []
+		holes = []
+		start = 0
+		while (first_curly := text.find("{", start)) != -1:
+			next_curly = text.find("}", first_curly)
+			if next_curly == -1: break
+			if first_curly > start:
+				self.parts.append(text[start:first_curly])
+			holes.append((len(self.parts), text[first_curly + 1:next_curly]))
+			self.parts.append("")
+			start = next_curly + 1
+		if start < len(text) or not self.parts:
+			self.parts.append(text[start:])
+		self.holes = tuple(holes)
+		self.may_be_math = self.words_may_be_math()
+	
+	def words_may_be_math(self) -> bool:
+		"""Un calcul n’est fait que de nombres et d’opérateurs : un mot entier du texte (qui ne touche
+		pas une variable) qui n’est ni l’un ni l’autre l’empêche, quelles que soient les valeurs."""
+		hole_indexes = {index for index, _ in self.holes}
+		for index, part in enumerate(self.parts):
+			if index in hole_indexes: continue
+			words = part.split(" ")
+			if index - 1 in hole_indexes: words = words[1:]
+			if index + 1 in hole_indexes: words = words[:-1]
+			for word in words:
+				if word not in PRECEDENCES and not is_number_token(word): return False
+		return True
+	
+	def render(self, values: dict[str, Value]) -> str:
+		"""Renvoie le texte avec la valeur des variables à la place de leur nom."""
+		if not self.holes: return self.parts[0]
+		parts = self.parts.copy()
+		for index, name in self.holes:
+			parts[index] = str(values[name])
+		return "".join(parts)
+
+
+def expand_variables(expression: str, variables: dict[str, Value]) -> str:
 	"""Remplace le nom des variables par leur valeur."""
-	first_curly = expression.find("{")
-	if first_curly == -1:
-		return expression
-	else:
-		next_curly = expression[first_curly:].find("}")
-		to_replace = expression[first_curly:first_curly + next_curly + 1]
-		var_name = to_replace[1:-1]
-		return expand_variables(expression.replace(to_replace, str(variables[var_name])))
+	return Template(expression).render(variables)
+
+
+class TypeMismatch(TypeError):
+	"""Valeur assignée à une variable qui n’est pas de son type déclaré."""
+	
+	def __init__(self, name: str, declared: str, found: str):
+		super().__init__(f"'{name}' is declared {declared} but its value is {found}")
+		self.name = name
+		self.declared = declared
+		self.found = found
+
+
+class Resolver:
+	"""Attribue à chaque nom de variable un index (slot) dans la frame d’exécution."""
+	
+	def __init__(self, profiler=None):
+		self.slots: dict[str, int] = {}
+		self.types: dict[str, str] = {}
+		"""Type des variables dont les valeurs sont toujours du même type ('declared_types')."""
+		self.profiler = profiler
+		"""Profileur ('Interpreter.Profiler') qui mesure chaque nœud compilé, s’il y en a un."""
+	
+	def slot(self, name: str) -> int:
+		"""Renvoie le slot d’une variable, en lui en attribuant un nouveau si besoin."""
+		slot = self.slots.get(name)
+		if slot is None:
+			slot = self.slots[name] = len(self.slots) + 1  # Après 'BUDGET_SLOT'.
+		return slot
+	
+	@property
+	def names(self) -> list[str]: return list(self.slots)
+	
+	def compile(self, node: "ASTNode") -> Closure:
+		"""Compile un nœud (et le mesure si le programme est profilé).
+		Les séquences imbriquées sont compilées par 'trampoline' : leur profondeur n’est pas limitée."""
+		return trampoline(self.compiling(node))
+	
+	def compiling(self, node: "ASTNode") -> Recursion:
+		closure = yield node.compiling(self)
+		if self.profiler is not None:
+			closure = self.profiler.wrap(node, closure)
+		return closure
 
 
 class ASTNode:
 	"""Nœud de l’Abstract Syntax Tree - Correspond également à un bloc et à une fonction."""
+	content_key: bytes | None = None
+	"""Empreinte du contenu du nœud, calculée une seule fois (voir 'Interpreter.Bytecode.content_key') :
+	un nœud n’est jamais modifié après sa construction."""
+	
+	def execute(self, variables: dict[str, Value], budget: Budget | None = None) -> Value:
+		"""Exécute la fonction de ce nœud et renvoie (où non) une valeur.
+		Les instructions décomptent leur exécution dans le budget : créé au premier nœud, il est transmis
+		à tous les autres, y compris aux instructions placées dans un slot."""
+	
+	def compile(self, resolver: Resolver) -> Closure:
+		"""Compile le nœud une seule fois en une fermeture Python équivalente à 'execute'."""
+		raise NotImplementedError(f"'compile' is not implemented in "
+		                          f"'{self.__class__.__name__}' class")
+	
+	def compiling(self, resolver: Resolver) -> Recursion:
+		"""Compile le nœud en parcours récursif (voir 'Interpreter.Trampoline') : les nœuds qui contiennent
+		des séquences le redéfinissent pour compiler leurs enfants sans récursion Python."""
+		return self.compile(resolver)
+		yield  # Fait de la méthode un générateur.
+	
+	def steps(self, variables: dict[str, Value]) -> Steps:
+		"""Exécute le nœud pas à pas, en s’interrompant à chaque instruction.
+		Un nœud sans instruction (une valeur) s’exécute en une seule fois. Les slots sont eux aussi évalués
+		pas à pas : une instruction placée dans un slot (une boucle) s’interrompt comme les autres."""
+		return self.execute(variables)
+		yield  # Fait de la méthode un générateur.
+
+
+@dataclass(slots=True)
+class Program:
+	"""Programme compilé - chaque exécution a sa propre frame (et son propre décompte), indépendante des autres."""
+	body: Closure
+	names: list[str]
+	"""Nom de la variable de chaque slot (à partir du slot 1)."""
 	
-	def execute(self) -> str | float | int | bool | None:
-		"""Exécute la fonction de ce nœud et renvoie (où non) une valeur"""
+	def new_frame(self) -> Frame:
+		return [None] + [UNDEFINED] * len(self.names)
+	
+	def run(self, frame: Frame | None = None, limits: ExecutionLimits | None = None) -> Value:
+		"""Exécute le programme et renvoie sa valeur de retour.
+		Lève 'LimitExceeded' si l’exécution dépasse ses limites."""
+		if frame is None: frame = self.new_frame()
+		frame[BUDGET_SLOT] = Budget(limits)
+		return self.body(frame)
+	
+	def variables(self, frame: Frame) -> dict[str, Value]:
+		"""Renvoie les variables assignées d’une frame selon leur nom."""
+		return {name: value for name, value in zip(self.names, frame[1:]) if value is not UNDEFINED}
+
+
+def compile_program(node: ASTNode, profiler=None) -> Program:
+	"""Attribue un slot à chaque variable du programme et le compile en fermetures
+	(mesurées par le profileur donné)."""
+	resolver = Resolver(profiler)
+	resolver.types = declared_types(node)
+	body = resolver.compile(node)
+	return Program(body, resolver.names)
 
 
 @dataclass(slots=True)
 class ASTNodeValue(ASTNode):
 	value: str
+	template: Template | None = field(init=False, repr=False, compare=False)
+	
+	def __post_init__(self):
+		self.template = Template(self.value) if type(self.value) is str else None
 	
-	def execute(self) -> str | float | int | bool | None:
-		if type(self.value) is str:
-			expression = expand_variables(self.value)
+	def execute(self, variables: dict[str, Value], budget: Budget | None = None) -> Value:
+		if self.template is not None:
+			expression = self.template.render(variables)
+			if self.template.may_be_math and is_math_parsable(expression):
+				return math_expression(expression)
+			return expression
+		return self.value
+	
+	def compile(self, resolver: Resolver) -> Closure:
+		value = self.value
+		if self.template is None:
+			return lambda frame: value
+		if not self.template.may_be_math:
+			return ASTNodeText(self.value).compile(resolver)  # Le texte rendu n’est jamais un calcul.
+		parts = self.template.parts
+		holes = tuple((index, resolver.slot(name), name) for index, name in self.template.holes)
+		
+		def value_closure(frame: Frame) -> Value:
+			filled = parts.copy()
+			for index, slot, name in holes:
+				hole_value = frame[slot]
+				if hole_value is UNDEFINED: raise KeyError(name)
+				filled[index] = str(hole_value)
+			expression = "".join(filled)
 			if is_math_parsable(expression):
 				return math_expression(expression)
 			return expression
+		
+		return value_closure
+
+
+@dataclass(slots=True)
+class ASTNodeText(ASTNodeValue):
+	"""Texte d’un slot assigné à une variable de type "String" : ses variables sont remplacées
+	par leur valeur, mais il n’est jamais évalué comme un calcul."""
+	
+	def execute(self, variables: dict[str, Value], budget: Budget | None = None) -> str:
+		return self.template.render(variables)
+	
+	def compile(self, resolver: Resolver) -> Closure:
+		parts = self.template.parts
+		if not self.template.holes:
+			text = parts[0]
+			return lambda frame: text
+		holes = tuple((index, resolver.slot(name), name) for index, name in self.template.holes)
+		
+		def text_closure(frame: Frame) -> str:
+			filled = parts.copy()
+			for index, slot, name in holes:
+				hole_value = frame[slot]
+				if hole_value is UNDEFINED: raise KeyError(name)
+				filled[index] = str(hole_value)
+			return "".join(filled)
+		
+		return text_closure
+
+
+@dataclass(slots=True)
+class ASTNodeLiteral(ASTNode):
+	"""Valeur déjà connue à la construction de l’AST (nombre, texte ou rien)."""
+	value: Value
+	
+	def execute(self, variables: dict[str, Value], budget: Budget | None = None) -> Value:
 		return self.value
+	
+	def compile(self, resolver: Resolver) -> Closure:
+		value = self.value
+		return lambda frame: value
+
+
+@dataclass(slots=True)
+class ASTNodeVariable(ASTNode):
+	"""Lecture de la valeur d’une variable."""
+	name: str
+	
+	def execute(self, variables: dict[str, Value], budget: Budget | None = None) -> Value:
+		return variables[self.name]
+	
+	def compile(self, resolver: Resolver) -> Closure:
+		name = self.name
+		slot = resolver.slot(name)
+		
+		def variable_closure(frame: Frame) -> Value:
+			value = frame[slot]
+			if value is UNDEFINED: raise KeyError(name)
+			return value
+		
+		return variable_closure
+
+
+@dataclass(slots=True)
+class ASTNodeOperation(ASTNode):
+	"""Calcul entre nœuds numériques, en notation polonaise inverse : les opérandes (des nœuds)
+	et les opérateurs (des textes) sont rangés dans l’ordre de leur évaluation, sans imbrication.
+	Un calcul de milliers d’opérandes s’exécute et se compile donc sans récursion."""
+	rpn: list[ASTNode | str]
+	
+	def execute(self, variables: dict[str, Value], budget: Budget | None = None) -> float | int | bool:
+		stack = []
+		for item in self.rpn:
+			if type(item) is str:
+				right = stack.pop()
+				stack[-1] = OPERATORS[item](stack[-1], right)
+			else:
+				stack.append(item.execute(variables))
+		return stack[0]
+	
+	def depth(self) -> int:
+		"""Renvoie la profondeur de l’arbre du calcul (1 pour un seul opérande)."""
+		depths = []
+		for item in self.rpn:
+			if type(item) is str:
+				right = depths.pop()
+				depths[-1] = max(depths[-1], right) + 1
+			else:
+				depths.append(1)
+		return depths[0]
+	
+	def compile(self, resolver: Resolver) -> Closure:
+		if self.depth() <= MAX_GENERATED_DEPTH:
+			return generate_operation(self, resolver)
+		
+		# Trop profond pour une fonction générée : le calcul est évalué sur une pile.
+		program = tuple((OPERATORS[item], True) if type(item) is str else (resolver.compile(item), False)
+		                for item in self.rpn)
+		
+		def operation_closure(frame: Frame) -> float | int | bool:
+			stack = []
+			for function, is_operator in program:
+				if is_operator:
+					right = stack.pop()
+					stack[-1] = function(stack[-1], right)
+				else:
+					stack.append(function(frame))
+			return stack[0]
+		
+		return operation_closure
+
+
+OPERATORS: dict[str, Callable[[Value, Value], Value]] = {
+	"+": operator.add, "-": operator.sub, "*": operator.mul, "/": operator.truediv, ">": operator.gt, "<": operator.lt}
+
+MAX_GENERATED_DEPTH: int = 100
+"""Profondeur au-delà de laquelle un calcul compilé est évalué sur une pile plutôt que par une
+fonction générée (dont la compilation par Python serait trop imbriquée)."""
+
+
+@dataclass(slots=True)
+class GeneratedClosure:
+	"""Source d’une fermeture générée d’un seul tenant, sans appel par opérande. Les valeurs qu’elle
+	utilise lui sont passées en arguments : seuls des slots et des nombres entiers sont écrits dans le source."""
+	lines: list[str] = field(default_factory=list)
+	values: dict[str, object] = field(default_factory=dict)
+	
+	def bind(self, value: object) -> str:
+		"""Renvoie le nom sous lequel la fermeture lit une valeur."""
+		name = f"_{len(self.values)}"
+		self.values[name] = value
+		return name
+	
+	def build(self, name: str) -> Closure:
+		return closure_factory(name, tuple(self.values), "\n".join(self.lines))(*self.values.values())
+
+
+@lru_cache(maxsize=1024)
+def closure_factory(name: str, arguments: tuple[str, ...], body: str) -> Callable[..., Closure]:
+	"""Compile une seule fois chaque source : les calculs de même forme partagent leur code."""
+	lines = "".join(f"\n\t\t{line}" for line in body.split("\n"))
+	source = f"def factory({', '.join(arguments)}):\n\tdef {name}(frame):{lines}\n\treturn {name}"
+	namespace = {}
+	exec(source, {"UNDEFINED": UNDEFINED, "normalize": normalize, "is_large": is_large, "LARGE_INT": LARGE_INT},
+	     namespace)
+	return namespace["factory"]
+
+
+def operation_source(rpn: list[ASTNode | str], resolver: Resolver, generated: GeneratedClosure,
+                     reads: dict[int, str]) -> str:
+	"""Écrit le calcul en une expression Python, avec les seules parenthèses nécessaires (les priorités
+	des opérateurs sont celles de Python, mais les comparaisons Python s’enchaînent au lieu de s’imbriquer).
+	Chaque variable lue est notée dans 'reads' et lue dans 'v<slot>'."""
+	operands: list[tuple[str, int]] = []
+	"""Texte et priorité de chaque opérande en attente (celle d’un nombre ou d’une variable est la plus haute)."""
+	for item in rpn:
+		if type(item) is str:
+			precedence = PRECEDENCES[item]
+			right, right_precedence = operands.pop()
+			left, left_precedence = operands[-1]
+			if left_precedence < precedence or left_precedence == precedence == 0: left = f"({left})"
+			if right_precedence <= precedence: right = f"({right})"
+			operands[-1] = f"{left} {item} {right}", precedence
+		elif type(item) is ASTNodeVariable:
+			slot = resolver.slot(item.name)
+			reads[slot] = item.name
+			operands.append((f"v{slot}", ATOM_PRECEDENCE))
+		elif type(item) is ASTNodeLiteral and type(item.value) is int:
+			operands.append((f"({item.value})" if item.value < 0 else str(item.value), ATOM_PRECEDENCE))
+		elif type(item) is ASTNodeLiteral:
+			operands.append((generated.bind(item.value), ATOM_PRECEDENCE))
+		else:
+			operands.append((f"{generated.bind(resolver.compile(item))}(frame)", ATOM_PRECEDENCE))
+	return operands[0][0]
+
+
+ATOM_PRECEDENCE: int = max(PRECEDENCES.values()) + 1
+
+
+def generate_operation(operation: ASTNodeOperation, resolver: Resolver, names: list[str] = (),
+                       fallback: Closure | None = None, normalizing: bool = False,
+                       target: int | None = None) -> Closure:
+	"""Génère la fermeture d’un calcul : elle lit ses variables dans la frame, calcule l’expression
+	et normalise le résultat (si 'normalizing') en un seul appel.
+	- Si une des variables 'names' n’est pas un nombre, c’est la valeur de 'fallback' qui est utilisée.
+	- Les autres variables lues ne sont vérifiées que si elles ne sont pas encore assignées.
+	- La valeur est renvoyée, ou rangée dans le slot 'target' (une assignation)."""
+	generated = GeneratedClosure()
+	checked = {resolver.slot(name): name for name in names}
+	reads = dict(checked)
+	expression = operation_source(operation.rpn, resolver, generated, reads)
+	store = "return {}" if target is None else f"frame[{target}] = {{}}"
+	
+	generated.lines += [f"v{slot} = frame[{slot}]" for slot in reads]
+	if checked:
+		condition = " or ".join(f"type(v{slot}) is not int and type(v{slot}) is not float" for slot in checked)
+		generated.lines += [f"if {condition}:", "\t" + store.format(f"{generated.bind(fallback)}(frame)")]
+		if target is not None:
+			generated.lines += [f"\tif is_large(frame[{target}]): frame[{BUDGET_SLOT}].check(frame)", "\treturn"]
+	for slot, name in reads.items():
+		if slot not in checked:
+			generated.lines.append(f"if v{slot} is UNDEFINED: raise KeyError({generated.bind(name)})")
+	
+	if normalizing:
+		generated.lines += [f"result = {expression}", store.format("result if type(result) is int else normalize(result)")]
+	elif target is None:
+		generated.lines.append(store.format(expression))
+	else:
+		generated.lines += [f"result = {expression}", store.format("result")]
+	if target is not None:  # Un nombre assigné n’est grand ('is_large') que s’il dépasse 'LARGE_INT'.
+		generated.lines.append(f"if abs(result) >= LARGE_INT: frame[{BUDGET_SLOT}].check(frame)")
+	return generated.build("operation_closure" if target is None else "assignment_closure")
+
+
+@dataclass(slots=True)
+class ASTNodeMathExpression(ASTNode):
+	"""Expression mathématique déjà analysée contenant des variables.
+	Si une des variables n’est pas un nombre, le texte du slot est évalué comme avant."""
+	operation: ASTNodeOperation
+	names: list[str]
+	text: str
+	
+	def execute(self, variables: dict[str, Value], budget: Budget | None = None) -> float | int | str:
+		for name in self.names:
+			if type(variables[name]) not in (int, float):
+				return ASTNodeValue(self.text).execute(variables)
+		return normalize(self.operation.execute(variables))
+	
+	def compile(self, resolver: Resolver) -> Closure:
+		if self.operation.depth() <= MAX_GENERATED_DEPTH:
+			return self.generate(resolver)
+		
+		operation = resolver.compile(self.operation)
+		slots = tuple(resolver.slot(name) for name in self.names)
+		fallback = resolver.compile(ASTNodeValue(self.text))
+		
+		def math_expression_closure(frame: Frame) -> float | int | str:
+			for slot in slots:
+				value_type = type(frame[slot])
+				if value_type is not int and value_type is not float:
+					return fallback(frame)
+			return normalize(operation(frame))
+		
+		return math_expression_closure
+	
+	def generate(self, resolver: Resolver, target: int | None = None) -> Closure:
+		"""Génère la fermeture du calcul (voir 'generate_operation'), qui range sa valeur dans le slot
+		'target' s’il y en a un."""
+		if all(resolver.types.get(name) in (INT_TYPE, FLOAT_TYPE) for name in self.names):
+			# Les variables sont toujours des nombres : ni vérification, ni texte de secours.
+			# Un calcul entier donne déjà un entier.
+			normalizing = static_type(self.operation, resolver.types) != INT_TYPE
+			return generate_operation(self.operation, resolver, normalizing=normalizing, target=target)
+		return generate_operation(self.operation, resolver, self.names, resolver.compile(ASTNodeValue(self.text)),
+		                          True, target)
+
+
+def normalize(result: float | int | bool) -> float | int:
+	"""Renvoie un entier si le résultat d’un calcul est entier (comme 'math_expression').
+	Les flottants non finis (nan, inf) restent des flottants."""
+	if type(result) is float and not result.is_integer(): return result
+	return int(result)
+
+
+def type_of(value: Value) -> str:
+	"""Renvoie le nom du type d’une valeur."""
+	return VALUE_TYPES.get(type(value), type(value).__name__)
+
+
+def coerce(name: str, value: Value, declared: str) -> Value:
+	"""Convertit la valeur assignée au type déclaré de sa variable : un entier devient un flottant,
+	0 et 1 (les résultats des comparaisons) deviennent des booléens et toute valeur peut devenir un texte.
+	Lève 'TypeMismatch' pour les autres valeurs."""
+	found = type_of(value)
+	if found == declared: return value
+	if declared == STRING_TYPE: return str(value)
+	if declared == FLOAT_TYPE and found == INT_TYPE: return float(value)
+	if declared == BOOL_TYPE and found == INT_TYPE and value in (0, 1): return bool(value)
+	raise TypeMismatch(name, declared, found)
+
+
+def static_type(node: ASTNode, types: dict[str, str]) -> str | None:
+	"""Renvoie le type que la valeur du nœud a à chaque exécution, s’il est connu avant (sinon None).
+	Un calcul normalisé dont le résultat peut être entier ou non est de type "Number"."""
+	match node:
+		case ASTNodeLiteral(value=value):
+			return type_of(value)
+		case ASTNodeText():
+			return STRING_TYPE
+		case ASTNodeVariable(name=name):
+			return types.get(name)
+		case ASTNodeOperation(rpn=rpn):
+			operand_types = []
+			for item in rpn:
+				if type(item) is not str:
+					operand_types.append(static_type(item, types))
+					continue
+				right_type = operand_types.pop()
+				left_type = operand_types[-1]
+				if left_type not in NUMBER_TYPES or right_type not in NUMBER_TYPES:
+					operand_types[-1] = None
+				elif item in ("<", ">"):
+					operand_types[-1] = BOOL_TYPE
+				elif item == "/" or FLOAT_TYPE in (left_type, right_type):
+					operand_types[-1] = FLOAT_TYPE
+				elif left_type == right_type == INT_TYPE:
+					operand_types[-1] = INT_TYPE
+				else:
+					operand_types[-1] = NUMBER_TYPE
+			return operand_types[0]
+		case ASTNodeMathExpression(operation=operation, names=names):
+			if any(types.get(name) not in (INT_TYPE, FLOAT_TYPE) for name in names): return None
+			operation_type = static_type(operation, types)
+			if operation_type in (INT_TYPE, BOOL_TYPE): return INT_TYPE  # Un booléen est normalisé en entier.
+			if operation_type in (FLOAT_TYPE, NUMBER_TYPE): return NUMBER_TYPE  # Un flottant entier aussi.
+	return None
+
+
+def check_type(node: "ASTNodeVariableAssignment", types: dict[str, str]) -> str | None:
+	"""Vérifie avant l’exécution le type de la valeur d’une assignation typée, et renvoie son type
+	s’il est connu. Lève 'TypeMismatch' seulement si la valeur ne pourra jamais être convertie au type
+	déclaré : si elle le peut selon sa valeur (ex: un "Number" assigné à un "Int"), renvoie None et
+	'coerce' la vérifie à l’exécution."""
+	found = static_type(node.value, types)
+	declared = node.type
+	if found is None or found == declared or declared == STRING_TYPE: return found
+	if declared == FLOAT_TYPE and found in (INT_TYPE, NUMBER_TYPE): return found
+	if (declared, found) in ((INT_TYPE, NUMBER_TYPE), (BOOL_TYPE, INT_TYPE), (BOOL_TYPE, NUMBER_TYPE)): return None
+	raise TypeMismatch(node.name, declared, found)
+
+
+def declared_types(node: ASTNode) -> dict[str, str]:
+	"""Renvoie le type des variables dont toutes les assignations déclarent le même type :
+	leurs valeurs sont toujours de ce type."""
+	types: dict[str, str | None] = {}
+	statements = [node]
+	while statements:
+		match statements.pop():
+			case ASTNodeSequence(elements=elements):
+				statements.extend(elements)
+			case ASTNodeIfElse(if_sequence=if_sequence, elifs=elifs, else_sequence=else_sequence):
+				statements.append(if_sequence)
+				statements.extend(sequence for _, sequence in elifs)
+				if else_sequence is not None: statements.append(else_sequence)
+			case ASTNodeWhile(sequence=sequence):
+				statements.append(sequence)
+			case ASTNodeVariableAssignment(name=name, type=declared):
+				types[name] = declared if types.get(name, declared) == declared else None
+	return {name: declared for name, declared in types.items() if declared is not None}
+
+
+def parse_slot(text: str | None) -> ASTNode:
+	"""Analyse une seule fois le texte d’un slot et renvoie le nœud typé correspondant :
+	un littéral, une variable, une expression mathématique ou, à défaut, une valeur à évaluer."""
+	if not text:
+		return ASTNodeLiteral(None)
+	
+	tokens = text.split(" ")
+	if len(tokens) == 1 and is_variable_token(text):
+		return ASTNodeVariable(text[1:-1])
+	
+	if not is_math_tokens(tokens):
+		return ASTNodeValue(text) if "{" in text else ASTNodeLiteral(text)
+	
+	math_tree = parse_math_expression(tokens)
+	names = list(dict.fromkeys(token[1:-1] for token in tokens[::2] if is_variable_token(token)))
+	if names:
+		return ASTNodeMathExpression(math_as_AST(math_tree), names, text)
+	if type(math_tree) is MathNode:
+		return ASTNodeValue(text)  # Calcul impossible (ex: division par zéro), l’erreur sera levée à l’exécution.
+	return ASTNodeLiteral(normalize(math_tree))
+
+
+def math_as_AST(math_node: MathNode | float | bool | str) -> ASTNodeOperation:
+	"""Convertit l’arbre de 'parse_math_expression' en une opération, sans récursion :
+	ses nœuds sont parcourus avec une pile, dans l’ordre de la notation polonaise inverse."""
+	rpn = []
+	stack = [math_node]
+	while stack:
+		node = stack.pop()
+		if type(node) is MathNode:
+			stack += [node.operator, node.right, node.left]
+		elif type(node) is str and node in PRECEDENCES:
+			rpn.append(node)
+		elif type(node) is str:
+			rpn.append(ASTNodeVariable(node[1:-1]))
+		elif type(node) is float and node.is_integer():
+			rpn.append(ASTNodeLiteral(int(node)))  # Un calcul entier reste entier, sans passer par les flottants.
+		else:
+			rpn.append(ASTNodeLiteral(node))
+	return ASTNodeOperation(rpn)
+
+
+def is_math_tokens(tokens: list[str]) -> bool:
+	"""Renvoie si les mots alternent opérandes (nombres ou variables) et opérateurs."""
+	if len(tokens) % 2 == 0: return False
+	for i, token in enumerate(tokens):
+		if i % 2:
+			if token not in PRECEDENCES: return False
+		elif not is_variable_token(token) and not is_number_token(token):
+			return False
+	return True
+
+
+def is_variable_token(token: str) -> bool:
+	"""Renvoie si le mot est exactement le nom d’une variable entre accolades."""
+	return len(token) > 2 and token[0] == "{" and token[-1] == "}" and token.count("{") == 1\
+	  and token.count("}") == 1
+
+
+def is_number_token(token: str) -> bool:
+	try:
+		float(token)
+	except ValueError:
+		return False
+	return True
 
 
 @dataclass(slots=True)
 class ASTNodeSequence(ASTNode):
 	elements: list[ASTNode]
 	
-	def execute(self) -> str | float | int | bool | None:
+	def execute(self, variables: dict[str, Value], budget: Budget | None = None) -> Value:
+		if budget is None: budget = Budget()
+		budget.charge(len(self.elements), variables.values())
+		for element in self.elements:
+			if type(element) is ASTNodeVariableReturn:
+				element: ASTNodeVariableReturn
+				return element.value.execute(variables, budget)
+			element.execute(variables, budget)
+	
+	def steps(self, variables: dict[str, Value]) -> Steps:
 		for element in self.elements:
 			if type(element) is ASTNodeVariableReturn:
 				element: ASTNodeVariableReturn
-				return element.value.execute()
-			element.execute()
+				return (yield from element.value.steps(variables))
+			yield from element.steps(variables)
+	
+	def compile_elements(self, resolver: Resolver) -> Recursion:
+		"""Compile les instructions de la séquence et la valeur de son retour (s’il y en a un)."""
+		# Le type des éléments n’est vérifié qu’une fois : tout ce qui suit un retour est ignoré.
+		statements: list[Closure] = []
+		for element in self.elements:
+			if type(element) is ASTNodeVariableReturn:
+				return tuple(statements), (yield resolver.compiling(element))
+			statements.append((yield resolver.compiling(element)))
+		return tuple(statements), None
+	
+	def compiling(self, resolver: Resolver) -> Recursion:
+		statements, return_value = yield self.compile_elements(resolver)
+		# Une séquence exécute toujours tous ses éléments : ils sont décomptés en une fois.
+		steps = len(statements) + (return_value is not None)
+		
+		if return_value is None:
+			def sequence_closure(frame: Frame) -> Value:
+				budget = frame[BUDGET_SLOT]
+				budget.countdown -= steps
+				if budget.countdown <= 0: budget.check(frame)
+				for statement in statements:
+					statement(frame)
+		else:
+			def sequence_closure(frame: Frame) -> Value:
+				budget = frame[BUDGET_SLOT]
+				budget.countdown -= steps
+				if budget.countdown <= 0: budget.check(frame)
+				for statement in statements:
+					statement(frame)
+				return return_value(frame)
+		
+		return sequence_closure
 
 
 @dataclass(slots=True)
@@ -55,16 +718,58 @@ class ASTNodeIfElse(ASTNode):
 	elifs: list[tuple[ASTNode, ASTNodeSequence]]
 	else_sequence: ASTNodeSequence | None
 	
-	def execute(self) -> str | float | int | bool | None:
-		if self.if_condition.execute():
-			return self.if_sequence.execute()
+	def execute(self, variables: dict[str, Value], budget: Budget | None = None) -> Value:
+		if budget is None: budget = Budget()
+		if self.if_condition.execute(variables, budget):
+			return self.if_sequence.execute(variables, budget)
+		
+		for condition, sequence in self.elifs:
+			if condition.execute(variables, budget):
+				return sequence.execute(variables, budget)
+		
+		if self.else_sequence is not None:
+			return self.else_sequence.execute(variables, budget)
+	
+	def steps(self, variables: dict[str, Value]) -> Steps:
+		if (yield from self.if_condition.steps(variables)):
+			return (yield from self.if_sequence.steps(variables))
 		
 		for condition, sequence in self.elifs:
-			if condition.execute():
-				return sequence.execute()
+			if (yield from condition.steps(variables)):
+				return (yield from sequence.steps(variables))
 		
 		if self.else_sequence is not None:
-			return self.else_sequence.execute()
+			return (yield from self.else_sequence.steps(variables))
+	
+	def compiling(self, resolver: Resolver) -> Recursion:
+		if_condition = resolver.compile(self.if_condition)
+		if_sequence = yield resolver.compiling(self.if_sequence)
+		branches = [(if_condition, if_sequence)]
+		for condition, sequence in self.elifs:
+			branches.append((resolver.compile(condition), (yield resolver.compiling(sequence))))
+		branches = tuple(branches)
+		else_sequence = (yield resolver.compiling(self.else_sequence)) if self.else_sequence is not None else None
+		
+		if not self.elifs:
+			if else_sequence is None:
+				def if_else_closure(frame: Frame) -> Value:
+					if if_condition(frame):
+						return if_sequence(frame)
+			else:
+				def if_else_closure(frame: Frame) -> Value:
+					if if_condition(frame):
+						return if_sequence(frame)
+					return else_sequence(frame)
+			return if_else_closure
+		
+		def if_else_closure(frame: Frame) -> Value:
+			for condition, sequence in branches:
+				if condition(frame):
+					return sequence(frame)
+			if else_sequence is not None:
+				return else_sequence(frame)
+		
+		return if_else_closure
 
 
 @dataclass(slots=True)
@@ -73,39 +778,155 @@ class ASTNodeWhile(ASTNode):
 	sequence: ASTNodeSequence
 	is_do: bool
 	
-	def execute(self) -> str | float | int | bool | None:
-		count: int = 0
+	def execute(self, variables: dict[str, Value], budget: Budget | None = None) -> Value:
+		if budget is None: budget = Budget()
 		
 		if self.is_do:
-			value = self.sequence.execute()
+			value = self.sequence.execute(variables, budget)
+			if value is not None: return value
+		
+		while self.condition.execute(variables, budget):
+			value = self.sequence.execute(variables, budget)
+			if value is not None: return value
+			budget.charge(1, variables.values())  # Chaque tour est décompté, même quand la séquence est vide.
+	
+	def steps(self, variables: dict[str, Value]) -> Steps:
+		# Les pas sont décomptés par l’ordonnanceur, qui rend la main à l’éditeur entre deux tranches.
+		if self.is_do:
+			value = yield from self.sequence.steps(variables)
 			if value is not None: return value
 		
-		while self.condition.execute():
-			value = self.sequence.execute()
+		while (yield from self.condition.steps(variables)):
+			value = yield from self.sequence.steps(variables)
 			if value is not None: return value
-			count += 1
-			if count >= 99:
-				print(f"more than {count} iteration !")
-				break
+			yield None  # Chaque tour est un pas, même quand la séquence est vide.
+	
+	def compiling(self, resolver: Resolver) -> Recursion:
+		condition = resolver.compile(self.condition)
+		if resolver.profiler is None:
+			# La séquence est exécutée directement par la boucle : chaque tour est décompté en une fois,
+			# avec les éléments de la séquence.
+			statements, return_value = yield self.sequence.compile_elements(resolver)
+			steps = len(statements) + (return_value is not None)
+		else:
+			# Profilée, la séquence est mesurée comme un nœud à part : elle est appelée (et décomptée)
+			# en une fois à chaque tour, comme le retour d’une séquence.
+			statements, return_value = (), (yield resolver.compiling(self.sequence))
+			steps = 0
+		is_do = self.is_do
+		
+		if return_value is None:
+			# Sans retour, la séquence vaut toujours None : la boucle ne s’arrête que par sa condition.
+			def while_closure(frame: Frame) -> None:
+				budget = frame[BUDGET_SLOT]
+				if is_do:
+					budget.countdown -= steps
+					if budget.countdown <= 0: budget.check(frame)
+					for statement in statements:
+						statement(frame)
+				
+				while condition(frame):
+					budget.countdown -= steps + 1
+					if budget.countdown <= 0: budget.check(frame)
+					for statement in statements:
+						statement(frame)
+			
+			return while_closure
+		
+		def while_closure(frame: Frame) -> Value:
+			budget = frame[BUDGET_SLOT]
+			if is_do:
+				budget.countdown -= steps
+				if budget.countdown <= 0: budget.check(frame)
+				for statement in statements:
+					statement(frame)
+				value = return_value(frame)
+				if value is not None: return value
+			
+			while condition(frame):
+				budget.countdown -= steps + 1
+				if budget.countdown <= 0: budget.check(frame)
+				for statement in statements:
+					statement(frame)
+				value = return_value(frame)
+				if value is not None: return value
+		
+		return while_closure
 
 
 @dataclass(slots=True)
 class ASTNodeVariableAssignment(ASTNode):
 	name: str
 	value: ASTNode
+	type: str | None = None
+	"""Type déclaré de la variable - sa valeur y est convertie (voir 'coerce')."""
 	
-	def execute(self) -> None:
-		variables[self.name] = self.value.execute()
+	def __post_init__(self):
+		if self.type == STRING_TYPE and type(self.value) is ASTNodeValue and self.value.template is not None:
+			self.value = ASTNodeText(self.value.value)  # Un texte n’est pas réanalysé à chaque exécution.
+	
+	def execute(self, variables: dict[str, Value], budget: Budget | None = None) -> None:
+		value = self.value.execute(variables, budget)
+		if self.type is not None: value = coerce(self.name, value, self.type)
+		variables[self.name] = value
+		if budget is not None and is_large(value): budget.check(variables.values())
+	
+	def steps(self, variables: dict[str, Value]) -> Steps:
+		value = yield from self.value.steps(variables)
+		if self.type is not None: value = coerce(self.name, value, self.type)
+		variables[self.name] = value
+		yield ASSIGN_EVENT, (self.name, value)
+	
+	def compile(self, resolver: Resolver) -> Closure:
+		name, declared = self.name, self.type
+		found = check_type(self, resolver.types) if declared is not None else None
+		if (declared is None or found == declared) and resolver.profiler is None\
+		  and type(self.value) is ASTNodeMathExpression and self.value.operation.depth() <= MAX_GENERATED_DEPTH:
+			return self.value.generate(resolver, resolver.slot(name))  # Calcul et assignation en un seul appel.
+		
+		value = resolver.compile(self.value)
+		slot = resolver.slot(name)
+		if declared is None or found == declared:
+			def assignment_closure(frame: Frame) -> None:
+				frame[slot] = result = value(frame)
+				if is_large(result): frame[BUDGET_SLOT].check(frame)
+		elif found is not None:  # Conversion toujours possible en "Float" ou en "String", sans vérification.
+			convert = float if declared == FLOAT_TYPE else str
+			
+			def assignment_closure(frame: Frame) -> None:
+				frame[slot] = result = convert(value(frame))
+				if is_large(result): frame[BUDGET_SLOT].check(frame)
+		else:
+			def assignment_closure(frame: Frame) -> None:
+				frame[slot] = result = coerce(name, value(frame), declared)
+				if is_large(result): frame[BUDGET_SLOT].check(frame)
+		
+		return assignment_closure
 
 
 @dataclass(slots=True)
 class ASTNodePrint(ASTNode):
 	value: ASTNode
 	
-	def execute(self) -> None:
-		print(self.value.execute())
+	def execute(self, variables: dict[str, Value], budget: Budget | None = None) -> None:
+		print(self.value.execute(variables, budget))
+	
+	def steps(self, variables: dict[str, Value]) -> Steps:
+		yield PRINT_EVENT, (yield from self.value.steps(variables))
+	
+	def compile(self, resolver: Resolver) -> Closure:
+		value = resolver.compile(self.value)
+		
+		def print_closure(frame: Frame) -> None:
+			print(value(frame))
+		
+		return print_closure
 
 
 @dataclass(slots=True)
 class ASTNodeVariableReturn(ASTNode):
 	value: ASTNode
+	
+	def compile(self, resolver: Resolver) -> Closure:
+		"""Un retour n’a de sens que dans une séquence : sa fermeture renvoie la valeur retournée."""
+		return resolver.compile(self.value)
@@ -0,0 +1,93 @@
+"""Ce programme python mesure le coût d’un appel à chaque fonction de 'benday_rust' et à son équivalent
+en Python, selon la taille de l’entrée. Le coût sur la plus petite entrée est surtout celui de l’appel
+(le passage de la frontière avec Rust) ; les mesures donnent le seuil à partir duquel le module compilé
+est plus rapide, enregistré avec --write pour que 'backends' l’utilise.
+Utilisation : python -m Benchmarks.Backends [--output mesures.json] [--write]"""
+import argparse
+import json
+import os
+import sys
+from timeit import Timer
+
+from backends import INPUT_SIZES, PYTHON_FUNCTIONS, RUST_FUNCTIONS, THRESHOLDS_PATH
+
+SIZES: list[int] = [1, 2, 4, 8, 16, 32, 64, 128, 256]
+"""Nombre d’opérandes d’une expression, ou de mots parmi lesquels chercher."""
+
+
+def sample_arguments(name: str, size: int) -> tuple:
+	"""Renvoie les arguments d’un appel à la fonction pour une taille d’entrée donnée."""
+	match name:
+		case "is_math_parsable" | "math_expression":
+			operators = "+-*/"
+			return (" ".join(f"{i + 1}" if i % 2 == 0 else operators[i // 2 % 4] for i in range(2 * size - 1)),)
+		case "fuzzy_find":
+			return [f"variable_{i}" for i in range(size)], "va1"
+	raise ValueError(f"unknown function '{name}'")
+
+
+def per_call(function, call_arguments: tuple) -> float:
+	"""Renvoie le meilleur temps d’un appel (en nanosecondes)."""
+	timer = Timer(lambda: function(*call_arguments))
+	number, _ = timer.autorange()
+	return min(timer.repeat(repeat=3, number=number)) / number * 1e9
+
+
+def measure(name: str) -> list[dict]:
+	rows = []
+	for size in SIZES:
+		call_arguments = sample_arguments(name, size)
+		row = {"function": name, "size": INPUT_SIZES[name](*call_arguments),
+		       "python_ns": per_call(PYTHON_FUNCTIONS[name], call_arguments)}
+		if name in RUST_FUNCTIONS:
+			row["rust_ns"] = per_call(RUST_FUNCTIONS[name], call_arguments)
+		rows.append(row)
+	return rows
+
+
+def threshold(rows: list[dict]) -> int | None:
+	"""Renvoie la plus petite taille à partir de laquelle le module compilé est toujours plus rapide
+	(0 s’il l’est dès la plus petite entrée, None s’il ne l’est jamais)."""
+	result = None
+	for row in reversed(rows):
+		if "rust_ns" not in row or row["rust_ns"] >= row["python_ns"]: break
+		result = row["size"]
+	if result is not None and result == rows[0]["size"]: return 0
+	return result
+
+
+def main(arguments: list[str] | None = None):
+	parser = argparse.ArgumentParser(description="Measure the per-call cost of both backends of benday_rust.")
+	parser.add_argument("--functions", nargs="+", choices=list(PYTHON_FUNCTIONS), default=list(PYTHON_FUNCTIONS))
+	parser.add_argument("--output", help="JSON file of the measures (printed if omitted)")
+	parser.add_argument("--write", action="store_true", help=f"save the thresholds to {THRESHOLDS_PATH}")
+	options = parser.parse_args(arguments)
+	
+	measures = {name: measure(name) for name in options.functions}
+	thresholds = {name: threshold(rows) for name, rows in measures.items()}
+	report = {"rust_available": bool(RUST_FUNCTIONS), "thresholds": thresholds,
+	          "results": [row for rows in measures.values() for row in rows]}
+	
+	if options.output is None:
+		json.dump(report, sys.stdout, indent=2)
+		print()
+	else:
+		with open(options.output, "w") as file:
+			json.dump(report, file, indent=2)
+	
+	for name, rows in measures.items():
+		print(f"{name:<18}call {rows[0]['python_ns']:>8.0f} ns (python)"
+		      + (f" {rows[0]['rust_ns']:>8.0f} ns (rust)" if "rust_ns" in rows[0] else "")
+		      + f"   threshold: {thresholds[name]}", file=sys.stderr)
+	
+	if options.write:
+		if not RUST_FUNCTIONS:
+			print("benday_rust is not installed: there is no threshold to save", file=sys.stderr)
+			return
+		os.makedirs(os.path.dirname(THRESHOLDS_PATH), exist_ok=True)
+		with open(THRESHOLDS_PATH, "w") as file:
+			json.dump(thresholds, file, indent=2)
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,146 @@
+"""Ce programme python mesure la vitesse des interpréteurs sur les programmes synthétiques de
+'Benchmarks.Programs', sans interface, et enregistre les résultats en JSON pour comparer deux commits.
+Utilisation : python -m Benchmarks.Benchmark [--scale 5] [--output résultats.json] [--compare ancien.json]"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+from contextlib import redirect_stdout
+from dataclasses import asdict, dataclass
+from statistics import mean
+from time import perf_counter
+from typing import Callable
+
+from AST import ASTNodeSequence, BUDGET_SLOT, Value, compile_program
+from Benchmarks.Programs import PROGRAMS
+from Interpreter.Bytecode import compile_bytecode
+from Interpreter.Limits import Budget, ExecutionLimits
+
+ENGINES: list[str] = ["reference", "closures", "bytecode"]
+UNLIMITED = ExecutionLimits(max_steps=None, max_time=None, max_memory=None)
+"""Les limites ne sont pas mesurées : elles ne sont vérifiées que pour compter les instructions."""
+
+
+@dataclass(slots=True)
+class Result:
+	program: str
+	engine: str
+	steps: int
+	"""Instructions exécutées par le programme (éléments de séquences et tours de boucles)."""
+	times: list[float]
+	"""Durée de chaque exécution (en secondes)."""
+	error: str | None = None
+	"""Erreur qui a empêché l’interpréteur d’exécuter le programme (ex: une récursion trop profonde)."""
+	
+	@property
+	def best(self) -> float | None: return min(self.times) if self.times else None
+	
+	@property
+	def throughput(self) -> float:
+		"""Instructions par seconde, selon la meilleure exécution."""
+		return self.steps / self.best if self.best else 0
+	
+	def as_dict(self) -> dict:
+		return asdict(self) | {"best": self.best, "mean": mean(self.times) if self.times else None,
+		                       "throughput": self.throughput}
+
+
+def count_steps(node: ASTNodeSequence) -> int:
+	"""Exécute le programme avec la machine à pile (qui exécute tous les programmes, même les plus profonds)
+	et renvoie son nombre d’instructions, décomptées comme par l’interpréteur de référence."""
+	bytecode = compile_bytecode(node)
+	frame = bytecode.new_frame()
+	bytecode.run(frame, limits=UNLIMITED)
+	budget = frame[BUDGET_SLOT]
+	return budget.steps + budget.limits.check_interval - budget.countdown
+
+
+def runner(engine: str, node: ASTNodeSequence) -> Callable[[], Value]:
+	"""Renvoie l’exécution du programme par un interpréteur (compilé avant la mesure)."""
+	match engine:
+		case "reference":
+			return lambda: node.execute({}, Budget(UNLIMITED))
+		case "closures":
+			program = compile_program(node)
+			return lambda: program.run(limits=UNLIMITED)
+		case "bytecode":
+			bytecode = compile_bytecode(node)
+			return lambda: bytecode.run(limits=UNLIMITED)
+	raise ValueError(f"unknown engine '{engine}'")
+
+
+def measure(name: str, engine: str, node: ASTNodeSequence, steps: int, repeat: int) -> Result:
+	"""Mesure un interpréteur - s’il ne peut pas exécuter le programme, son erreur est enregistrée."""
+	times = []
+	try:
+		run = runner(engine, node)
+		for _ in range(repeat):
+			start = perf_counter()
+			run()
+			times.append(perf_counter() - start)
+	except (RecursionError, MemoryError) as error:
+		return Result(name, engine, steps, [], f"{error.__class__.__name__}: {error}")
+	return Result(name, engine, steps, times)
+
+
+def commit() -> str | None:
+	"""Renvoie le commit mesuré, si le programme est dans un dépôt git."""
+	try:
+		return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+		                      cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+	except (OSError, subprocess.CalledProcessError):
+		return None
+
+
+def run_benchmarks(programs: list[str], engines: list[str], scale: int, repeat: int) -> list[Result]:
+	results = []
+	with open(os.devnull, "w") as null, redirect_stdout(null):  # Les affichages ne sont pas mesurés.
+		for name in programs:
+			node = PROGRAMS[name](scale)
+			steps = count_steps(node)
+			for engine in engines:
+				results.append(measure(name, engine, node, steps, repeat))
+	return results
+
+
+def compare(results: list[Result], previous: dict) -> list[str]:
+	"""Renvoie, pour chaque mesure, le rapport entre sa meilleure durée et celle des anciens résultats."""
+	old_times = {(old["program"], old["engine"]): old["best"] for old in previous["results"]}
+	lines = []
+	for result in results:
+		old_time = old_times.get((result.program, result.engine))
+		if old_time and result.best:
+			lines.append(f"{result.program:<18}{result.engine:<11}{result.best / old_time:>8.2f}x")
+	return lines
+
+
+def main(arguments: list[str] | None = None):
+	parser = argparse.ArgumentParser(description="Benchmark the Benday interpreters on synthetic programs.")
+	parser.add_argument("--programs", nargs="+", choices=list(PROGRAMS), default=list(PROGRAMS))
+	parser.add_argument("--engines", nargs="+", choices=ENGINES, default=ENGINES)
+	parser.add_argument("--scale", type=int, default=5, help="size of the programs (1 for a quick run)")
+	parser.add_argument("--repeat", type=int, default=5, help="runs of each program, the best one counts")
+	parser.add_argument("--output", help="JSON file of the results (printed if omitted)")
+	parser.add_argument("--compare", help="JSON file of previous results, to print the time ratios")
+	options = parser.parse_args(arguments)
+	
+	results = run_benchmarks(options.programs, options.engines, options.scale, options.repeat)
+	report = {"commit": commit(), "python": platform.python_version(), "scale": options.scale,
+	          "repeat": options.repeat, "results": [result.as_dict() for result in results]}
+	
+	if options.output is None:
+		json.dump(report, sys.stdout, indent=2)
+		print()
+	else:
+		with open(options.output, "w") as file:
+			json.dump(report, file, indent=2)
+	
+	if options.compare is not None:
+		with open(options.compare) as file:
+			print("\n".join(compare(results, json.load(file))), file=sys.stderr)
+
+
+if __name__ == "__main__":
+	main()
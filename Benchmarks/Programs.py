@@ -0,0 +1,68 @@
+"""Ce programme python construit des programmes synthétiques de forme contrôlée pour mesurer les
+interpréteurs, directement en ASTNodes (sans blocs, donc sans pygame)."""
+import sys
+from typing import Callable
+
+from AST import ASTNode, ASTNodeIfElse, ASTNodePrint, ASTNodeSequence, ASTNodeVariableAssignment,\
+	ASTNodeWhile, parse_slot
+
+
+def assign(name: str, text: str, declared: str | None = None) -> ASTNodeVariableAssignment:
+	"""Assignation dont la valeur est analysée comme le texte d’un slot."""
+	return ASTNodeVariableAssignment(name, parse_slot(text), declared)
+
+
+def loop(counter: str, turns: int, body: list[ASTNode]) -> list[ASTNode]:
+	"""Boucle qui exécute le corps un nombre de fois donné."""
+	return [assign(counter, "0"),
+	        ASTNodeWhile(parse_slot(f"{{{counter}}} < {turns}"),
+	                     ASTNodeSequence(body + [assign(counter, f"{{{counter}}} + 1")]), False)]
+
+
+def flat_sequence(length: int) -> ASTNodeSequence:
+	"""Longue séquence d’assignations, sans boucle ni condition."""
+	return ASTNodeSequence([assign(f"v{i % 16}", f"{i} + 1") if i < 16 else
+	                        assign(f"v{i % 16}", f"{{v{(i - 1) % 16}}} + {i}") for i in range(length)])
+
+
+def deep_nesting(depth: int, turns: int) -> ASTNodeSequence:
+	"""Boucle dont le corps imbrique des conditions et des boucles d’un seul tour, en alternance."""
+	body: list[ASTNode] = [assign("n", "{n} + 1")]
+	for level in range(depth):
+		if level % 2:
+			body = loop(f"j{level}", 1, body)
+		else:
+			body = [ASTNodeIfElse(parse_slot(f"{{n}} > {-level - 1}"), ASTNodeSequence(body), [], None)]
+	return ASTNodeSequence([assign("n", "0")] + loop("i", turns, body))
+
+
+def deeper_than_recursion(depth: int, turns: int) -> ASTNodeSequence:
+	"""Boucle au fond de conditions imbriquées plus profondément que la limite de récursion de Python :
+	seule la machine à pile ("bytecode"), qui n’est pas récursive, l’exécute."""
+	body = loop("i", turns, [assign("n", "{n} + 1")])
+	for level in range(depth):
+		body = [ASTNodeIfElse(parse_slot(f"{{n}} > {-level - 1}"), ASTNodeSequence(body), [], None)]
+	return ASTNodeSequence([assign("n", "0")] + body)
+
+
+def assignment_loop(turns: int, width: int) -> ASTNodeSequence:
+	"""Boucle dont chaque tour enchaîne des assignations qui dépendent les unes des autres."""
+	body = [assign("a0", "{i} * 2")] + [assign(f"a{k}", f"{{a{k - 1}}} + {k}") for k in range(1, width)]
+	return ASTNodeSequence(loop("i", turns, body))
+
+
+def print_loop(turns: int, holes: int) -> ASTNodeSequence:
+	"""Boucle qui affiche à chaque tour un texte rempli de variables."""
+	text = " ".join(f"b{k}={{b{k}}}," for k in range(holes - 1)) + " i={i}"
+	return ASTNodeSequence([assign(f"b{k}", f"value{k}") for k in range(holes - 1)] +
+	                       loop("i", turns, [ASTNodePrint(parse_slot(text))]))
+
+
+PROGRAMS: dict[str, Callable[[int], ASTNodeSequence]] = {
+	"flat_sequence": lambda scale: flat_sequence(2000 * scale),
+	"deep_nesting": lambda scale: deep_nesting(24, 200 * scale),
+	"assignment_loop": lambda scale: assignment_loop(500 * scale, 16),
+	"print_loop": lambda scale: print_loop(1000 * scale, 8),
+	"deeper_than_recursion": lambda scale: deeper_than_recursion(2 * sys.getrecursionlimit(), 1000 * scale),
+}
+"""Programmes mesurés, construits selon une échelle (1 pour un essai rapide)."""
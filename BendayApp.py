@@ -1,13 +1,26 @@
-from pygame import Vector2 as Vec2, draw
+from pygame import Rect, Vector2 as Vec2, draw
 from copy import deepcopy
 
+from AST import ASTNodeSequence, ERROR_EVENT, LIMIT_EVENT, PRINT_EVENT, PROFILE_EVENT, compile_program
+from Blocs.BlocBuilder import build_mother
+from Blocs.BlocCache import BlocCache
 from Blocs.MotherBloc import MotherBloc
-from Constantes import FONT_20, MOTHER_SIZE, TYPES
+from Interpreter.Compiler import CompileWorker
+from Interpreter.Live import LiveRunner
+from Interpreter.Limits import ExecutionLimits, LimitExceeded
+from Interpreter.Profiler import Profiler
+from Interpreter.Save import SaveError, load_program, save_program
+from Interpreter.Stepper import Stepper
+from Interpreter.Worker import ExecutionWorker
+from Constantes import BLOC_CACHE_SIZE, COMPILE_DELAY, EXECUTION_MODE, FONT_20, LIVE_EXECUTION, MOTHER_SIZE, OPTIMIZING,\
+	PROFILE_EXPORT_PATH, PROFILING, PROGRAM_PATH, STEP_BUDGET, TYPES
 from Blocs.Containers import HoveredOn
 
 from MyPygameLibrary.App import App
 from MyPygameLibrary.Camera import Camera
+from MyPygameLibrary.Fonts import measure_text
 from MyPygameLibrary.Inputs import Key
+from MyPygameLibrary.QuadTree import QuadTree
 from MyPygameLibrary.UI_elements import Button, RollingList, TextBox, draw_text
 
 from Blocs.ParentBloc import ParentBloc, TOP_BOX_SIZE
@@ -43,30 +56,55 @@ class BendayApp(App):
 		
 		self.ui_objects["bt_reset"].text = "CLEAR"
 		self.ui_objects["bt_play"] = Button("tomato", Vec2(300, 25), Vec2(80, 40), text="|>")
+		self.ui_objects["bt_save"] = Button("light blue", Vec2(300, 75), Vec2(80, 40), text="SAVE", text_size=24)
+		self.ui_objects["bt_load"] = Button("light blue", Vec2(390, 75), Vec2(80, 40), text="LOAD", text_size=24)
 		
 		self.camera = Camera(self.window_size, zoom_speed=2 ** (1 / 8), vertical_scroll=True,
 		                     min_scale=1 / 2, max_scale=2,
 		                     left_limit=-2000, right_limit=2000, top_limit=-1000, bottom_limit=4000)
 		
 		self.blocs: list[tuple[Vec2, ParentBloc]] = [(-MOTHER_SIZE / 2, MotherBloc())]
+		self.bloc_index = QuadTree(Vec2(-2000, -1000), Vec2(4000, 5000))
+		"""Zone de chaque bloc racine dans le monde (selon 'id(bloc)'), pour ne tester que les blocs proches."""
+		self.bloc_ids: dict[int, int] = {}
+		"""Indice de chaque bloc racine dans 'self.blocs' (selon 'id(bloc)')."""
+		self.index_blocs()
 		self.selected_bloc: tuple[Vec2, ParentBloc] = None
+		self.bloc_cache: BlocCache | None = BlocCache(BLOC_CACHE_SIZE) if BLOC_CACHE_SIZE is not None else None
+		"""Images des blocs racines, redessinées seulement quand leur version change."""
 		
 		self.bloc_hovered = None
 		self.mouse_hovered = None
 		
 		self.text_box: TextBox | None = None
 		self.text_box_bloc: int | None = None
+		self.text_box_hierarchy: list[int | tuple[int, int]] = []
 		self.rolling_list: RollingList = None
 		
 		self.info_timer: int = 0
 		
-		self.AST = self.blocs[0][1].as_ASTNode()
+		self.AST: ASTNodeSequence | None = None
+		self.compiler = CompileWorker(EXECUTION_MODE, COMPILE_DELAY, OPTIMIZING)
+		"""Compile le programme en arrière-plan après chaque modification."""
+		self.profiled_AST: ASTNodeSequence | None = None
+		self.profiler: Profiler | None = None
+		"""Mesures de la dernière exécution profilée."""
+		
+		self.worker = ExecutionWorker()
+		self.stepper: Stepper | None = None
+		self.limits = ExecutionLimits()
+		self.live_runner = LiveRunner(self.limits)
+		"""Réexécute le programme à chaque modification (si 'LIVE_EXECUTION')."""
+		self.limit_exceeded: LimitExceeded | None = None
+		"""Limite dépassée par la dernière exécution, affichée à côté du bouton d’exécution."""
 		
 		self.variables: list[str] = []
+		self.update_AST()
 	
 	def reset(self):
 		"""Vide la scène de tous les blocs."""
 		self.blocs = [(-MOTHER_SIZE / 2, MotherBloc())]
+		self.index_blocs()
 		self.selected_bloc = None
 		self.text_box = None
 		self.text_box_bloc = None
@@ -76,14 +114,73 @@ class BendayApp(App):
 		
 		self.info_timer = 0
 		self.changed = True
-		self.AST = self.blocs[0][1].as_ASTNode()
+		self.update_AST()
+	
+	def save(self):
+		"""Enregistre le programme dans 'PROGRAM_PATH' - seuls les blocs de la séquence mère en font partie."""
+		self.unselect_text_box()  # Le texte en cours d’écriture fait partie du programme.
+		try:
+			save_program(self.AST, PROGRAM_PATH)
+		except (OSError, TypeError) as error:
+			print(f"\nPROGRAM NOT SAVED : {error}")
+			return
+		print(f"\nPROGRAM SAVED : {PROGRAM_PATH}")
+	
+	def load(self):
+		"""Remplace la scène par le programme enregistré dans 'PROGRAM_PATH'."""
+		try:
+			mother = build_mother(load_program(PROGRAM_PATH))
+		except (OSError, SaveError) as error:
+			print(f"\nPROGRAM NOT LOADED : {error}")
+			return
+		self.reset()
+		self.blocs = [(-MOTHER_SIZE / 2, mother)]
+		self.index_blocs()
+		self.update_AST()
+		print(f"\nPROGRAM LOADED : {PROGRAM_PATH}")
+	
+	def quit(self):
+		self.compiler.close()
+		self.worker.close()
+		super().quit()
 	
 	def manage_inputs(self, delta: int):
 		super().manage_inputs(delta)
 		
 		if self.ui_objects["bt_play"].is_released():
-			print("\nEXECUTION :")
-			self.AST.execute()
+			if self.running_program:
+				self.worker.cancel()
+				self.stepper = None
+				print("EXECUTION CANCELLED")
+				self.set_running(False)
+			elif (compiled := self.compiler.latest) is None:
+				print("\nPROGRAM NOT COMPILED YET")
+			else:
+				print("\nEXECUTION :")
+				self.limit_exceeded = None
+				match EXECUTION_MODE:
+					case _ if PROFILING:
+						# Le programme est mesuré tel que les blocs l’ont construit, sans être simplifié :
+						# chaque nœud mesuré est celui d’un bloc ('ParentBloc.ast_node').
+						self.profiled_AST = self.AST
+						self.worker.start("closures", self.AST, self.limits, profile=True)
+					case "stepper":
+						self.stepper = Stepper(compiled.AST, self.limits)
+					case "bytecode" if compiled.bytecode is not None:
+						self.worker.start(EXECUTION_MODE, compiled.bytecode, self.limits)
+					case "bytecode":  # La compilation a échoué : le programme est exécuté depuis son AST.
+						self.worker.start("closures", compiled.AST, self.limits)
+					case _:
+						self.worker.start(EXECUTION_MODE, compiled.AST, self.limits)
+				self.set_running(True)
+		
+		if self.ui_objects["bt_save"].is_released():
+			self.save()
+		elif self.ui_objects["bt_load"].is_released():
+			self.load()
+		
+		if self.running_program:
+			self.receive_events()
 		
 		# Retourne si un ou des éléments d’UI ont été bougés.
 		if self.changed:
@@ -103,10 +200,12 @@ class BendayApp(App):
 			if self.text_box.clicked_outside and self.rolling_list is None:
 				self.unselect_text_box()
 				return
-			elif self.text_box.changed:
-				self.changed = True
 			if self.text_box.size_changed and self.text_box_bloc is not None:
+				self.damage(self.bloc_rect(self.text_box_bloc))  # Le bloc change de taille.
 				self.blocs[self.text_box_bloc][1].update_size()
+				self.bloc_changed(self.text_box_bloc)
+			elif self.text_box.changed:
+				self.text_box_changed()
 		
 		# Rolling list
 		if self.rolling_list is None:
@@ -136,14 +235,18 @@ class BendayApp(App):
 				hovered_bloc: VariableAssignmentBloc = bloc.get_bloc(hierarchy)
 				hovered_bloc.type = self.rolling_list.selected_text
 				bloc.update_size()
+				bloc.set_dirty(hierarchy)
+				self.touch_bloc(*self.blocs[bloc_id])
+				self.update_AST()
 				self.unselect_text_box()
 			return
 		
 		elif self.rolling_list.changed:
-			self.changed = True
+			self.damage(self.rolling_list.hit_box)
 			if self.text_box is not None and self.rolling_list.selected_text is not None:
 				self.text_box.text = self.rolling_list.selected_text
 				self.text_box.select()
+				self.text_box_changed()
 		
 		if self.inputs.K_RETURN == Key.PRESSED:
 			if self.rolling_list.selected_word is not None:
@@ -157,12 +260,16 @@ class BendayApp(App):
 					else:
 						self.text_box.text = self.rolling_list.selected_text
 						self.text_box.select()
+						self.text_box_changed()
 				else:
 					bloc_id, hierarchy, _ = self.mouse_hovered
 					_, bloc = self.blocs[bloc_id]
 					hovered_bloc: VariableAssignmentBloc = bloc.get_bloc(hierarchy)
 					hovered_bloc.type = self.rolling_list.selected_text
 					bloc.update_size()
+					bloc.set_dirty(hierarchy)
+					self.touch_bloc(*self.blocs[bloc_id])
+					self.update_AST()
 					self.unselect_text_box()
 			
 			elif self.rolling_list.words:
@@ -171,11 +278,44 @@ class BendayApp(App):
 				if self.text_box:
 					self.text_box.text = self.rolling_list.selected_text
 					self.text_box.select()
+					self.text_box_changed()
 			elif self.text_box and self.text_box_bloc is None:
 				self.text_box.select()
 			elif self.text_box_bloc is None:
 				self.unselect_text_box()
 	
+	@property
+	def running_program(self) -> bool:
+		"""Indique si un programme est en cours d’exécution."""
+		return self.worker.running or self.stepper is not None
+	
+	def set_running(self, running: bool):
+		"""Change le bouton d’exécution selon qu’un programme est en cours d’exécution ou non."""
+		self.ui_objects["bt_play"].text = "[]" if running else "|>"
+		self.changed = True
+	
+	def receive_events(self):
+		"""Affiche les résultats du programme en cours : ceux envoyés par le processus d’exécution,
+		ou ceux de son exécution pas à pas pendant le temps accordé à cette image."""
+		if self.stepper is not None:
+			events = self.stepper.advance(STEP_BUDGET)
+			if self.stepper.finished: self.stepper = None
+		else:
+			events = self.worker.poll()
+		
+		for kind, value in events:
+			if kind in (PRINT_EVENT, ERROR_EVENT):
+				print(value)
+			elif kind == LIMIT_EVENT:
+				self.limit_exceeded = value
+			elif kind == PROFILE_EVENT:
+				self.profiler = Profiler()
+				compile_program(self.profiled_AST, self.profiler)  # Compile les nœuds dans le même ordre.
+				self.profiler.load(value)
+				self.show_profile()
+		if not self.running_program:
+			self.set_running(False)
+	
 	def update(self, delta):
 		super().update(delta)
 		
@@ -238,8 +378,9 @@ class BendayApp(App):
 			case HoveredOn.SELF | HoveredOn.SEQUENCE:
 				self.unselect_text_box()
 				container = bloc.get_container(hierarchy)
+				if container is not None: bloc.set_dirty(hierarchy[:-1])
 				if container is None:
-					removed_bloc = self.blocs.pop(bloc_id)
+					removed_bloc = self.remove_bloc(bloc_id)
 				elif type(container) is tuple:  # Séquence
 					sequence, sequence_bloc_id = container
 					removed_bloc = position +\
@@ -265,8 +406,9 @@ class BendayApp(App):
 			
 			case HoveredOn.CROSS_BT:
 				container = bloc.get_container(hierarchy)
+				if container is not None: bloc.set_dirty(hierarchy[:-1])
 				if container is None:
-					self.blocs.pop(bloc_id)
+					self.remove_bloc(bloc_id)
 				elif type(container) is tuple:  # Séquence
 					sequence, sequence_bloc_id = container
 					sequence.set_empty(sequence_bloc_id)
@@ -286,6 +428,7 @@ class BendayApp(App):
 				self.text_box = hovered_text_box
 				self.text_box.select()
 				self.text_box_bloc = bloc_id
+				self.text_box_hierarchy = hierarchy
 				
 				if self.variables:
 					self.rolling_list = RollingList(
@@ -305,6 +448,7 @@ class BendayApp(App):
 					self.text_box = hovered_bloc.name_box
 					self.text_box.select()
 					self.text_box_bloc = bloc_id
+					self.text_box_hierarchy = hierarchy
 					if self.variables:
 						self.rolling_list = RollingList(
 						  self.camera.world2screen(
@@ -327,8 +471,10 @@ class BendayApp(App):
 				
 				elif hovered_bloc.button_function(button_id):
 					bloc.update_size()
+					bloc.set_dirty(hierarchy)
 					self.update_AST()
 		
+		self.touch_bloc(position, bloc)
 		self.changed = True
 	
 	def unselect_text_box(self):
@@ -337,6 +483,8 @@ class BendayApp(App):
 			self.text_box.unselect()
 			self.changed = True
 			if self.text_box_bloc is not None:
+				self.blocs[self.text_box_bloc][1].set_dirty(self.text_box_hierarchy)
+				self.touch_bloc(*self.blocs[self.text_box_bloc])
 				self.update_AST()
 		
 		if self.text_box is not None or self.rolling_list is not None:
@@ -344,11 +492,40 @@ class BendayApp(App):
 		
 		self.text_box = None
 		self.text_box_bloc = None
+		self.text_box_hierarchy = []
 		self.rolling_list = None
 	
 	def update_AST(self):
-		"""Met à jour l’Abstract Syntax Tree selon la disposition des blocs actuels."""
-		self.AST = self.blocs[0][1].as_ASTNode()
+		"""Met à jour l’Abstract Syntax Tree selon la disposition des blocs actuels,
+		et l’envoie au fil de compilation (l’exécution prend la dernière compilation finie).
+		Seuls les blocs marqués comme modifiés reconstruisent leur ASTNode."""
+		self.AST = self.blocs[0][1].get_ASTNode()
+		if self.profiler is not None:  # Les blocs ont de nouveaux nœuds : le profil n’est plus à jour.
+			self.profiler = None
+			self.show_profile()
+		self.compiler.submit(self.AST)
+		
+		if LIVE_EXECUTION and not self.worker.running:
+			print("\nLIVE EXECUTION :")
+			self.limit_exceeded = None
+			self.stepper = self.live_runner.rerun(self.AST)
+			self.set_running(True)
+	
+	def show_profile(self):
+		"""Colore les blocs selon leur part du temps de la dernière exécution profilée,
+		et affiche (et enregistre) ses mesures."""
+		total_time = self.profiler.total_time if self.profiler is not None else 0
+		for _, root in self.blocs:
+			for bloc in root.iter_blocs():
+				profile = self.profiler.get(bloc.ast_node) if self.profiler is not None else None
+				bloc.heat = min(profile.time / total_time, 1) if profile is not None and total_time else None
+			root.touch()
+		self.changed = True
+		
+		if self.profiler is None: return
+		print(self.profiler.table())
+		if PROFILE_EXPORT_PATH is not None:
+			self.profiler.export_csv(PROFILE_EXPORT_PATH)
 	
 	def add_a_bloc(self):
 		try:
@@ -360,7 +537,7 @@ class BendayApp(App):
 		new_bloc_position = self.camera.screen2world(self.text_box.position + self.text_box.size / 2)
 		
 		if self.mouse_hovered is None:
-			self.blocs.append((new_bloc_position - new_bloc.size / 2, new_bloc))
+			self.add_bloc(new_bloc_position - new_bloc.size / 2, new_bloc)
 		else:
 			bloc_id, hierarchy, hovered_on = self.mouse_hovered
 			position, bloc = self.blocs[bloc_id]
@@ -374,12 +551,15 @@ class BendayApp(App):
 					gap_id = sequence.hovered_gap(point)
 					sequence.set_hovered(gap_id, new_bloc)
 					self.blocs[bloc_id][1].update_size()
+					bloc.set_dirty(hierarchy)
 				case HoveredOn.SLOT:
 					slot = hovered_bloc.slots[hovered_on[1]]
 					slot.set_bloc(new_bloc)
 					self.blocs[bloc_id][1].update_size()
+					bloc.set_dirty(hierarchy)
 				case _:
-					self.blocs.append((new_bloc_position - new_bloc.size / 2, new_bloc))
+					self.add_bloc(new_bloc_position - new_bloc.size / 2, new_bloc)
+			self.touch_bloc(position, bloc)
 		
 		self.update_AST()
 	
@@ -390,10 +570,10 @@ class BendayApp(App):
 		self.selected_bloc[1].hovered_on = HoveredOn.NONE, None
 		
 		if self.bloc_hovered is None:
-			self.blocs.append(self.selected_bloc)
+			self.add_bloc(*self.selected_bloc)
 		else:
 			bloc_id, hierarchy = self.bloc_hovered
-			_, bloc = self.blocs[bloc_id]
+			position, bloc = self.blocs[bloc_id]
 			
 			container = bloc.get_container(hierarchy)
 			
@@ -404,7 +584,10 @@ class BendayApp(App):
 				container.set_bloc(self.selected_bloc[1])
 			
 			bloc.update_size()
+			bloc.set_dirty(hierarchy[:-1])
+			self.touch_bloc(position, bloc)
 		
+		self.selected_bloc[1].touch()
 		self.selected_bloc = None
 		self.bloc_hovered = None
 		self.update_AST()
@@ -421,25 +604,29 @@ class BendayApp(App):
 			bloc_id, hierarchy, _ = self.mouse_hovered
 			bloc = self.blocs[bloc_id][1].get_bloc(hierarchy)
 			bloc.hovered_on = HoveredOn.NONE, None
+			self.bloc_changed(bloc_id, hierarchy)
+			if self.info_timer >= INFO_TIME:  # La boîte d’information dépasse du bloc.
+				self.damage()
 		
 		if new_mouse_hovered is not None:
 			bloc_id, hierarchy, hovered_on = new_mouse_hovered
 			bloc = self.blocs[bloc_id][1].get_bloc(hierarchy)
 			bloc.hovered_on = hovered_on
+			self.bloc_changed(bloc_id, hierarchy)
 			if self.mouse_hovered is not None:
 				self.info_timer = 0
 		self.mouse_hovered = new_mouse_hovered
-		self.changed = True
 	
 	def get_mouse_hover(self) -> tuple[int, list[int], str | None] | None:
 		"""Renvoie la référence du bloc en collision avec la souris et sur quelle partie du bloc elle est."""
 		mouse_world_position = self.camera.screen2world(self.inputs.mouse.position)
 		
-		for i, (position, bloc) in enumerate(reversed(self.blocs)):
+		for bloc_id in reversed(self.blocs_in(mouse_world_position)):
+			position, bloc = self.blocs[bloc_id]
 			hierarchy_hovered_on = bloc.collide_point(mouse_world_position - position)
 			if hierarchy_hovered_on is not None:
 				hierarchy, hovered_on = hierarchy_hovered_on
-				return len(self.blocs) - 1 - i, list(reversed(hierarchy)), hovered_on
+				return bloc_id, list(reversed(hierarchy)), hovered_on
 		return None
 	
 	def bloc_hover(self):
@@ -449,7 +636,7 @@ class BendayApp(App):
 		
 		if self.bloc_hovered is not None:
 			bloc_id, hierarchy = self.bloc_hovered
-			_, bloc = self.blocs[bloc_id]
+			position, bloc = self.blocs[bloc_id]
 			container = bloc.get_container(hierarchy)
 			
 			if type(container) is tuple:  # Séquence
@@ -458,10 +645,11 @@ class BendayApp(App):
 			else:  # Slot
 				container.set_empty(self.camera)
 			bloc.update_size()
+			self.touch_bloc(position, bloc)
 		
 		if new_bloc_hovered is not None:
 			bloc_id, hierarchy = new_bloc_hovered
-			_, bloc = self.blocs[bloc_id]
+			position, bloc = self.blocs[bloc_id]
 			container = bloc.get_container(hierarchy)
 			
 			if type(container) is tuple:  # Séquence
@@ -470,6 +658,7 @@ class BendayApp(App):
 			else:  # Slot
 				container.set_hovered(self.selected_bloc[1].size)
 			bloc.update_size()
+			self.touch_bloc(position, bloc)
 		
 		self.bloc_hovered = new_bloc_hovered
 	
@@ -479,7 +668,8 @@ class BendayApp(App):
 		
 		ratio = 0
 		bloc_id_hierarchy = None
-		for i, (position, bloc) in enumerate(self.blocs):
+		for i in self.blocs_in(selected_position, selected.size):
+			position, bloc = self.blocs[i]
 			hierarchy_ratio = bloc.hovered_slot(selected_position - position, selected.size, ratio)
 			
 			if hierarchy_ratio is not None and hierarchy_ratio[1] > ratio:
@@ -488,11 +678,75 @@ class BendayApp(App):
 		
 		return bloc_id_hierarchy
 	
+	def bloc_rect(self, bloc_id: int, hierarchy: list[int | tuple[int, int]] | None = None) -> Rect:
+		"""Renvoie la zone de l’écran occupée par un bloc (ou un de ses blocs enfants) et sa boîte du haut."""
+		position, bloc = self.blocs[bloc_id]
+		if hierarchy:
+			position = position + bloc.get_position(hierarchy)
+			bloc = bloc.get_bloc(hierarchy)
+		return self.screen_rect(position, bloc)
+	
+	def screen_rect(self, position: Vec2, bloc: ParentBloc) -> Rect:
+		offset, size = bloc.bounds()
+		return Rect(self.camera.world2screen(position + offset), size * self.camera.scale)
+	
+	def bloc_changed(self, bloc_id: int, hierarchy: list[int | tuple[int, int]] | None = None):
+		"""Redessine un bloc (ou un de ses blocs enfants) dont l’apparence a changé."""
+		self.touch_bloc(*self.blocs[bloc_id])
+		self.damage(self.bloc_rect(bloc_id, hierarchy))
+	
+	def add_bloc(self, position: Vec2, bloc: ParentBloc):
+		"""Ajoute un bloc racine à la scène, au-dessus des autres."""
+		self.bloc_ids[id(bloc)] = len(self.blocs)
+		self.blocs.append((position, bloc))
+		offset, size = bloc.bounds()
+		self.bloc_index.insert(id(bloc), position + offset, size)
+	
+	def remove_bloc(self, bloc_id: int) -> tuple[Vec2, ParentBloc]:
+		"""Retire un bloc racine de la scène et le renvoie (avec sa position)."""
+		position, bloc = self.blocs.pop(bloc_id)
+		self.bloc_index.remove(id(bloc))
+		self.bloc_ids = {id(root): i for i, (_, root) in enumerate(self.blocs)}
+		return position, bloc
+	
+	def index_blocs(self):
+		"""Range tous les blocs racines dans l’index spatial."""
+		self.bloc_index.clear()
+		self.bloc_ids = {}
+		blocs, self.blocs = self.blocs, []
+		for position, bloc in blocs:
+			self.add_bloc(position, bloc)
+	
+	def touch_bloc(self, position: Vec2, bloc: ParentBloc):
+		"""Change la version d’un bloc racine modifié, et met à jour sa zone dans l’index spatial
+		(s’il est encore dans la scène)."""
+		bloc.touch()
+		if id(bloc) not in self.bloc_index: return
+		offset, size = bloc.bounds()
+		self.bloc_index.update(id(bloc), position + offset, size)
+	
+	def blocs_in(self, position: Vec2, size: Vec2 = Vec2(0)) -> list[int]:
+		"""Renvoie les indices (dans l’ordre de 'self.blocs') des blocs racines dont la zone touche
+		le rectangle (ou le point) du monde."""
+		return [self.bloc_ids[key] for key in self.bloc_index.query_rect(position, size)]
+	
+	def text_box_changed(self):
+		"""Redessine la boîte de texte sélectionnée (et son bloc)."""
+		if self.text_box_bloc is None:
+			self.damage(self.text_box.hit_box)
+		else:
+			self.bloc_changed(self.text_box_bloc, self.text_box_hierarchy)
+	
 	def draw_world(self):
 		self.draw_grid(draw_border=True)
 		
-		for position, bloc in self.blocs:
-			bloc.draw(self.window_surface, self.camera, position)
+		clip = self.window_surface.get_clip()  # Seuls les blocs de la zone réaffichée sont dessinés.
+		for bloc_id in self.blocs_in(self.camera.screen2world(clip.topleft), Vec2(clip.size) / self.camera.scale):
+			position, bloc = self.blocs[bloc_id]
+			if self.bloc_cache is None:
+				bloc.draw(self.window_surface, self.camera, position)
+			else:
+				self.bloc_cache.draw(self.window_surface, self.camera, bloc, position)
 		
 		self.draw_info_box()
 		
@@ -506,6 +760,15 @@ class BendayApp(App):
 			self.rolling_list.draw(self.window_surface)
 		
 		self.draw_clock()
+		self.draw_limit_exceeded()
+	
+	def draw_limit_exceeded(self):
+		"""Affiche la limite dépassée par la dernière exécution."""
+		if self.limit_exceeded is None: return
+		bt_play = self.ui_objects["bt_play"]
+		draw_text(self.window_surface, str(self.limit_exceeded),
+		          bt_play.position + Vec2(bt_play.size.x / 2 + MARGIN, 0),
+		          20, "dark red", align="left", back_framed=True)
 	
 	def draw_info_box(self):
 		"""Affiche la boite d’information au-dessus d’un bloc quand on survole son bouton info."""
@@ -519,7 +782,7 @@ class BendayApp(App):
 		title = hovered_bloc.__class__.__name__.split("Bloc")[0].upper()
 		text = f"{title}\n{hovered_bloc.__doc__}".replace("\t", "").split("\n")
 		
-		size = Vec2(max([FONT_20.size(line)[0] for line in text]), len(text) * FONT_20.get_height())
+		size = Vec2(max([measure_text(line, "tw cen", 20)[0] for line in text]), len(text) * FONT_20.get_height())
 		info_position = self.camera.world2screen(
 		  position + bloc.get_position(hierarchy) +
 		  hovered_bloc.top_box_position + Vec2(TOP_BOX_SIZE.x / 2, 0)) - Vec2(size.x / 2, size.y + MARGIN)
@@ -0,0 +1,105 @@
+"""Ce programme python reconstruit les blocs d’un programme à partir de son AST (par exemple chargé
+avec 'Interpreter.Save') - l’inverse des méthodes 'as_ASTNode' des blocs."""
+from AST import ASTNode, ASTNodeIfElse, ASTNodeLiteral, ASTNodeMathExpression, ASTNodePrint, ASTNodeSequence,\
+	ASTNodeValue, ASTNodeVariable, ASTNodeVariableAssignment, ASTNodeVariableReturn, ASTNodeWhile
+from Blocs.Containers import Sequence, Slot
+from Blocs.IfElseBloc import IfElseBloc
+from Blocs.MotherBloc import MotherBloc
+from Blocs.ParentBloc import ParentBloc
+from Blocs.PrintBloc import PrintBloc
+from Blocs.ReturnBloc import ReturnBloc
+from Blocs.SequenceBloc import SequenceBloc
+from Blocs.VariableAssignmentBloc import VariableAssignmentBloc
+from Blocs.WhileBloc import WhileBloc
+from Interpreter.Save import SaveError
+
+STATEMENTS: tuple[type, ...] = (ASTNodeSequence, ASTNodeIfElse, ASTNodeWhile, ASTNodeVariableAssignment,
+                                ASTNodePrint, ASTNodeVariableReturn)
+"""Nœuds qui correspondent à un bloc - les autres sont le texte d’un slot."""
+
+
+def build_mother(node: ASTNodeSequence) -> MotherBloc:
+	"""Renvoie le bloc mère contenant les blocs du programme."""
+	mother = MotherBloc()
+	fill_sequence(mother.sequences[0], node)
+	mother.update_size()
+	return mother
+
+
+def build_bloc(node: ASTNode) -> ParentBloc:
+	"""Renvoie le bloc d’une instruction, avec ses blocs enfants."""
+	match node:
+		case ASTNodeSequence():
+			bloc = SequenceBloc()
+			fill_sequence(bloc.sequences[0], node)
+		
+		case ASTNodeIfElse(if_condition=if_condition, if_sequence=if_sequence,
+		                   elifs=elifs, else_sequence=else_sequence):
+			bloc = IfElseBloc()
+			fill_slot(bloc.slots[0], if_condition)
+			fill_sequence(bloc.sequences[0], if_sequence)
+			for condition, sequence in elifs:
+				bloc.button_function(2 * (len(bloc.slots) - 1))  # Bouton "elif_add" de la dernière ligne.
+				fill_slot(bloc.slots[-1], condition)
+				fill_sequence(bloc.sequences[-1], sequence)
+			if else_sequence is not None:
+				bloc.button_function(bloc.buttons.index("else"))
+				fill_sequence(bloc.sequences[-1], else_sequence)
+		
+		case ASTNodeWhile(condition=condition, sequence=sequence, is_do=is_do):
+			bloc = WhileBloc()
+			bloc.is_do = is_do
+			fill_slot(bloc.slots[0], condition)
+			fill_sequence(bloc.sequences[0], sequence)
+		
+		case ASTNodeVariableAssignment(name=name, value=value, type=declared):
+			bloc = VariableAssignmentBloc()
+			bloc.name_box.text = name
+			bloc.name_box.update_size()
+			bloc.type = declared
+			fill_slot(bloc.slots[0], value)
+		
+		case ASTNodePrint(value=value):
+			bloc = PrintBloc()
+			fill_slot(bloc.slots[0], value)
+		
+		case ASTNodeVariableReturn(value=value):
+			bloc = ReturnBloc()
+			fill_slot(bloc.slots[0], value)
+		
+		case _:
+			raise SaveError(f"'{node.__class__.__name__}' has no bloc")
+	
+	bloc.update_size()
+	return bloc
+
+
+def fill_sequence(sequence: Sequence, node: ASTNodeSequence):
+	sequence.blocs = [build_bloc(element) for element in node.elements]
+
+
+def fill_slot(slot: Slot, node: ASTNode):
+	"""Remplit un slot avec le bloc d’une instruction, ou avec le texte de sa valeur."""
+	if isinstance(node, STATEMENTS):
+		slot.set_bloc(build_bloc(node))
+		return
+	slot.text_box.text = slot_text(node)
+	slot.text_box.update_size()
+
+
+def slot_text(node: ASTNode) -> str:
+	"""Renvoie un texte de slot qui est analysé ('parse_slot') en une valeur équivalente au nœud."""
+	match node:
+		case ASTNodeLiteral(value=None):
+			return ""
+		case ASTNodeLiteral(value=bool(value)):
+			return "1 > 0" if value else "1 < 0"  # Le texte "True" serait un texte, pas un booléen.
+		case ASTNodeLiteral(value=value):
+			return str(value)
+		case ASTNodeVariable(name=name):
+			return f"{{{name}}}"
+		case ASTNodeMathExpression(text=text) | ASTNodeValue(value=str(text)):
+			return text
+		case ASTNodeValue(value=value):
+			return str(value)
+	raise SaveError(f"'{node.__class__.__name__}' cannot be written in a slot")
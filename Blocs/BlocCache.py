@@ -0,0 +1,83 @@
+"""Ce programme python garde en cache l’image de chaque bloc racine, dessinée une seule fois par version
+du bloc et par niveau de zoom : les images suivantes ne font que la copier à l’écran."""
+from collections import OrderedDict
+from dataclasses import dataclass
+from math import ceil, log2
+
+from pygame import SRCALPHA, Surface, Vector2 as Vec2
+
+from Blocs.ParentBloc import ParentBloc
+from MyPygameLibrary.Camera import Camera
+
+SCALE_STEPS: int = 8
+"""Niveaux de zoom par doublement de l’échelle - deux échelles au même niveau partagent leur image."""
+
+
+@dataclass(slots=True)
+class CachedSurface:
+	version: int
+	"""Version du bloc dessiné."""
+	surface: Surface
+	offset: Vec2
+	"""Position de l’image dans le monde, en référence au bloc."""
+	
+	@property
+	def memory(self) -> int:
+		return self.surface.get_bytesize() * self.surface.get_width() * self.surface.get_height()
+
+
+class BlocCache:
+	"""Images des blocs racines, oubliées de la moins récemment affichée à la plus récente
+	quand leur mémoire dépasse 'max_memory'."""
+	
+	def __init__(self, max_memory: int):
+		self.max_memory = max_memory
+		self.memory: int = 0
+		"""Mémoire des images gardées (en octets)."""
+		self._surfaces: OrderedDict[tuple[int, int], CachedSurface] = OrderedDict()
+		self.hits: int = 0
+		self.misses: int = 0
+	
+	def draw(self, surface: Surface, camera: Camera, bloc: ParentBloc, position: Vec2):
+		"""Affiche le bloc à sa position, en le redessinant seulement s’il a changé depuis
+		sa dernière image à ce niveau de zoom."""
+		key = id(bloc), round(log2(camera.scale) * SCALE_STEPS)
+		cached = self._surfaces.get(key)
+		if cached is not None and cached.version == bloc.version:
+			self._surfaces.move_to_end(key)
+			self.hits += 1
+		else:
+			self.misses += 1
+			if cached is not None: self.memory -= self._surfaces.pop(key).memory
+			cached = self.render(bloc, camera.scale)
+			if cached is None:  # Le bloc est dessiné directement.
+				bloc.draw(surface, camera, position)
+				return
+			self._surfaces[key] = cached
+			self.memory += cached.memory
+			self.evict()
+		
+		surface.blit(cached.surface, camera.world2screen(position + cached.offset))
+	
+	def render(self, bloc: ParentBloc, scale: float) -> CachedSurface | None:
+		"""Dessine le bloc sur une image transparente, à l’échelle donnée.
+		Renvoie None si l’image serait plus grande que toute la mémoire du cache."""
+		offset, size = bloc.bounds()
+		width, height = ceil(size.x * scale), ceil(size.y * scale)
+		if width * height * 4 > self.max_memory: return None
+		
+		surface = Surface((width, height), SRCALPHA)
+		camera = Camera(Vec2(surface.get_size()), offset, scale)
+		camera.size_changed = True  # Les boîtes de texte redessinent leur texte à cette échelle.
+		bloc.draw(surface, camera, Vec2(0, 0))
+		return CachedSurface(bloc.version, surface, offset)
+	
+	def evict(self):
+		"""Oublie les images les moins récemment affichées, jusqu’à respecter la mémoire maximale."""
+		while self.memory > self.max_memory:
+			_, cached = self._surfaces.popitem(last=False)
+			self.memory -= cached.memory
+	
+	def clear(self):
+		self._surfaces.clear()
+		self.memory = 0
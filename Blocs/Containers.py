@@ -3,7 +3,7 @@ from enum import Enum, auto
 from typing import Any
 from pygame import Color, Rect, Surface, Vector2 as Vec2
 
-from AST import ASTNodeSequence, ASTNodeValue
+from AST import ASTNode, ASTNodeSequence, parse_slot
 from Constantes import RADIUS, SLOT_SIZE, SLOT_TEXT_SIZE, SMALL_RADIUS
 
 from MyPygameLibrary.Camera import Camera
@@ -30,6 +30,9 @@ class Slot:
 	"""Compartiment pouvant contenir du texte, un bloc ou être vide."""
 	text_box: TextBox
 	bloc: Any | None
+	ast_node: ASTNode | None
+	ast_text: str | None
+	"""Texte dont 'ast_node' a été analysé."""
 	
 	def __init__(self, color: Color, default_text: str = ""):
 		self.text_box = TextBox(
@@ -38,6 +41,8 @@ class Slot:
 		  darker(color, .8), default_text=default_text, fixed_size=False,
 		  text_size=SLOT_TEXT_SIZE, corner_radius=SMALL_RADIUS, border=0)
 		self.bloc = None
+		self.ast_node = None
+		self.ast_text = None
 	
 	def __repr__(self):
 		if self.bloc is not None:
@@ -125,12 +130,15 @@ class Slot:
 		if hovered:
 			draw_rect(surface, camera, "black", position, self.size, 1, SMALL_RADIUS)
 	
-	def as_AST(self) -> ASTNodeValue | Any:
-		"""Retourne l’ASTNode de la séquence."""
-		if self.bloc is None:
-			return ASTNodeValue(self.text_box.text if self.text_box.text else None)
-		else:
-			return self.bloc.as_ASTNode()
+	def as_AST(self) -> ASTNode:
+		"""Retourne l’ASTNode du slot. Son texte n’est analysé à nouveau que s’il a changé."""
+		if self.bloc is not None:
+			return self.bloc.get_ASTNode()
+		
+		if self.ast_node is None or self.ast_text != self.text_box.text:
+			self.ast_text = self.text_box.text
+			self.ast_node = parse_slot(self.ast_text)
+		return self.ast_node
 
 
 @dataclass(slots=True)
@@ -138,6 +146,7 @@ class Sequence:
 	"""Séquence de blocs."""
 	color: Color
 	blocs: list[Any | Vec2] = field(default_factory=list)
+	ast_node: ASTNodeSequence | None = field(default=None, repr=False, compare=False)
 	
 	def __repr__(self):
 		return " , ".join([f"{bloc}" for bloc in self.blocs])
@@ -286,5 +295,10 @@ class Sequence:
 			draw_rect(surface, camera, "black", position, self.size, 1, RADIUS)
 	
 	def as_AST(self) -> ASTNodeSequence:
-		"""Retourne la list contenant les ASTNodes de la séquence."""
-		return ASTNodeSequence([bloc.as_ASTNode() for bloc in self.blocs])
+		"""Retourne la list contenant les ASTNodes de la séquence.
+		Elle reste la même tant que ses blocs renvoient les mêmes ASTNodes."""
+		elements = [bloc.get_ASTNode() for bloc in self.blocs]
+		if self.ast_node is None or len(elements) != len(self.ast_node.elements)\
+		  or any(element is not cached for element, cached in zip(elements, self.ast_node.elements)):
+			self.ast_node = ASTNodeSequence(elements)
+		return self.ast_node
@@ -182,4 +182,5 @@ class IfElseBloc(ParentBloc):
 		         for slot, sequence in zip(self.slots[1:], self.sequences[1:])]
 		else_sequence = self.sequences[-1].as_AST() if self.is_else else None
 		
-		return ASTNodeIfElse(self.slots[0].as_AST(), self.sequences[0].as_AST(), elifs, else_sequence)
+		self.ast_node = ASTNodeIfElse(self.slots[0].as_AST(), self.sequences[0].as_AST(), elifs, else_sequence)
+		return self.ast_node
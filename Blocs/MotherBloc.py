@@ -19,6 +19,7 @@ class MotherSequence(Sequence):
 	def __init__(self):
 		self.color = COLOR
 		self.blocs = []
+		self.ast_node = None
 	
 	@property
 	def size(self) -> Vec2:
@@ -71,4 +72,5 @@ class MotherBloc(ParentBloc):
 		self.sequences[0].draw(surface, camera, origin + self.sequence_position(0), hovered)
 	
 	def as_ASTNode(self) -> ASTNodeSequence:
-		return self.sequences[0].as_AST()
+		self.ast_node = self.sequences[0].as_AST()
+		return self.ast_node
@@ -1,5 +1,6 @@
 from dataclasses import dataclass
-from typing import Any
+from itertools import count
+from typing import Any, Generator
 from pygame import Color, Surface, Vector2 as Vec2
 
 from AST import ASTNode
@@ -24,6 +25,13 @@ COPY_BT_COLOR: Color = hsv_color(40, 0, 60)
 CROSS_BT_COLOR: Color = hsv_color(10, 75, 100)
 
 SHADOW: Vec2 = Vec2(6, 8)
+BOUNDS_MARGIN: int = 2
+"""Marge autour de la zone d’un bloc, pour ses bordures."""
+
+VERSIONS = count()
+"""Numéros de version des blocs, uniques entre tous les blocs."""
+
+HEAT_COLOR: Color = hsv_color(0, 90, 100)
 
 
 @dataclass(slots=True)
@@ -37,6 +45,16 @@ class ParentBloc:
 	hovered_on: tuple[HoveredOn, int | None]
 	buttons: list[str]
 	
+	ast_node: ASTNode | None
+	"""Dernier nœud construit par 'as_ASTNode' - relie les mesures d’une exécution au bloc."""
+	dirty: bool
+	"""Indique si le bloc (ou un de ses enfants) a été modifié depuis la construction de 'ast_node'."""
+	heat: float | None
+	"""Part (de 0 à 1) du temps du programme profilé passée dans ce bloc - None sans profil."""
+	version: int
+	"""Change à chaque modification de l’apparence du bloc ou de ses enfants (voir 'touch') :
+	un bloc racine dessiné une fois est gardé en cache tant qu’il a la même version."""
+	
 	def __init__(self, color: Color, slots: list[Slot] | list[str] | int = 0,
 	             sequences: list[Sequence] | int = 0, buttons: list[str] = None):
 		self.color = color
@@ -51,6 +69,21 @@ class ParentBloc:
 		self.size = self.get_size()
 		self.hovered_on = HoveredOn.NONE, None
 		self.buttons = buttons if buttons is not None else []
+		self.ast_node = None
+		self.dirty = True
+		self.heat = None
+		self.version = next(VERSIONS)
+	
+	def touch(self):
+		"""Signale que l’apparence du bloc (ou de ses enfants) a changé."""
+		self.version = next(VERSIONS)
+	
+	def bounds(self) -> tuple[Vec2, Vec2]:
+		"""Retourne la position (en référence au bloc) et la taille de la zone où il se dessine,
+		boîte du haut comprise."""
+		offset = Vec2(min(self.top_box_position.x, 0), -TOP_BOX_SIZE.y) - Vec2(BOUNDS_MARGIN)
+		size = Vec2(max(self.size.x, TOP_BOX_SIZE.x), self.size.y + TOP_BOX_SIZE.y) + Vec2(2 * BOUNDS_MARGIN)
+		return offset, size
 	
 	def update_size(self):
 		"""Met à jour la taille du bloc et celles de ses enfants."""
@@ -233,8 +266,9 @@ class ParentBloc:
 			draw_rect(surface, camera, "black", origin + self.top_box_position,
 			          TOP_BOX_SIZE + Vec2(0, 3), 1, RADIUS, -1, -1, 0, 0)
 		
-		draw_rect(surface, camera, self.color, origin, self.size, 0, RADIUS)
-		draw_rect(surface, camera, darker(self.color, .8), origin, self.size, 2, RADIUS)
+		color = self.color if self.heat is None else Color(self.color).lerp(HEAT_COLOR, self.heat)
+		draw_rect(surface, camera, color, origin, self.size, 0, RADIUS)
+		draw_rect(surface, camera, darker(color, .8), origin, self.size, 2, RADIUS)
 		
 		if self.hovered_on[0] != HoveredOn.NONE:
 			draw_rect(surface, camera, "black", origin, self.size, 1, RADIUS)
@@ -356,7 +390,40 @@ class ParentBloc:
 		"""Renvoie si le bouton doit toujours être affiché ou seulement quand la souris est par-dessus."""
 		return False
 	
+	def set_dirty(self, hierarchy: list[int | tuple[int, int]]):
+		"""Marque le bloc donné par une hiérarchie et tous ses parents comme modifiés.
+		Exemple de hiérarchie: [A, (B, C), D] -> Slot A, (Sequence B, Bloc C), Slot D"""
+		bloc = self
+		bloc.dirty = True
+		
+		for container_id in hierarchy:
+			if type(container_id) is tuple:
+				sequence_id, bloc_id = container_id
+				bloc = bloc.sequences[sequence_id].blocs[bloc_id]
+			else:
+				bloc = bloc.slots[container_id].bloc
+			bloc.dirty = True
+	
+	def iter_blocs(self) -> Generator["ParentBloc", None, None]:
+		"""Parcourt ce bloc et tous les blocs qu’il contient."""
+		yield self
+		for slot in self.slots:
+			if slot.bloc is not None:
+				yield from slot.bloc.iter_blocs()
+		for sequence in self.sequences:
+			for bloc in sequence.blocs:
+				if type(bloc) is Vec2: continue
+				yield from bloc.iter_blocs()
+	
+	def get_ASTNode(self) -> ASTNode:
+		"""Retourne l’ASTNode du bloc, reconstruit seulement si le bloc a été modifié :
+		les blocs enfants non modifiés réutilisent le leur."""
+		if self.dirty or self.ast_node is None:
+			self.as_ASTNode()
+			self.dirty = False
+		return self.ast_node
+	
 	def as_ASTNode(self) -> ASTNode:
-		"""Retourne l’ASTNode du bloc."""
+		"""Construit l’ASTNode du bloc (et le garde dans 'ast_node')."""
 		raise NotImplementedError(f"'as_ASTNode' is not implemented in "
 		                          f"'{self.__class__.__name__}' class")
@@ -36,4 +36,5 @@ class PrintBloc(ParentBloc):
 		          "black", align="left", camera=camera)
 	
 	def as_ASTNode(self) -> ASTNodePrint:
-		return ASTNodePrint(self.slots[0].as_AST())
+		self.ast_node = ASTNodePrint(self.slots[0].as_AST())
+		return self.ast_node
@@ -27,4 +27,5 @@ class ReturnBloc(ParentBloc):
 		return Vec2(1, 1) * MARGIN
 	
 	def as_ASTNode(self) -> ASTNodeVariableReturn:
-		return ASTNodeVariableReturn(self.slots[0].as_AST())
+		self.ast_node = ASTNodeVariableReturn(self.slots[0].as_AST())
+		return self.ast_node
@@ -28,4 +28,5 @@ class SequenceBloc(ParentBloc):
 		return Vec2(1, 1) * MARGIN
 	
 	def as_ASTNode(self) -> ASTNodeSequence:
-		return self.sequences[0].as_AST()
+		self.ast_node = self.sequences[0].as_AST()
+		return self.ast_node
@@ -117,4 +117,5 @@ class VariableAssignmentBloc(ParentBloc):
 	
 	def as_ASTNode(self) -> ASTNodeVariableAssignment:
 		name_text = self.name_box.text if self.name_box.text else "-"
-		return ASTNodeVariableAssignment(name_text, self.slots[0].as_AST())
+		self.ast_node = ASTNodeVariableAssignment(name_text, self.slots[0].as_AST(), self.type)
+		return self.ast_node
@@ -107,4 +107,5 @@ class WhileBloc(ParentBloc):
 		return int(TEXT_DO_WHILE_SIZE.x if self.is_do else TEXT_WHILE_SIZE.x)
 	
 	def as_ASTNode(self) -> ASTNodeWhile:
-		return ASTNodeWhile(self.slots[0].as_AST(), self.sequences[0].as_AST(), self.is_do)
+		self.ast_node = ASTNodeWhile(self.slots[0].as_AST(), self.sequences[0].as_AST(), self.is_do)
+		return self.ast_node
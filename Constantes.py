@@ -1,8 +1,10 @@
 from pygame import font, Vector2 as Vec2
 
+from MyPygameLibrary.Fonts import get_font
+
 # Text
 font.init()
-FONT_20: font.Font = font.SysFont("tw cen", 20)
+FONT_20: font.Font = get_font("tw cen", 20)
 # print(font.get_fonts())
 
 
@@ -11,6 +13,30 @@ MOTHER_SIZE: Vec2 = 100 * Vec2(4, 6)
 
 TYPES: list[str] = ["Int", "Float", "Bool", "String"]
 
+EXECUTION_MODES: list[str] = ["reference", "closures", "bytecode", "stepper"]
+EXECUTION_MODE: str = "closures"
+"""Exécution du programme : en parcourant l’AST (mode de référence), par ses fermetures compilées (le plus
+rapide) ou par la machine à pile, dans un processus séparé - ou pas à pas dans l’éditeur ("stepper").
+La machine à pile est plus rapide que le parcours de l’AST mais deux à cinq fois plus lente que les fermetures :
+elle sert aux programmes trop imbriqués pour la pile de Python (quelques centaines de blocs), qu’elle exécute
+sans récursion."""
+STEP_BUDGET: float = 4
+"""Temps d’exécution pas à pas accordé au programme à chaque image (en millisecondes)."""
+LIVE_EXECUTION: bool = False
+"""Réexécute le programme pas à pas à chaque modification, à partir de la première instruction modifiée."""
+COMPILE_DELAY: float = 0.15
+"""Temps sans modification (en secondes) avant de compiler le programme en arrière-plan."""
+OPTIMIZING: bool = True
+"""Simplifie le programme avant son exécution (calculs constants, branches et assignations inutiles)."""
+PROFILING: bool = False
+"""Mesure chaque nœud pendant l’exécution (avec les fermetures compilées) et colore les blocs selon leur coût."""
+PROFILE_EXPORT_PATH: str | None = None
+"""Fichier CSV où enregistrer les mesures de chaque exécution profilée."""
+PROGRAM_PATH: str = "program.json"
+"""Fichier où les boutons SAVE et LOAD enregistrent et rechargent le programme (voir 'Interpreter.Save')."""
+BLOC_CACHE_SIZE: int | None = 64 * 2 ** 20
+"""Mémoire (en octets) des images des blocs gardées en cache entre deux affichages - None les redessine à chaque fois."""
+
 
 # Blocs
 RADIUS: int = 7
@@ -0,0 +1,174 @@
+"""Ce programme python exécute des programmes enregistrés ('Interpreter.Save') sans l’éditeur ni affichage,
+répartis sur plusieurs processus, et écrit le résultat de chacun sur une ligne JSON.
+Utilisation : python -m Interpreter.Batch programmes/*.json [--workers 8] [--timeout 10] [--output résultats.jsonl]
+Avec '--mode vectorized --inputs valeurs.json', chaque programme est exécuté sur toutes les lignes de valeurs
+de départ à la fois ('Interpreter.Vectorized', qui a besoin de NumPy)."""
+import argparse
+import json
+import os
+import sys
+from contextlib import redirect_stdout
+from io import StringIO
+from multiprocessing import Pipe, Process
+from multiprocessing.connection import Connection, wait
+from time import perf_counter
+
+from AST import compile_program
+from Interpreter.Bytecode import compile_bytecode
+from Interpreter.Limits import Budget, ExecutionLimits, LimitExceeded
+from Interpreter.Optimizer import optimize
+from Interpreter.Save import load_program
+
+MODES: list[str] = ["reference", "closures", "bytecode", "vectorized"]
+TIMEOUT_MARGIN: float = 1
+"""Temps (en secondes) laissé à un programme au-delà de sa durée maximale pour signaler lui-même son dépassement
+(et pour se charger) : passé ce délai, son processus est arrêté."""
+
+Inputs = dict[str, list]
+"""Valeurs de départ des variables : une liste par variable, un élément par ligne (mode "vectorized")."""
+
+
+def run_file(path: str, mode: str, limits: ExecutionLimits, optimizing: bool = True,
+             inputs: Inputs | None = None) -> dict:
+	"""Charge et exécute un programme, et renvoie ce qu’il a affiché et retourné (ou son erreur).
+	En mode "vectorized", le résultat de chaque ligne des valeurs de départ est dans "rows"."""
+	result = empty_result(path)
+	output = StringIO()
+	start = perf_counter()
+	try:
+		node = load_program(path)
+		if optimizing: node = optimize(node)
+		with redirect_stdout(output):
+			match mode:
+				case "reference":
+					result["return"] = node.execute({}, Budget(limits))
+				case "closures":
+					result["return"] = compile_program(node).run(limits=limits)
+				case "bytecode":
+					result["return"] = compile_bytecode(node).run(limits=limits)
+				case "vectorized":
+					from Interpreter.Vectorized import run_batch  # NumPy n’est importé que dans ce mode.
+					batch = run_batch(node, inputs or {}, limits)
+					result["rows"] = [{"prints": prints, "return": value, "error": error}
+					                  for prints, value, error in zip(batch.outputs, batch.returns, batch.errors)]
+				case _:
+					raise ValueError(f"unknown execution mode '{mode}'")
+	except LimitExceeded as limit:
+		result["limit"] = str(limit)
+	except Exception as error:
+		result["error"] = f"{error.__class__.__name__}: {error}"
+	result["prints"] = output.getvalue().splitlines()
+	result["time"] = perf_counter() - start
+	return result
+
+
+def empty_result(path: str) -> dict:
+	return {"program": path, "prints": [], "return": None, "error": None, "limit": None}
+
+
+def run_in_process(connection: Connection, path: str, mode: str, limits: ExecutionLimits, optimizing: bool,
+                   inputs: Inputs | None):
+	"""Exécute un programme dans son propre processus, et envoie son résultat au processus principal."""
+	connection.send(run_file(path, mode, limits, optimizing, inputs))
+	connection.close()
+
+
+def run_files(paths: list[str], mode: str, limits: ExecutionLimits, workers: int | None = None,
+              optimizing: bool = True, inputs: Inputs | None = None):
+	"""Exécute chaque programme dans son propre processus (au plus 'workers' à la fois) et renvoie leurs résultats
+	dès qu’ils sont prêts. Les limites ne sont vérifiées qu’entre deux instructions : un programme bloqué dans
+	une seule instruction (un texte qui double de taille) est arrêté avec son processus passé sa durée maximale,
+	sans retarder les autres. Un processus qui s’arrête sans résultat (faute de mémoire) est signalé en erreur."""
+	workers = workers or os.cpu_count() or 1
+	waiting = list(reversed(paths))
+	running: dict[Connection, tuple[str, Process, float]] = {}
+	"""Programme, processus et début de chaque exécution en cours, selon la connexion de son résultat."""
+	
+	while waiting or running:
+		while waiting and len(running) < workers:
+			path = waiting.pop()
+			receiver, sender = Pipe(duplex=False)
+			process = Process(target=run_in_process, args=(sender, path, mode, limits, optimizing, inputs),
+			                  daemon=True)
+			process.start()
+			sender.close()  # Seul le processus du programme écrit : la connexion se ferme avec lui.
+			running[receiver] = path, process, perf_counter()
+		
+		timeout = None
+		if limits.max_time is not None:
+			first_start = min(start for _, _, start in running.values())
+			timeout = max(0., first_start + limits.max_time + TIMEOUT_MARGIN - perf_counter())
+		
+		for receiver in wait(list(running), timeout):
+			path, process, start = running.pop(receiver)
+			try:
+				result = receiver.recv()
+			except EOFError:
+				result = empty_result(path)
+				result["error"] = f"the program process stopped without a result (exit code {process.exitcode})"
+				result["time"] = perf_counter() - start
+			receiver.close()
+			process.join()
+			yield result
+		
+		if limits.max_time is None: continue
+		for receiver, (path, process, start) in list(running.items()):
+			elapsed = perf_counter() - start
+			if elapsed < limits.max_time + TIMEOUT_MARGIN: continue
+			process.kill()
+			process.join()
+			receiver.close()
+			del running[receiver]
+			result = empty_result(path)
+			result["limit"] = str(LimitExceeded("time", elapsed, limits.max_time))
+			result["time"] = elapsed
+			yield result
+
+
+def load_inputs(path: str) -> Inputs:
+	"""Charge les valeurs de départ : un objet JSON d’une liste par variable, toutes de la même longueur."""
+	with open(path, encoding="utf-8") as file:
+		inputs = json.load(file)
+	if type(inputs) is not dict or not all(type(values) is list for values in inputs.values()):
+		raise ValueError(f"'{path}' is not a JSON object of lists")
+	if len({len(values) for values in inputs.values()}) > 1:
+		raise ValueError(f"the lists of '{path}' have different lengths")
+	return inputs
+
+
+def main(arguments: list[str] | None = None):
+	parser = argparse.ArgumentParser(description="Run saved Benday programs without the editor.")
+	parser.add_argument("programs", nargs="+", help="JSON files saved with 'Interpreter.Save'")
+	parser.add_argument("--mode", choices=MODES, default="closures")
+	parser.add_argument("--workers", type=int, default=os.cpu_count(), help="number of processes")
+	parser.add_argument("--timeout", type=float, default=10, help="maximum duration of each program (seconds)")
+	parser.add_argument("--max-steps", type=int, default=ExecutionLimits().max_steps)
+	parser.add_argument("--no-optimize", action="store_true", help="run the programs without simplifying them")
+	parser.add_argument("--inputs", help="JSON file of starting values, a list per variable: with --mode vectorized, "
+	                                     "each program runs once per row, all rows at once (needs NumPy)")
+	parser.add_argument("--output", help="JSON lines file of the results (printed if omitted)")
+	options = parser.parse_args(arguments)
+	
+	inputs = None
+	if options.mode == "vectorized":
+		try:
+			import Interpreter.Vectorized
+			inputs = load_inputs(options.inputs) if options.inputs is not None else {}
+		except (ImportError, OSError, ValueError) as error:
+			parser.error(str(error))
+	elif options.inputs is not None:
+		parser.error("--inputs needs --mode vectorized")
+	
+	limits = ExecutionLimits(max_steps=options.max_steps, max_time=options.timeout)
+	file = sys.stdout if options.output is None else open(options.output, "w", encoding="utf-8")
+	try:
+		for result in run_files(options.programs, options.mode, limits, options.workers, not options.no_optimize,
+		                        inputs):
+			file.write(json.dumps(result, ensure_ascii=False) + "\n")
+			file.flush()
+	finally:
+		if file is not sys.stdout: file.close()
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,464 @@
+"""Ce programme python transforme l’AST en une liste plate d’instructions exécutée par une petite
+machine à pile, sans récursion, et garde en cache les programmes déjà compilés."""
+from collections import OrderedDict
+from dataclasses import dataclass, fields
+from functools import lru_cache
+from hashlib import sha256
+
+from backends import is_math_parsable, math_expression
+
+from AST import ASTNode, ASTNodeIfElse, ASTNodeLiteral, ASTNodeMathExpression, ASTNodeOperation,\
+	ASTNodePrint, ASTNodeSequence, ASTNodeText, ASTNodeValue, ASTNodeVariable, ASTNodeVariableAssignment,\
+	ASTNodeVariableReturn, ASTNodeWhile, BUDGET_SLOT, FLOAT_TYPE, Frame, INT_TYPE, OPERATORS, Resolver, Template,\
+	UNDEFINED, Value, check_type, coerce, declared_types, normalize, static_type
+from Interpreter.Limits import Budget, ExecutionLimits, is_large
+from Interpreter.Trampoline import Recursion, trampoline
+
+MAX_PROGRAMS: int = 32
+"""Nombre de programmes compilés gardés par 'BytecodeCache' - les moins récemment demandés sont oubliés."""
+
+# Instructions : (opcode, argument)
+PUSH_CONST: int = 0  # valeur
+LOAD_SLOT: int = 1  # (slot, nom)
+STORE_SLOT: int = 2  # slot
+BINARY_OP: int = 3  # opérateur
+JUMP: int = 4  # cible
+JUMP_IF_FALSE: int = 5  # cible - dépile la condition
+JUMP_IF_NOT_NONE: int = 6  # cible - garde la valeur sur la pile
+POP: int = 7
+PRINT: int = 8
+RETURN: int = 9
+CHECK_NUMBERS: int = 10  # (slots, cible) - saute à la cible si une des variables n’est pas un nombre
+NORMALIZE: int = 11
+RENDER: int = 12  # (morceaux, trous) - texte d’un slot évalué à l’exécution
+STEP: int = 13  # nombre d’instructions à décompter du budget de l’exécution
+COERCE: int = 14  # (nom, type déclaré) - convertit la valeur au type de sa variable
+RENDER_TEXT: int = 15  # (morceaux, trous) - texte d’un slot, jamais évalué comme un calcul
+CALCULATE: int = 16  # (calcul, slots, normalisé, texte de secours, slot) - voir 'Lowering.calculation'
+STORE_CONST: int = 17  # (slot, valeur)
+LOOP: int = 18  # (cible, nombre d’instructions) - STEP puis JUMP, à la fin de chaque tour de boucle
+
+# Éléments d’un calcul (argument de CALCULATE), en notation polonaise inverse : (genre, valeur)
+OPERAND_SLOT: int = 0  # slot de la variable
+OPERAND_CONST: int = 1  # constante
+OPERATOR: int = 2  # opérateur
+
+Instruction = tuple[int, object]
+
+@dataclass(slots=True)
+class Bytecode:
+	"""Programme compilé en instructions - il peut être sérialisé tel quel."""
+	code: list[Instruction]
+	names: list[str]
+	"""Nom de la variable de chaque slot."""
+	
+	def new_frame(self) -> Frame:
+		return [None] + [UNDEFINED] * len(self.names)
+	
+	def run(self, frame: Frame | None = None, output=print, limits: ExecutionLimits | None = None) -> Value:
+		"""Exécute les instructions et renvoie la valeur de retour du programme.
+		Lève 'LimitExceeded' si l’exécution dépasse ses limites."""
+		code = self.code
+		if frame is None: frame = self.new_frame()
+		budget = frame[BUDGET_SLOT] = Budget(limits)
+		stack: list[Value] = []
+		push, pop = stack.append, stack.pop
+		pc = 0
+		
+		while True:
+			opcode, argument = code[pc]
+			pc += 1
+			
+			# Les instructions les plus fréquentes sont testées en premier.
+			if opcode == CALCULATE:
+				program, slots, normalizing, fallback, target = argument
+				for slot in slots:
+					value_type = type(frame[slot])
+					if value_type is not int and value_type is not float:
+						value = render(fallback, frame)
+						break
+				else:
+					if len(program) == 3:  # Le calcul le plus fréquent : une opération entre deux opérandes.
+						(left_kind, left), (right_kind, right), (_, operator) = program
+						if left_kind == OPERAND_SLOT:
+							left = frame[left]
+							if left is UNDEFINED: raise KeyError(self.names[program[0][1] - 1])
+						if right_kind == OPERAND_SLOT:
+							right = frame[right]
+							if right is UNDEFINED: raise KeyError(self.names[program[1][1] - 1])
+						value = OPERATORS[operator](left, right)
+					else:
+						calculation = []
+						for kind, item in program:
+							if kind == OPERAND_SLOT:
+								value = frame[item]
+								if value is UNDEFINED: raise KeyError(self.names[item - 1])
+								calculation.append(value)
+							elif kind == OPERAND_CONST:
+								calculation.append(item)
+							else:
+								right = calculation.pop()
+								calculation[-1] = OPERATORS[item](calculation[-1], right)
+						value = calculation[0]
+					if normalizing: value = normalize(value)
+				if target is None:
+					push(value)
+				else:
+					frame[target] = value
+					if is_large(value): budget.check(frame)
+			elif opcode == JUMP_IF_FALSE:
+				if not pop(): pc = argument
+			elif opcode == STEP:
+				budget.countdown -= argument
+				if budget.countdown <= 0: budget.check(frame)
+			elif opcode == LOOP:
+				budget.countdown -= argument[1]
+				if budget.countdown <= 0: budget.check(frame)
+				pc = argument[0]
+			elif opcode == STORE_SLOT:
+				frame[argument] = value = pop()
+				if is_large(value): budget.check(frame)
+			elif opcode == STORE_CONST:
+				frame[argument[0]] = argument[1]
+			elif opcode == JUMP:
+				pc = argument
+			elif opcode == PUSH_CONST:
+				push(argument)
+			elif opcode == LOAD_SLOT:
+				value = frame[argument[0]]
+				if value is UNDEFINED: raise KeyError(argument[1])
+				push(value)
+			elif opcode == RENDER:
+				push(render(argument, frame))
+			elif opcode == RENDER_TEXT:
+				push(render_text(argument, frame))
+			elif opcode == PRINT:
+				output(pop())
+			elif opcode == BINARY_OP:
+				right = pop()
+				stack[-1] = OPERATORS[argument](stack[-1], right)
+			elif opcode == CHECK_NUMBERS:
+				for slot in argument[0]:
+					value_type = type(frame[slot])
+					if value_type is not int and value_type is not float:
+						pc = argument[1]
+						break
+			elif opcode == NORMALIZE:
+				stack[-1] = normalize(stack[-1])
+			elif opcode == JUMP_IF_NOT_NONE:
+				if stack[-1] is not None: pc = argument
+			elif opcode == POP:
+				pop()
+			elif opcode == COERCE:
+				stack[-1] = coerce(argument[0], stack[-1], argument[1])
+			elif opcode == RETURN:
+				return pop()
+			else:
+				raise ValueError(f"unknown opcode {opcode}")
+	
+	def variables(self, frame: Frame) -> dict[str, Value]:
+		"""Renvoie les variables assignées d’une frame selon leur nom."""
+		return {name: value for name, value in zip(self.names, frame[1:]) if value is not UNDEFINED}
+
+
+def render_text(template: tuple[tuple[str, ...], tuple[tuple[int, int, str], ...]], frame: Frame) -> str:
+	"""Remplit le texte d’un slot avec les variables de la frame (comme 'ASTNodeText')."""
+	parts, holes = template
+	filled = list(parts)
+	for index, slot, name in holes:
+		value = frame[slot]
+		if value is UNDEFINED: raise KeyError(name)
+		filled[index] = str(value)
+	return "".join(filled)
+
+
+def render(template: tuple[tuple[str, ...], tuple[tuple[int, int, str], ...]], frame: Frame) -> Value:
+	"""Remplit le texte d’un slot avec les variables de la frame puis l’évalue comme 'ASTNodeValue'."""
+	expression = render_text(template, frame)
+	if is_math_parsable(expression):
+		return math_expression(expression)
+	return expression
+
+
+class Lowering:
+	"""Transforme un AST en instructions. Chaque séquence, condition et boucle laisse
+	exactement une valeur sur la pile : sa valeur de retour ou None.
+	Le parcours passe par 'trampoline' : la profondeur des programmes n’est pas limitée."""
+	
+	def __init__(self):
+		self.code: list[Instruction] = []
+		self.resolver = Resolver()
+	
+	def emit(self, opcode: int, argument: object = None) -> int:
+		"""Ajoute une instruction et renvoie son index (pour la corriger plus tard)."""
+		self.code.append((opcode, argument))
+		return len(self.code) - 1
+	
+	def patch(self, index: int, argument: object):
+		"""Remplace l’argument d’une instruction déjà émise (cible d’un saut)."""
+		self.code[index] = (self.code[index][0], argument)
+	
+	@property
+	def here(self) -> int: return len(self.code)
+	
+	def program(self, node: ASTNode) -> Bytecode:
+		self.resolver.types = declared_types(node)
+		trampoline(self.value(node))
+		self.emit(RETURN)
+		return Bytecode(self.code, self.resolver.names)
+	
+	def step(self, sequence: ASTNodeSequence):
+		"""Décompte en une fois les éléments exécutés d’une séquence (jusqu’à son retour)."""
+		steps = 0
+		for element in sequence.elements:
+			steps += 1
+			if type(element) is ASTNodeVariableReturn: break
+		if steps: self.emit(STEP, steps)
+	
+	def template(self, template: Template) -> tuple[tuple[str, ...], tuple[tuple[int, int, str], ...]]:
+		"""Renvoie l’argument de RENDER et RENDER_TEXT : les morceaux du texte, et l’index, le slot
+		et le nom de la variable de chaque trou."""
+		holes = tuple((index, self.resolver.slot(name), name) for index, name in template.holes)
+		return tuple(template.parts), holes
+	
+	def calculation(self, operation: ASTNodeOperation) -> tuple[tuple[int, Value], ...] | None:
+		"""Renvoie le calcul à évaluer en une seule instruction (CALCULATE), si ses opérandes
+		ne sont que des variables et des constantes (sinon None : il est émis instruction par instruction)."""
+		program = []
+		for item in operation.rpn:
+			match item:
+				case str():
+					program.append((OPERATOR, item))
+				case ASTNodeVariable(name=name):
+					program.append((OPERAND_SLOT, self.resolver.slot(name)))
+				case ASTNodeLiteral(value=value):
+					program.append((OPERAND_CONST, value))
+				case _:
+					return None
+		return tuple(program)
+	
+	def statement(self, node: ASTNode) -> Recursion:
+		"""Émet un nœud dont la valeur n’est pas utilisée."""
+		match node:
+			case ASTNodeVariableAssignment(name=name, value=value, type=declared):
+				found = check_type(node, self.resolver.types) if declared is not None else None
+				start = self.here
+				yield self.value(value)
+				slot = self.resolver.slot(name)
+				if declared is not None and found != declared:
+					self.emit(COERCE, (name, declared))
+					self.emit(STORE_SLOT, slot)
+				elif self.here == start + 1 and self.code[start][0] in (CALCULATE, PUSH_CONST):
+					# Valeur émise en une seule instruction : elle est rangée par cette même instruction.
+					opcode, argument = self.code.pop()
+					if opcode == CALCULATE:
+						self.emit(CALCULATE, argument[:-1] + (slot,))
+					else:
+						self.emit(STORE_CONST, (slot, argument))
+				else:
+					self.emit(STORE_SLOT, slot)
+			case ASTNodePrint(value=value):
+				yield self.value(value)
+				self.emit(PRINT)
+			
+			case ASTNodeSequence(elements=elements):
+				self.step(node)
+				for element in elements:
+					if type(element) is ASTNodeVariableReturn:
+						yield self.value(element.value)  # Évaluée pour ses erreurs, mais ignorée par la séquence parente.
+						self.emit(POP)
+						break
+					yield self.statement(element)
+			
+			case ASTNodeIfElse(if_condition=if_condition, if_sequence=if_sequence,
+			                   elifs=elifs, else_sequence=else_sequence):
+				jumps_end = []
+				branches = [(if_condition, if_sequence)] + elifs
+				for index, (condition, sequence) in enumerate(branches):
+					yield self.value(condition)
+					jump_next = self.emit(JUMP_IF_FALSE)
+					yield self.statement(sequence)
+					if else_sequence is not None or index < len(branches) - 1:  # Sinon, la fin suit déjà.
+						jumps_end.append(self.emit(JUMP))
+					self.patch(jump_next, self.here)
+				if else_sequence is not None:
+					yield self.statement(else_sequence)
+				for jump_end in jumps_end:
+					self.patch(jump_end, self.here)
+			
+			case ASTNodeWhile(condition=condition, sequence=sequence, is_do=is_do)\
+					if not any(type(element) is ASTNodeVariableReturn for element in sequence.elements):
+				# Sans retour, la séquence vaut toujours None : la boucle ne s’arrête que par sa condition.
+				if is_do: yield self.statement(sequence)
+				loop = self.here
+				yield self.value(condition)
+				jump_exit = self.emit(JUMP_IF_FALSE)
+				yield self.statement(sequence)
+				self.emit(LOOP, (loop, 1))
+				self.patch(jump_exit, self.here)
+			
+			case _:
+				yield self.value(node)
+				self.emit(POP)
+	
+	def value(self, node: ASTNode) -> Recursion:
+		"""Émet un nœud qui laisse sa valeur sur la pile."""
+		match node:
+			case ASTNodeLiteral(value=value):
+				self.emit(PUSH_CONST, value)
+			
+			case ASTNodeVariable(name=name):
+				self.emit(LOAD_SLOT, (self.resolver.slot(name), name))
+			
+			case ASTNodeOperation(rpn=rpn) if (program := self.calculation(node)) is not None:
+				self.emit(CALCULATE, (program, (), False, None, None))
+			
+			case ASTNodeOperation(rpn=rpn):
+				for item in rpn:
+					if type(item) is str:
+						self.emit(BINARY_OP, item)
+					else:
+						yield self.value(item)
+			
+			case ASTNodeMathExpression(operation=operation, names=names, text=text)\
+					if (program := self.calculation(operation)) is not None:
+				if all(self.resolver.types.get(name) in (INT_TYPE, FLOAT_TYPE) for name in names):
+					# Les variables sont toujours des nombres : ni vérification, ni texte de secours.
+					normalizing = static_type(operation, self.resolver.types) != INT_TYPE
+					self.emit(CALCULATE, (program, (), normalizing, None, None))
+				else:
+					slots = tuple(self.resolver.slot(name) for name in names)
+					self.emit(CALCULATE, (program, slots, True, self.template(Template(text)), None))
+			
+			case ASTNodeMathExpression(operation=operation, names=names)\
+					if all(self.resolver.types.get(name) in (INT_TYPE, FLOAT_TYPE) for name in names):
+				yield self.value(operation)
+				if static_type(operation, self.resolver.types) != INT_TYPE:
+					self.emit(NORMALIZE)
+			
+			case ASTNodeMathExpression(operation=operation, names=names, text=text):
+				check = self.emit(CHECK_NUMBERS)
+				yield self.value(operation)
+				self.emit(NORMALIZE)
+				jump_end = self.emit(JUMP)
+				self.patch(check, (tuple(self.resolver.slot(name) for name in names), self.here))
+				yield self.value(ASTNodeValue(text))
+				self.patch(jump_end, self.here)
+			
+			case ASTNodeText(template=template) | ASTNodeValue(template=Template(may_be_math=False) as template):
+				self.emit(RENDER_TEXT, self.template(template))
+			
+			case ASTNodeValue(value=value, template=template):
+				if template is None:
+					self.emit(PUSH_CONST, value)
+				else:
+					self.emit(RENDER, self.template(template))
+			
+			case ASTNodeSequence(elements=elements):
+				self.step(node)
+				for element in elements:
+					if type(element) is ASTNodeVariableReturn:
+						yield self.value(element.value)
+						break
+					yield self.statement(element)
+				else:
+					self.emit(PUSH_CONST, None)
+			
+			case ASTNodeIfElse(if_condition=if_condition, if_sequence=if_sequence,
+			                   elifs=elifs, else_sequence=else_sequence):
+				jumps_end = []
+				for condition, sequence in [(if_condition, if_sequence)] + elifs:
+					yield self.value(condition)
+					jump_next = self.emit(JUMP_IF_FALSE)
+					yield self.value(sequence)
+					jumps_end.append(self.emit(JUMP))
+					self.patch(jump_next, self.here)
+				if else_sequence is not None:
+					yield self.value(else_sequence)
+				else:
+					self.emit(PUSH_CONST, None)
+				for jump_end in jumps_end:
+					self.patch(jump_end, self.here)
+			
+			case ASTNodeWhile(condition=condition, sequence=sequence, is_do=is_do):
+				jumps_return = []
+				if is_do:
+					yield self.value(sequence)
+					jumps_return.append(self.emit(JUMP_IF_NOT_NONE))
+					self.emit(POP)
+				loop = self.here
+				yield self.value(condition)
+				jump_exit = self.emit(JUMP_IF_FALSE)
+				yield self.value(sequence)
+				jumps_return.append(self.emit(JUMP_IF_NOT_NONE))
+				self.emit(POP)
+				self.emit(LOOP, (loop, 1))
+				self.patch(jump_exit, self.here)
+				self.emit(PUSH_CONST, None)
+				for jump_return in jumps_return:
+					self.patch(jump_return, self.here)
+			
+			case _:
+				raise TypeError(f"'{node.__class__.__name__}' cannot be lowered to bytecode")
+
+
+def compile_bytecode(node: ASTNode) -> Bytecode:
+	"""Compile un AST en instructions."""
+	return Lowering().program(node)
+
+
+def content_key(node: ASTNode) -> Recursion:
+	"""Renvoie l’empreinte du contenu d’un nœud : celle de sa classe, de ses champs et des empreintes de ses
+	enfants. Elle est gardée sur le nœud : les sous-arbres inchangés, que l’éditeur réutilise d’une version
+	du programme à l’autre, ne sont pas relus."""
+	if node.content_key is not None: return node.content_key
+	digest = sha256(node.__class__.__name__.encode())
+	pending = [getattr(node, name) for name in compared_fields(node.__class__)]
+	while pending:
+		value = pending.pop()
+		if isinstance(value, ASTNode):
+			key = value.content_key
+			if key is None: key = yield content_key(value)
+			digest.update(b"N" + key)
+		elif type(value) in (list, tuple):
+			digest.update(b"[%d" % len(value))  # La longueur sépare les éléments de la liste de ceux qui suivent.
+			pending.extend(reversed(value))
+		else:
+			digest.update(b"V" + repr(value).encode() + b"\0")
+	node.content_key = digest.digest()
+	return node.content_key
+
+
+@lru_cache
+def compared_fields(node_class: type) -> tuple[str, ...]:
+	"""Renvoie le nom des champs qui font le contenu d’un nœud, du dernier au premier."""
+	return tuple(field.name for field in reversed(fields(node_class)) if field.compare)
+
+
+class BytecodeCache:
+	"""Programmes compilés selon l’empreinte de leur contenu : relancer un programme inchangé (ou revenu
+	à une version déjà compilée) ne le recompile pas. Seuls les nœuds nouveaux sont relus pour l’empreinte.
+	Le cache reste en mémoire : sur le disque, relire les instructions et calculer l’empreinte d’un
+	programme rechargé prennent plus de temps que de le compiler."""
+	
+	def __init__(self, max_programs: int = MAX_PROGRAMS):
+		self._programs: OrderedDict[bytes, Bytecode] = OrderedDict()
+		self.max_programs = max_programs
+		
+		self.hits: int = 0
+		self.misses: int = 0
+	
+	def get(self, node: ASTNode) -> Bytecode:
+		"""Renvoie le programme compilé, compilé seulement à la première demande de son contenu."""
+		key = trampoline(content_key(node))
+		bytecode = self._programs.get(key)
+		if bytecode is not None:
+			self._programs.move_to_end(key)
+			self.hits += 1
+			return bytecode
+		
+		self.misses += 1
+		bytecode = self._programs[key] = compile_bytecode(node)
+		if len(self._programs) > self.max_programs:
+			self._programs.popitem(last=False)
+		return bytecode
@@ -0,0 +1,103 @@
+"""Ce programme python compile les programmes dans un fil d’exécution en arrière-plan : une rafale
+de modifications ne donne qu’une compilation, et l’éditeur n’attend jamais sa fin."""
+from dataclasses import dataclass
+from threading import Condition, Thread
+from time import perf_counter
+
+from AST import ASTNodeSequence, compile_program
+from Interpreter.Bytecode import Bytecode, BytecodeCache
+from Interpreter.Optimizer import optimize
+
+
+@dataclass(slots=True, frozen=True)
+class CompiledProgram:
+	"""Programme prêt à être exécuté - publié d’un seul bloc, jamais modifié ensuite."""
+	version: int
+	"""Numéro de la modification compilée."""
+	AST: ASTNodeSequence
+	"""Programme exécuté - simplifié par 'optimize' si le fil de compilation optimise."""
+	bytecode: Bytecode | None = None
+	"""Instructions du programme (en mode "bytecode")."""
+
+
+class CompileWorker:
+	"""Fil de compilation des programmes. Chaque modification remplace la précédente en attente,
+	et n’est compilée qu’une fois les modifications arrêtées pendant 'delay' secondes."""
+	
+	def __init__(self, mode: str, delay: float, optimizing: bool = True):
+		self.mode = mode
+		self.delay = delay
+		self.optimizing = optimizing
+		self.cache = BytecodeCache()
+		"""Programmes déjà compilés (en mode "bytecode") - seul le fil de compilation s’en sert."""
+		
+		self._condition = Condition()
+		self._pending: ASTNodeSequence | None = None
+		self._changed_at: float = 0
+		self._version: int = 0
+		self._closed: bool = False
+		
+		self.latest: CompiledProgram | None = None
+		"""Dernier programme compilé, remplacé d’une seule assignation : le lire ne bloque jamais."""
+		self._thread = Thread(target=self._work, name="benday-compiler", daemon=True)
+		self._thread.start()
+	
+	def submit(self, node: ASTNodeSequence) -> int:
+		"""Signale une modification du programme, et renvoie son numéro."""
+		with self._condition:
+			self._version += 1
+			self._pending = node
+			self._changed_at = perf_counter()
+			self._condition.notify()
+			return self._version
+	
+	@property
+	def pending(self) -> bool:
+		"""Indique si le dernier programme reçu n’est pas encore compilé."""
+		latest = self.latest
+		return latest is None or latest.version != self._version
+	
+	def wait(self, timeout: float | None = None) -> CompiledProgram | None:
+		"""Attend la compilation du dernier programme reçu (hors de l’éditeur)."""
+		with self._condition:
+			self._condition.wait_for(lambda: not self.pending or self._closed, timeout)
+		return self.latest
+	
+	def compile(self, version: int, node: ASTNodeSequence) -> CompiledProgram:
+		"""Simplifie puis compile le programme selon le mode d’exécution."""
+		if self.optimizing: node = optimize(node)
+		match self.mode:
+			case "bytecode":
+				return CompiledProgram(version, node, self.cache.get(node))
+			case _:  # Les autres modes compilent l’AST là où ils l’exécutent : il n’est compilé ici
+				compile_program(node)  # que pour signaler ses erreurs de type dès la modification.
+				return CompiledProgram(version, node)
+	
+	def _work(self):
+		"""Boucle du fil : attend une modification, la fin de la rafale, puis compile."""
+		while True:
+			with self._condition:
+				while self._pending is None and not self._closed:
+					self._condition.wait()
+				while not self._closed and (remaining := self._changed_at + self.delay - perf_counter()) > 0:
+					self._condition.wait(remaining)
+				if self._closed: return
+				version, node = self._version, self._pending
+				self._pending = None
+			
+			try:
+				compiled = self.compile(version, node)
+			except Exception as error:
+				print(f"COMPILATION ERROR : {error.__class__.__name__}: {error}")
+				compiled = CompiledProgram(version, node)
+			
+			with self._condition:
+				self.latest = compiled
+				self._condition.notify_all()
+	
+	def close(self):
+		"""Arrête le fil, à la fermeture de l’application."""
+		with self._condition:
+			self._closed = True
+			self._condition.notify_all()
+		self._thread.join(1)
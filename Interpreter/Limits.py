@@ -0,0 +1,90 @@
+"""Ce programme python contient les limites d’une exécution (nombre d’instructions, durée et mémoire
+des variables) et leur décompte, vérifié à intervalle régulier pour rester peu coûteux
+(et aussitôt qu’une grande valeur est assignée)."""
+from dataclasses import dataclass
+from sys import getsizeof
+from time import perf_counter
+from typing import Iterable
+
+LARGE_VALUE_SIZE: int = 2 ** 20
+"""Taille (en caractères d’un texte, en octets d’un entier) à partir de laquelle une valeur assignée fait
+vérifier les limites aussitôt ('is_large') : un texte ou un entier qui double de taille à chaque instruction
+dépasserait sinon la limite de mémoire bien avant la vérification suivante."""
+LARGE_INT: int = 1 << 8 * LARGE_VALUE_SIZE
+
+
+@dataclass(slots=True)
+class ExecutionLimits:
+	"""Limites d’une exécution - None désactive une limite."""
+	max_steps: int | None = 100_000_000
+	"""Nombre d’instructions exécutées (chaque élément d’une séquence et chaque tour de boucle)."""
+	max_time: float | None = 10
+	"""Durée d’exécution (en secondes)."""
+	max_memory: int | None = 100 * 2 ** 20
+	"""Taille des valeurs des variables (en octets)."""
+	check_interval: int = 1000
+	"""Nombre d’instructions entre deux vérifications des limites : elles peuvent être dépassées d’autant.
+	Une assignation d’une grande valeur ('is_large') les vérifie aussitôt."""
+
+
+class LimitExceeded(Exception):
+	"""Arrêt d’une exécution qui a dépassé une de ses limites."""
+	
+	def __init__(self, limit: str, value: float, maximum: float):
+		super().__init__(limit, value, maximum)
+		self.limit = limit
+		"""Nom de la limite dépassée : "steps", "time" ou "memory"."""
+		self.value = value
+		self.maximum = maximum
+	
+	def __str__(self) -> str:
+		value, maximum = (f"{number:.2f}" if type(number) is float else str(number)
+		                  for number in (self.value, self.maximum))
+		return f"{self.limit} limit exceeded ({value} > {maximum})"
+
+
+class Budget:
+	"""Décompte d’une exécution : les instructions décrémentent 'countdown',
+	et les limites ne sont vérifiées (avec 'check') que lorsqu’il arrive à zéro."""
+	__slots__ = ("limits", "countdown", "steps", "start")
+	
+	def __init__(self, limits: ExecutionLimits | None = None):
+		self.reset(limits)
+	
+	def reset(self, limits: ExecutionLimits | None = None):
+		"""Recommence le décompte pour une nouvelle exécution."""
+		self.limits = ExecutionLimits() if limits is None else limits
+		self.countdown: int = self.limits.check_interval
+		self.steps: int = 0
+		"""Nombre d’instructions exécutées jusqu’à la dernière vérification."""
+		self.start: float = perf_counter()
+	
+	def charge(self, steps: int, values: Iterable):
+		"""Décompte des instructions, et vérifie les limites si besoin."""
+		self.countdown -= steps
+		if self.countdown <= 0: self.check(values)
+	
+	def check(self, values: Iterable):
+		"""Vérifie les limites selon les valeurs des variables, puis relance le décompte."""
+		limits = self.limits
+		self.steps += limits.check_interval - self.countdown
+		self.countdown = limits.check_interval
+		
+		if limits.max_steps is not None and self.steps > limits.max_steps:
+			raise LimitExceeded("steps", self.steps, limits.max_steps)
+		
+		elapsed = perf_counter() - self.start
+		if limits.max_time is not None and elapsed > limits.max_time:
+			raise LimitExceeded("time", elapsed, limits.max_time)
+		
+		if limits.max_memory is not None:
+			memory = sum(getsizeof(value) for value in values)
+			if memory > limits.max_memory:
+				raise LimitExceeded("memory", memory, limits.max_memory)
+
+
+def is_large(value) -> bool:
+	"""Indique si une valeur assignée est assez grande pour vérifier les limites aussitôt
+	(comparer un nombre à 'LARGE_INT' suffit : un flottant est toujours plus petit)."""
+	if type(value) is str: return len(value) > LARGE_VALUE_SIZE
+	return type(value) is int and abs(value) >= LARGE_INT
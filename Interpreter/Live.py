@@ -0,0 +1,65 @@
+"""Ce programme python réexécute le programme à chaque modification, en reprenant à la première
+instruction de la séquence mère qui a changé, depuis l’état des variables gardé juste avant elle."""
+from dataclasses import dataclass
+
+from AST import ASTNode, ASTNodeSequence, ASTNodeVariableReturn, Event, PRINT_EVENT, Steps, Value
+from Interpreter.Limits import ExecutionLimits
+from Interpreter.Stepper import Stepper
+
+
+@dataclass(slots=True)
+class Checkpoint:
+	"""État de l’exécution après une instruction de la séquence mère."""
+	variables: dict[str, Value]
+	prints: list[Event]
+	"""Affichages de l’instruction, rejoués à chaque réexécution qui reprend après elle."""
+
+
+class LiveRunner:
+	"""Exécutions successives d’un programme modifié. Les nœuds des blocs non modifiés sont gardés
+	tels quels ('ParentBloc.get_ASTNode') : une instruction inchangée est le même objet d’une version
+	à l’autre, et seule la suite de la première instruction différente est réexécutée."""
+	
+	def __init__(self, limits: ExecutionLimits | None = None):
+		self.limits = limits
+		self.elements: list[ASTNode] = []
+		"""Instructions de la séquence mère exécutées jusqu’au bout lors des exécutions précédentes."""
+		self.checkpoints: list[Checkpoint] = []
+		"""État après chacune de ces instructions."""
+		self._node: ASTNodeSequence | None = None
+	
+	def first_change(self, elements: list[ASTNode]) -> int:
+		"""Renvoie l’index de la première instruction qui n’a pas déjà été exécutée."""
+		for index, (element, executed) in enumerate(zip(elements, self.elements)):
+			if element is not executed: return index
+		return min(len(elements), len(self.elements))
+	
+	def rerun(self, node: ASTNodeSequence) -> Stepper:
+		"""Renvoie l’exécution pas à pas de la nouvelle version du programme (la séquence mère),
+		qui reprend à sa première instruction modifiée."""
+		first = self.first_change(node.elements)
+		del self.elements[first:]
+		del self.checkpoints[first:]
+		self._node = node
+		return Stepper(self, self.limits)
+	
+	def steps(self, variables: dict[str, Value]) -> Steps:
+		"""Rejoue les affichages des instructions inchangées, puis exécute la suite pas à pas
+		en gardant l’état après chaque instruction."""
+		if self.checkpoints:
+			variables.update(self.checkpoints[-1].variables)
+		for checkpoint in self.checkpoints:
+			yield from checkpoint.prints
+		
+		for element in self._node.elements[len(self.elements):]:
+			if type(element) is ASTNodeVariableReturn:
+				element: ASTNodeVariableReturn
+				return (yield from element.value.steps(variables))
+			
+			prints: list[Event] = []
+			for event in element.steps(variables):
+				if event is not None and event[0] == PRINT_EVENT:
+					prints.append(event)
+				yield event
+			self.elements.append(element)
+			self.checkpoints.append(Checkpoint(variables.copy(), prints))
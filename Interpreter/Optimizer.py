@@ -0,0 +1,208 @@
+"""Ce programme python simplifie l’AST avant son exécution : il calcule les opérations constantes,
+retire les branches et les boucles qui ne s’exécutent jamais, les assignations jamais lues et ce qui
+suit un retour. Les nœuds ne sont jamais modifiés : un sous-arbre inchangé est gardé tel quel."""
+from AST import ASTNode, ASTNodeIfElse, ASTNodeLiteral, ASTNodeMathExpression, ASTNodeOperation,\
+	ASTNodePrint, ASTNodeSequence, ASTNodeText, ASTNodeValue, ASTNodeVariable, ASTNodeVariableAssignment,\
+	ASTNodeVariableReturn, ASTNodeWhile, OPERATORS, TypeMismatch, coerce
+from Interpreter.Trampoline import Recursion, trampoline
+
+
+def optimize(node: ASTNodeSequence) -> ASTNodeSequence:
+	"""Renvoie le programme simplifié (le même objet s’il n’y a rien à simplifier).
+	Les parcours passent par 'trampoline' : la profondeur des programmes n’est pas limitée."""
+	node = trampoline(simplify(node))
+	if node is None: return ASTNodeSequence([])
+	cache = {}
+	return trampoline(remove_dead_stores(node, trampoline(read_names(node, cache)), cache))
+
+
+def simplify(node: ASTNode) -> Recursion:
+	"""Calcule les opérations constantes et retire les instructions qui ne s’exécutent jamais.
+	Renvoie None si l’instruction entière peut être retirée."""
+	match node:
+		case ASTNodeOperation(rpn=rpn):
+			operands: list[list[ASTNode | str]] = []
+			"""Calcul simplifié (en notation polonaise inverse) de chaque opérande en attente."""
+			for item in rpn:
+				if type(item) is not str:
+					operands.append([(yield simplify_value(item))])
+					continue
+				right = operands.pop()
+				left = operands[-1]
+				if len(left) == len(right) == 1 and type(left[0]) is ASTNodeLiteral and type(right[0]) is ASTNodeLiteral:
+					try:
+						operands[-1] = [ASTNodeLiteral(OPERATORS[item](left[0].value, right[0].value))]
+						continue
+					except (ArithmeticError, TypeError):
+						pass  # L’erreur sera levée à l’exécution, comme sans optimisation.
+				left += right
+				left.append(item)
+			new_rpn = operands[0]
+			if len(new_rpn) == len(rpn) and all(new is old for new, old in zip(new_rpn, rpn)): return node
+			return ASTNodeOperation(new_rpn)
+		
+		case ASTNodeMathExpression(operation=operation, names=names, text=text):
+			new_operation = yield simplify(operation)
+			if new_operation is operation: return node
+			return ASTNodeMathExpression(new_operation, names, text)
+		
+		case ASTNodeSequence(elements=elements):
+			new_elements = []
+			for element in elements:
+				new_element = yield simplify(element)
+				if new_element is not None:
+					new_elements.append(new_element)
+				if type(element) is ASTNodeVariableReturn: break  # La suite n’est jamais exécutée.
+			if len(new_elements) == len(elements) and all(new is old for new, old in zip(new_elements, elements)):
+				return node
+			return ASTNodeSequence(new_elements)
+		
+		case ASTNodeIfElse(if_condition=if_condition, if_sequence=if_sequence,
+		                   elifs=elifs, else_sequence=else_sequence):
+			branches: list[tuple[ASTNode, ASTNodeSequence]] = []
+			new_else = (yield simplify(else_sequence)) if else_sequence is not None else None
+			for condition, sequence in [(if_condition, if_sequence)] + elifs:
+				new_condition, new_sequence = (yield simplify_value(condition)), (yield simplify(sequence))
+				if type(new_condition) is ASTNodeLiteral:
+					if not new_condition.value: continue  # Branche jamais prise.
+					new_else = new_sequence  # Branche toujours prise : les suivantes ne le sont jamais.
+					break
+				branches.append((new_condition, new_sequence))
+			
+			if not branches: return new_else  # Une séquence seule ne renvoie rien à sa séquence parente.
+			(new_if_condition, new_if_sequence), *new_elifs = branches
+			if new_if_condition is if_condition and new_if_sequence is if_sequence and new_else is else_sequence\
+			  and len(new_elifs) == len(elifs)\
+			  and all(a is c and b is d for (a, b), (c, d) in zip(new_elifs, elifs)):
+				return node
+			return ASTNodeIfElse(new_if_condition, new_if_sequence, new_elifs, new_else)
+		
+		case ASTNodeWhile(condition=condition, sequence=sequence, is_do=is_do):
+			new_condition, new_sequence = (yield simplify_value(condition)), (yield simplify(sequence))
+			if type(new_condition) is ASTNodeLiteral and not new_condition.value:
+				return new_sequence if is_do else None
+			if new_condition is condition and new_sequence is sequence: return node
+			return ASTNodeWhile(new_condition, new_sequence, is_do)
+		
+		case ASTNodeVariableAssignment(name=name, value=value, type=declared):
+			new_value = yield simplify_value(value)
+			if new_value is value: return node
+			return ASTNodeVariableAssignment(name, new_value, declared)
+		
+		case ASTNodePrint(value=value):
+			new_value = yield simplify_value(value)
+			return node if new_value is value else ASTNodePrint(new_value)
+		
+		case ASTNodeVariableReturn(value=value):
+			new_value = yield simplify_value(value)
+			return node if new_value is value else ASTNodeVariableReturn(new_value)
+	
+	return node
+
+
+def simplify_value(node: ASTNode) -> Recursion:
+	"""Simplifie le contenu d’un slot : sa valeur est utilisée, une instruction retirée y vaut donc None
+	(seule une séquence peut retirer ses instructions)."""
+	new_node = yield simplify(node)
+	return ASTNodeLiteral(None) if new_node is None else new_node
+
+
+def read_names(node: ASTNode, cache: dict[int, set[str]]) -> Recursion:
+	"""Renvoie le nom des variables lues par le nœud. Il est gardé dans 'cache' (selon l’identité du nœud) :
+	chaque séquence lit ceux de ses éléments sans reparcourir leurs sous-arbres."""
+	names = cache.get(id(node))
+	if names is None:
+		names = cache[id(node)] = yield names_read_by(node, cache)
+	return names
+
+
+def names_read_by(node: ASTNode, cache: dict[int, set[str]]) -> Recursion:
+	match node:
+		case ASTNodeVariable(name=name):
+			return {name}
+		case ASTNodeMathExpression(names=names):
+			return set(names)
+		case ASTNodeValue(template=template) if template is not None:
+			return {name for _, name in template.holes}
+		case ASTNodeOperation(rpn=rpn):
+			names = set()
+			for item in rpn:
+				if type(item) is not str: names |= yield read_names(item, cache)
+			return names
+		case ASTNodeSequence(elements=elements):
+			names = set()
+			for element in elements:
+				names |= yield read_names(element, cache)
+			return names
+		case ASTNodeIfElse(if_condition=if_condition, if_sequence=if_sequence,
+		                   elifs=elifs, else_sequence=else_sequence):
+			names = (yield read_names(if_condition, cache)) | (yield read_names(if_sequence, cache))
+			for condition, sequence in elifs:
+				names |= (yield read_names(condition, cache)) | (yield read_names(sequence, cache))
+			if else_sequence is not None: names |= yield read_names(else_sequence, cache)
+			return names
+		case ASTNodeWhile(condition=condition, sequence=sequence):
+			return (yield read_names(condition, cache)) | (yield read_names(sequence, cache))
+		case ASTNodeVariableAssignment(value=value) | ASTNodePrint(value=value) | ASTNodeVariableReturn(value=value):
+			return (yield read_names(value, cache))
+	return set()
+
+
+def is_removable(assignment: ASTNodeVariableAssignment) -> bool:
+	"""Renvoie si l’assignation peut être retirée sans cacher d’erreur : sa valeur est constante
+	et du type déclaré de sa variable."""
+	value = assignment.value
+	if type(value) is not ASTNodeLiteral and not (type(value) is ASTNodeText and not value.template.holes):
+		return False
+	if assignment.type is None: return True
+	try:
+		coerce(assignment.name, value.value, assignment.type)
+	except TypeMismatch:
+		return False
+	return True
+
+
+def remove_dead_stores(node: ASTNode, read: set[str], cache: dict[int, set[str]]) -> Recursion:
+	"""Retire les assignations jamais lues : leur variable n’est lue nulle part dans le programme,
+	ou elle est réassignée plus loin dans la même séquence avant d’être lue."""
+	match node:
+		case ASTNodeSequence(elements=elements):
+			reads = []
+			for element in elements:
+				reads.append((yield read_names(element, cache)))
+			new_elements = []
+			for i, element in enumerate(elements):
+				if type(element) is ASTNodeVariableAssignment and is_removable(element)\
+				  and (element.name not in read or is_overwritten(element.name, elements[i + 1:], reads[i + 1:])):
+					continue
+				new_elements.append((yield remove_dead_stores(element, read, cache)))
+			if len(new_elements) == len(elements) and all(new is old for new, old in zip(new_elements, elements)):
+				return node
+			return ASTNodeSequence(new_elements)
+		
+		case ASTNodeIfElse(if_condition=if_condition, if_sequence=if_sequence,
+		                   elifs=elifs, else_sequence=else_sequence):
+			new_if_sequence = yield remove_dead_stores(if_sequence, read, cache)
+			new_elifs = []
+			for condition, sequence in elifs:
+				new_elifs.append((condition, (yield remove_dead_stores(sequence, read, cache))))
+			new_else = (yield remove_dead_stores(else_sequence, read, cache)) if else_sequence is not None else None
+			if new_if_sequence is if_sequence and new_else is else_sequence\
+			  and all(a is b for (_, a), (_, b) in zip(new_elifs, elifs)):
+				return node
+			return ASTNodeIfElse(if_condition, new_if_sequence, new_elifs, new_else)
+		
+		case ASTNodeWhile(condition=condition, sequence=sequence, is_do=is_do):
+			new_sequence = yield remove_dead_stores(sequence, read, cache)
+			return node if new_sequence is sequence else ASTNodeWhile(condition, new_sequence, is_do)
+	
+	return node
+
+
+def is_overwritten(name: str, following: list[ASTNode], reads: list[set[str]]) -> bool:
+	"""Renvoie si la variable est réassignée par une des instructions suivantes avant d’être lue."""
+	for element, element_reads in zip(following, reads):
+		if name in element_reads: return False
+		if type(element) is ASTNodeVariableAssignment and element.name == name: return True
+		if type(element) is ASTNodeVariableReturn: return False  # La séquence parente peut la lire ensuite.
+	return False
@@ -0,0 +1,100 @@
+"""Ce programme python mesure l’exécution d’un programme compilé : le nombre de passages
+et le temps cumulé (sous-nœuds compris) de chacun de ses nœuds."""
+import csv
+from dataclasses import dataclass
+from time import perf_counter
+
+from AST import ASTNode, ASTNodeLiteral, ASTNodeMathExpression, ASTNodeValue, ASTNodeVariable,\
+	ASTNodeVariableAssignment, Closure, Frame, Value
+
+Stats = list[tuple[int, float]]
+"""Passages et temps de chaque nœud, dans l’ordre de leur compilation."""
+
+
+@dataclass(slots=True)
+class NodeProfile:
+	node: ASTNode
+	hits: int = 0
+	time: float = 0
+	"""Temps cumulé (en secondes) passé dans le nœud et ses sous-nœuds."""
+
+
+class Profiler:
+	"""Mesure les fermetures d’un programme compilé avec 'compile_program(node, profiler)'.
+	Les nœuds sont compilés toujours dans le même ordre : les mesures d’un programme exécuté dans
+	un autre processus ('stats') peuvent être rattachées à une autre copie de son AST ('load')."""
+	
+	def __init__(self):
+		self.profiles: list[NodeProfile] = []
+		self._by_node: dict[int, NodeProfile] = {}
+	
+	def wrap(self, node: ASTNode, closure: Closure) -> Closure:
+		"""Renvoie la fermeture du nœud, mesurée à chaque appel."""
+		profile = NodeProfile(node)
+		self.profiles.append(profile)
+		self._by_node[id(node)] = profile
+		
+		def profiled_closure(frame: Frame) -> Value:
+			start = perf_counter()
+			try:
+				return closure(frame)
+			finally:
+				profile.hits += 1
+				profile.time += perf_counter() - start
+		
+		return profiled_closure
+	
+	def get(self, node: ASTNode) -> NodeProfile | None:
+		"""Renvoie les mesures d’un nœud, s’il fait partie du programme mesuré."""
+		return self._by_node.get(id(node))
+	
+	@property
+	def total_time(self) -> float:
+		"""Temps du programme entier - son nœud est mesuré en dernier, après tous ses sous-nœuds."""
+		return self.profiles[-1].time if self.profiles else 0
+	
+	def stats(self) -> Stats:
+		return [(profile.hits, profile.time) for profile in self.profiles]
+	
+	def load(self, stats: Stats):
+		"""Reprend les mesures d’une autre copie du même programme."""
+		for profile, (hits, time) in zip(self.profiles, stats):
+			profile.hits = hits
+			profile.time = time
+	
+	def rows(self) -> list[tuple[str, str, int, float, float]]:
+		"""Renvoie une ligne par nœud exécuté : nœud, détail, passages, temps (ms) et part du total (%)."""
+		total_time = self.total_time or 1
+		return [(profile.node.__class__.__name__.removeprefix("ASTNode"), describe(profile.node),
+		         profile.hits, profile.time * 1000, 100 * profile.time / total_time)
+		        for profile in self.profiles if profile.hits]
+	
+	def table(self) -> str:
+		"""Renvoie les mesures sous forme de tableau texte, des nœuds les plus coûteux aux moins coûteux."""
+		lines = [f"{'NODE':<20}{'DETAIL':<24}{'HITS':>10}{'TIME (ms)':>12}{'%':>8}"]
+		for node, detail, hits, time, share in sorted(self.rows(), key=lambda row: -row[3]):
+			lines.append(f"{node:<20}{detail[:23]:<24}{hits:>10}{time:>12.3f}{share:>8.1f}")
+		return "\n".join(lines)
+	
+	def export_csv(self, path: str):
+		"""Enregistre les mesures dans un fichier CSV, pour les analyser ailleurs."""
+		with open(path, "w", newline="") as file:
+			writer = csv.writer(file)
+			writer.writerow(["node", "detail", "hits", "time_ms", "share_percent"])
+			writer.writerows(self.rows())
+
+
+def describe(node: ASTNode) -> str:
+	"""Renvoie un court texte qui permet de reconnaître le nœud."""
+	match node:
+		case ASTNodeVariableAssignment(name=name):
+			return name
+		case ASTNodeVariable(name=name):
+			return f"{{{name}}}"
+		case ASTNodeLiteral(value=value):
+			return str(value)
+		case ASTNodeValue(value=value):
+			return str(value)
+		case ASTNodeMathExpression(text=text):
+			return text
+	return ""
@@ -0,0 +1,137 @@
+"""Ce programme python enregistre les programmes en JSON et les recharge, sans l’éditeur (ni pygame).
+Les slots sont gardés sous forme de texte, analysé à nouveau au chargement comme dans l’éditeur."""
+import json
+
+from AST import ASTNode, ASTNodeIfElse, ASTNodeLiteral, ASTNodeMathExpression, ASTNodeOperation, ASTNodePrint,\
+	ASTNodeSequence, ASTNodeText, ASTNodeValue, ASTNodeVariable, ASTNodeVariableAssignment, ASTNodeVariableReturn,\
+	ASTNodeWhile, BOOL_TYPE, FLOAT_TYPE, INT_TYPE, OPERATORS, STRING_TYPE, parse_slot
+
+SAVE_VERSION: int = 1
+"""Version du format - un fichier d’une autre version n’est pas chargé."""
+
+DECLARED_TYPES: tuple[str, ...] = (INT_TYPE, FLOAT_TYPE, BOOL_TYPE, STRING_TYPE)
+"""Types qu’une affectation enregistrée peut déclarer (ceux de 'Constantes.TYPES')."""
+
+
+class SaveError(ValueError):
+	"""Fichier qui n’est pas un programme enregistré (ou pas dans cette version du format)."""
+
+
+def as_dict(node: ASTNode) -> dict:
+	"""Convertit un nœud (et ses enfants) en dictionnaire sérialisable en JSON."""
+	match node:
+		case ASTNodeSequence(elements=elements):
+			return {"sequence": [as_dict(element) for element in elements]}
+		case ASTNodeIfElse(if_condition=condition, if_sequence=sequence, elifs=elifs, else_sequence=else_sequence):
+			return {"if": as_dict(condition), "then": as_dict(sequence),
+			        "elifs": [[as_dict(elif_condition), as_dict(elif_sequence)]
+			                  for elif_condition, elif_sequence in elifs],
+			        "else": None if else_sequence is None else as_dict(else_sequence)}
+		case ASTNodeWhile(condition=condition, sequence=sequence, is_do=is_do):
+			return {"while": as_dict(condition), "do": as_dict(sequence), "is_do": is_do}
+		case ASTNodeVariableAssignment(name=name, value=value, type=declared):
+			return {"assign": name, "value": as_dict(value), "type": declared}
+		case ASTNodePrint(value=value):
+			return {"print": as_dict(value)}
+		case ASTNodeVariableReturn(value=value):
+			return {"return": as_dict(value)}
+		case ASTNodeText(value=text):
+			return {"text": text}
+		case ASTNodeValue(value=text) if type(text) is str:
+			return {"slot": text}
+		case ASTNodeValue(value=value) | ASTNodeLiteral(value=value):
+			return {"literal": value}
+		case ASTNodeMathExpression(text=text):
+			return {"slot": text}
+		case ASTNodeVariable(name=name):
+			return {"variable": name}
+		case ASTNodeOperation(rpn=rpn):
+			return {"operation": [item if type(item) is str else as_dict(item) for item in rpn]}
+	raise TypeError(f"'{node.__class__.__name__}' cannot be saved")
+
+
+def from_dict(data: dict, path: str = "program") -> ASTNode:
+	"""Reconstruit le nœud enregistré par 'as_dict'. Lève 'SaveError', avec le chemin du nœud
+	dans le fichier (ex: "program.sequence[2].elifs[0]"), si un nœud n’a pas la forme attendue."""
+	match data:
+		case {"sequence": list(elements)}:
+			return ASTNodeSequence([from_dict(element, f"{path}.sequence[{i}]") for i, element in enumerate(elements)])
+		case {"if": condition, "then": sequence, "elifs": list(elifs), "else": else_sequence}:
+			for i, pair in enumerate(elifs):
+				if type(pair) is not list or len(pair) != 2:
+					raise SaveError(f"invalid node at {path}.elifs[{i}]: expected a [condition, sequence] pair")
+			return ASTNodeIfElse(from_dict(condition, f"{path}.if"), sequence_from_dict(sequence, f"{path}.then"),
+			                     [(from_dict(elif_condition, f"{path}.elifs[{i}][0]"),
+			                       sequence_from_dict(elif_sequence, f"{path}.elifs[{i}][1]"))
+			                      for i, (elif_condition, elif_sequence) in enumerate(elifs)],
+			                     None if else_sequence is None else sequence_from_dict(else_sequence, f"{path}.else"))
+		case {"while": condition, "do": sequence, "is_do": bool(is_do)}:
+			return ASTNodeWhile(from_dict(condition, f"{path}.while"), sequence_from_dict(sequence, f"{path}.do"), is_do)
+		case {"assign": str(name), "value": value, "type": declared}:
+			if declared is not None and declared not in DECLARED_TYPES:
+				raise SaveError(f"invalid node at {path}.type: unknown type {declared!r}")
+			return ASTNodeVariableAssignment(name, from_dict(value, f"{path}.value"), declared)
+		case {"print": value}:
+			return ASTNodePrint(from_dict(value, f"{path}.print"))
+		case {"return": value}:
+			return ASTNodeVariableReturn(from_dict(value, f"{path}.return"))
+		case {"text": str(text)}:
+			return ASTNodeText(text)
+		case {"slot": str(text)}:
+			return parse_slot(text)
+		case {"literal": None | bool() | int() | float() | str() as value}:
+			return ASTNodeLiteral(value)
+		case {"variable": str(name)}:
+			return ASTNodeVariable(name)
+		case {"operation": list(rpn)}:
+			check_rpn(rpn, f"{path}.operation")
+			return ASTNodeOperation([item if type(item) is str else from_dict(item, f"{path}.operation[{i}]")
+			                         for i, item in enumerate(rpn)])
+	raise SaveError(f"invalid node at {path}: {data!r:.100}")
+
+
+def sequence_from_dict(data: dict, path: str) -> ASTNodeSequence:
+	"""Reconstruit une séquence enregistrée (le contenu d’un bloc), en levant 'SaveError' si c’est un autre nœud."""
+	node = from_dict(data, path)
+	if type(node) is not ASTNodeSequence:
+		raise SaveError(f"invalid node at {path}: expected a sequence")
+	return node
+
+
+def check_rpn(rpn: list, path: str):
+	"""Vérifie qu’un calcul enregistré est en notation polonaise inverse : chaque opérateur connu
+	s’applique aux deux opérandes qui le précèdent et il reste un seul résultat."""
+	depth = 0
+	for i, item in enumerate(rpn):
+		if type(item) is not str:
+			depth += 1
+		elif item not in OPERATORS:
+			raise SaveError(f"invalid node at {path}[{i}]: unknown operator {item!r}")
+		elif depth < 2:
+			raise SaveError(f"invalid node at {path}[{i}]: missing operand")
+		else:
+			depth -= 1
+	if depth != 1:
+		raise SaveError(f"invalid node at {path}: expected a single result")
+
+
+def save_program(node: ASTNodeSequence, path: str):
+	"""Enregistre le programme dans un fichier JSON."""
+	with open(path, "w", encoding="utf-8") as file:
+		json.dump({"benday": SAVE_VERSION, "program": as_dict(node)}, file, ensure_ascii=False, indent=1)
+
+
+def load_program(path: str) -> ASTNodeSequence:
+	"""Charge un programme enregistré avec 'save_program'. Lève 'SaveError' si le fichier n’en est pas un."""
+	with open(path, encoding="utf-8") as file:
+		try:
+			data = json.load(file)
+		except (json.JSONDecodeError, RecursionError) as error:
+			raise SaveError(f"'{path}' is not a JSON file ({error})") from None
+	
+	if type(data) is not dict or data.get("benday") != SAVE_VERSION:
+		raise SaveError(f"'{path}' is not a Benday program (version {SAVE_VERSION})")
+	try:
+		return sequence_from_dict(data.get("program"), "program")
+	except RecursionError:
+		raise SaveError(f"'{path}' is nested too deeply") from None
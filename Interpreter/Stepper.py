@@ -0,0 +1,57 @@
+"""Ce programme python exécute les programmes pas à pas dans l’éditeur, par tranches de temps,
+pour que les longues boucles ne fassent pas perdre d’images."""
+from time import perf_counter
+from typing import Generator
+
+from AST import ASSIGN_EVENT, ASTNode, ERROR_EVENT, Event, LIMIT_EVENT, RETURN_EVENT, Value
+from Interpreter.Limits import Budget, ExecutionLimits, LimitExceeded, is_large
+
+
+class Stepper:
+	"""Ordonnanceur d’un programme : chaque appel à 'advance' l’exécute pendant un temps donné
+	puis rend la main, en renvoyant les événements produits (affichages, assignations et retour)."""
+	
+	def __init__(self, node: ASTNode, limits: ExecutionLimits | None = None):
+		self.variables: dict[str, Value] = {}
+		self._steps = node.steps(self.variables)
+		self.budget = Budget(limits)
+		"""Décompte des pas - sa durée ne compte que le temps passé à exécuter le programme."""
+		self._paused_at: float = self.budget.start
+		
+		self.finished: bool = False
+		self.result: Value = None
+		"""Valeur de retour du programme, une fois fini."""
+	
+	def advance(self, duration: float) -> list[Event]:
+		"""Exécute le programme pendant la durée donnée (en millisecondes)."""
+		events: list[Event] = []
+		if self.finished: return events
+		
+		start = perf_counter()
+		self.budget.start += start - self._paused_at
+		deadline = start + duration / 1000
+		try:
+			while perf_counter() < deadline:
+				event = next(self._steps)
+				self.budget.countdown -= 1
+				if event is not None:
+					events.append(event)
+					if event[0] == ASSIGN_EVENT and is_large(event[1][1]): self.budget.countdown = 0
+				if self.budget.countdown <= 0: self.budget.check(self.variables.values())
+		except StopIteration as stop:
+			self.finished = True
+			self.result = stop.value
+			events.append((RETURN_EVENT, stop.value))
+		except LimitExceeded as limit:
+			self.finished = True
+			events.append((LIMIT_EVENT, limit))
+		except Exception as error:
+			self.finished = True
+			events.append((ERROR_EVENT, f"{error.__class__.__name__}: {error}"))
+		self._paused_at = perf_counter()
+		return events
+	
+	def stream(self) -> Generator[Event, None, None]:
+		"""Exécute tout le programme et produit ses événements au fur et à mesure."""
+		while not self.finished:
+			yield from self.advance(float("inf"))
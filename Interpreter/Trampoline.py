@@ -0,0 +1,24 @@
+"""Ce programme python exécute sans récursion Python les parcours récursifs de l’AST : un parcours est
+écrit en générateur, qui produit ('yield') le générateur de chaque appel récursif et reçoit sa valeur
+en retour. La profondeur d’un programme n’est alors limitée que par la mémoire, pas par la pile de Python."""
+from typing import Any, Generator
+
+Recursion = Generator["Recursion", Any, Any]
+"""Parcours récursif : 'yield' d’un sous-parcours renvoie la valeur de celui-ci."""
+
+
+def trampoline(recursion: Recursion) -> Any:
+	"""Exécute un parcours récursif avec une pile explicite, et renvoie sa valeur.
+	Une exception d’un sous-parcours remonte directement, sans passer par les parcours appelants."""
+	stack = [recursion]
+	value = None
+	while True:
+		try:
+			call = stack[-1].send(value)
+		except StopIteration as stop:
+			stack.pop()
+			if not stack: return stop.value
+			value = stop.value
+		else:
+			stack.append(call)
+			value = None
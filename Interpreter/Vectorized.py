@@ -0,0 +1,354 @@
+"""Ce programme python exécute un même programme sur de nombreuses lignes de valeurs de départ à la fois :
+chaque variable est une colonne NumPy (un élément par ligne), les calculs sont faits sur toutes les lignes
+en une opération, et les conditions et les boucles ne s’appliquent qu’aux lignes concernées (un masque).
+Les nombres sont des colonnes int64 ou float64 : un résultat entier est rendu comme un entier.
+Un calcul dont le résultat pourrait sortir des int64 (ou perdre des chiffres en float64), comme les
+colonnes de valeurs mélangées ou de trop grands entiers, est évalué ligne par ligne par l’interpréteur
+de référence, avec les entiers sans limite de Python.
+NumPy n’est nécessaire qu’à ce module (le mode "vectorized" de 'Interpreter.Batch')."""
+from dataclasses import dataclass
+
+try:
+	import numpy as np
+except ImportError as error:
+	raise ImportError("the vectorized execution needs NumPy ('pip install numpy')") from error
+
+from AST import ASTNode, ASTNodeIfElse, ASTNodeLiteral, ASTNodeMathExpression, ASTNodeOperation, ASTNodePrint,\
+	ASTNodeSequence, ASTNodeValue, ASTNodeVariable, ASTNodeVariableAssignment, ASTNodeVariableReturn,\
+	ASTNodeWhile, BOOL_TYPE, FLOAT_TYPE, INT_TYPE, TypeMismatch, Value, coerce
+from Interpreter.Limits import Budget, ExecutionLimits
+
+Column = np.ndarray
+"""Valeurs d’une variable, une par ligne (nombres, booléens, ou objets Python pour le reste)."""
+Mask = np.ndarray
+"""Lignes concernées par une instruction."""
+
+NUMERIC_KINDS: str = "iuf"
+
+INT64_MAX: int = 2**63 - 1
+EXACT_FLOAT_INT: int = 2**53
+"""Plus grand entier dont toutes les valeurs inférieures sont exactes en float64."""
+
+
+class IntegerOverflow(Exception):
+	"""Calcul sur des entiers dont le résultat pourrait ne pas tenir dans une colonne int64."""
+
+
+def as_column(values: list) -> Column:
+	"""Renvoie une colonne numérique ou booléenne si toutes les valeurs peuvent y être rangées telles quelles,
+	sinon une colonne d’objets Python (textes, valeurs mélangées, booléens et nombres, trop grands entiers)."""
+	types = set(map(type, values))
+	if types == {bool}: return np.array(values, bool)
+	if types and types <= {int, float}:
+		size = max((abs(value) for value in values if type(value) is int), default=0)
+		if types == {int} and size <= INT64_MAX: return np.array(values, np.int64)
+		if float in types and size <= EXACT_FLOAT_INT: return np.array(values, np.float64)
+	column = np.empty(len(values), object)
+	column[:] = values
+	return column
+
+
+def integer_size(value: Column | Value, rows: Mask) -> int | None:
+	"""Renvoie la plus grande valeur absolue d’un entier, ou d’une colonne d’entiers sur les lignes données
+	(None pour un flottant)."""
+	if not isinstance(value, np.ndarray): return None if isinstance(value, (float, np.floating)) else abs(int(value))
+	if value.dtype.kind == "b": return 1
+	if value.dtype.kind not in "iu": return None
+	values = value[rows]
+	if not len(values): return 0
+	return max(int(values.max()), -int(values.min()))
+
+
+def python_value(value) -> Value:
+	"""Renvoie la valeur Python d’un élément de colonne, normalisée comme 'math_expression'."""
+	if isinstance(value, np.generic): value = value.item()
+	if type(value) is float and value.is_integer(): return int(value)
+	return value
+
+
+@dataclass(slots=True)
+class BatchResult:
+	"""Résultats d’une exécution sur plusieurs lignes."""
+	returns: list[Value]
+	"""Valeur de retour de chaque ligne."""
+	errors: list[str | None]
+	"""Erreur qui a arrêté chaque ligne (None si elle est allée au bout)."""
+	outputs: list[list[Value]]
+	"""Valeurs affichées par chaque ligne."""
+	
+	def __len__(self) -> int:
+		return len(self.returns)
+
+
+class VectorExecutor:
+	"""Exécution d’un programme sur des colonnes. Une erreur n’arrête que les lignes où elle se produit."""
+	
+	def __init__(self, inputs: dict[str, list | np.ndarray], limits: ExecutionLimits | None = None):
+		sizes = {len(values) for values in inputs.values()}
+		if len(sizes) > 1: raise ValueError(f"input columns have different lengths {sorted(sizes)}")
+		self.size: int = sizes.pop() if sizes else 1
+		
+		self.columns: dict[str, Column] = {name: self.column(values) for name, values in inputs.items()}
+		self.defined: dict[str, Mask] = {name: np.ones(self.size, bool) for name in inputs}
+		self.alive: Mask = np.ones(self.size, bool)
+		"""Lignes qui ne se sont pas arrêtées sur une erreur."""
+		self.errors: list[str | None] = [None] * self.size
+		self.prints: list[tuple[np.ndarray, Column | Value]] = []
+		"""Lignes et valeurs de chaque affichage, dans l’ordre d’exécution."""
+		self.budget = Budget(limits)
+	
+	def run(self, node: ASTNodeSequence) -> BatchResult:
+		"""Exécute le programme sur toutes les lignes."""
+		returns = np.full(self.size, None, object)
+		with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+			ended, value = self.sequence(node, self.alive.copy())
+		if ended is not None:
+			returns[ended & self.alive] = self.broadcast(value)[ended & self.alive]
+		
+		outputs: list[list[Value]] = [[] for _ in range(self.size)]
+		for rows, values in self.prints:
+			values = self.broadcast(values)
+			for row in rows:
+				outputs[row].append(python_value(values[row]))
+		return BatchResult([python_value(value) for value in returns], self.errors, outputs)
+	
+	# Colonnes
+	
+	def column(self, values: list | np.ndarray) -> Column:
+		"""Renvoie une colonne numérique, booléenne ou d’objets Python (voir 'as_column')."""
+		if isinstance(values, np.ndarray) and values.dtype.kind in "ifb": return values
+		return as_column(values.tolist() if isinstance(values, np.ndarray) else list(values))
+	
+	def broadcast(self, value: Column | Value) -> Column:
+		"""Renvoie une colonne, même pour une valeur commune à toutes les lignes."""
+		if isinstance(value, np.ndarray): return value
+		if isinstance(value, (int, float, np.number, np.bool_)): return np.full(self.size, value)
+		column = np.empty(self.size, object)
+		column[:] = [value] * self.size
+		return column
+	
+	def pack(self, values: Column, mask: Mask) -> Column:
+		"""Refait une colonne numérique de valeurs Python si celles des lignes données sont toutes des nombres
+		(les autres lignes ne sont pas lues)."""
+		rows = mask & self.alive
+		if not rows.any() or not all(type(value) in (int, float) for value in values[rows]): return values
+		numbers = values.copy()
+		numbers[~rows] = 0
+		return as_column(numbers.tolist())
+	
+	def fail(self, rows: Mask, error: Exception):
+		"""Arrête les lignes données sur une erreur."""
+		message = f"{error.__class__.__name__}: {error}"
+		for row in np.flatnonzero(rows & self.alive):
+			self.errors[row] = message
+		self.alive &= ~rows
+	
+	def truth(self, value: Column | Value, mask: Mask) -> Mask:
+		"""Renvoie les lignes où la valeur est vraie (comme 'bool' en Python)."""
+		if not isinstance(value, np.ndarray): return mask if value else np.zeros(self.size, bool)
+		if value.dtype.kind in NUMERIC_KINDS + "b": return mask & (value != 0)
+		return mask & np.fromiter((bool(element) for element in value), bool, self.size)
+	
+	# Instructions
+	
+	def sequence(self, node: ASTNodeSequence, mask: Mask) -> tuple[Mask | None, Column | Value]:
+		"""Exécute une séquence et renvoie les lignes arrêtées par son retour, et la valeur retournée."""
+		self.budget.charge(len(node.elements), self.columns.values())
+		for element in node.elements:
+			mask = mask & self.alive
+			if not mask.any(): return None, None
+			if type(element) is ASTNodeVariableReturn:
+				element: ASTNodeVariableReturn
+				return mask, self.value(element.value, mask)
+			self.statement(element, mask)
+		return None, None
+	
+	def statement(self, node: ASTNode, mask: Mask):
+		match node:
+			case ASTNodeVariableAssignment(name=name, value=value, type=declared):
+				self.assign(name, self.value(value, mask), declared, mask)
+			
+			case ASTNodePrint(value=value):
+				value = self.value(value, mask)
+				rows = np.flatnonzero(mask & self.alive)
+				if len(rows): self.prints.append((rows, value))
+			
+			case ASTNodeSequence():
+				self.sequence(node, mask)
+			
+			case ASTNodeIfElse(if_condition=if_condition, if_sequence=if_sequence,
+			                   elifs=elifs, else_sequence=else_sequence):
+				remaining = mask
+				for condition, sequence in [(if_condition, if_sequence)] + elifs:
+					taken = self.truth(self.value(condition, remaining), remaining & self.alive)
+					remaining = remaining & ~taken
+					if taken.any(): self.sequence(sequence, taken)
+				remaining &= self.alive
+				if else_sequence is not None and remaining.any():
+					self.sequence(else_sequence, remaining)
+			
+			case ASTNodeWhile(condition=condition, sequence=sequence, is_do=is_do):
+				active = mask
+				if is_do: active = active & ~self.returned(*self.sequence(sequence, active))
+				while (active := active & self.alive).any():
+					active = self.truth(self.value(condition, active), active)
+					if not active.any(): break
+					active = active & ~self.returned(*self.sequence(sequence, active))
+					self.budget.charge(1, self.columns.values())
+			
+			case _:
+				self.value(node, mask)
+	
+	def returned(self, ended: Mask | None, value: Column | Value) -> Mask:
+		"""Lignes dont la boucle s’arrête : la séquence a retourné autre chose que None."""
+		if ended is None: return np.zeros(self.size, bool)
+		if not isinstance(value, np.ndarray): return ended if value is not None else np.zeros(self.size, bool)
+		if value.dtype.kind != "O": return ended
+		return ended & np.fromiter((element is not None for element in value), bool, self.size)
+	
+	def assign(self, name: str, value: Column | Value, declared: str | None, mask: Mask):
+		mask = mask & self.alive
+		if declared is not None:
+			value = self.coerce(name, value, declared, mask)
+			mask = mask & self.alive
+		value = self.broadcast(value)
+		
+		old = self.columns.get(name)
+		if old is None:
+			old = np.zeros(self.size, value.dtype) if value.dtype.kind in NUMERIC_KINDS\
+			  else np.full(self.size, None, object)
+			self.defined[name] = np.zeros(self.size, bool)
+		same_kind = value.dtype.kind == old.dtype.kind or\
+		  (value.dtype.kind in NUMERIC_KINDS and old.dtype.kind in NUMERIC_KINDS)
+		if not same_kind:
+			value, old = value.astype(object), old.astype(object)
+		self.columns[name] = np.where(mask, value, old)
+		self.defined[name] = self.defined[name] | mask
+	
+	def coerce(self, name: str, value: Column | Value, declared: str, mask: Mask) -> Column | Value:
+		"""Convertit la valeur au type déclaré de la variable, en arrêtant les lignes où c’est impossible."""
+		if isinstance(value, np.ndarray) and value.dtype.kind == "f" and declared == INT_TYPE and\
+		  (mask & ~(np.abs(value) <= INT64_MAX)).any():
+			value = value.astype(object)  # Flottants hors des int64 (ou infinis) : convertis ligne par ligne.
+		if isinstance(value, np.ndarray) and value.dtype.kind in NUMERIC_KINDS:
+			if declared == FLOAT_TYPE: return value.astype(np.float64)
+			if declared == INT_TYPE:
+				integral = value == np.floor(value)
+				if (mask & ~integral).any():
+					self.fail(mask & ~integral, TypeMismatch(name, declared, FLOAT_TYPE))
+				return value.astype(np.int64) if value.dtype.kind == "f" else value
+			if declared == BOOL_TYPE:
+				integral = value == np.floor(value)
+				binary = (value == 0) | (value == 1)
+				for wrong, found in ((mask & integral & ~binary, INT_TYPE), (mask & ~integral, FLOAT_TYPE)):
+					if wrong.any(): self.fail(wrong, TypeMismatch(name, declared, found))
+				return value.astype(bool)
+		if isinstance(value, np.ndarray) and value.dtype.kind == "b" and declared == BOOL_TYPE:
+			return value
+		
+		values = self.broadcast(value)
+		coerced = np.full(self.size, None, object)
+		for row in np.flatnonzero(mask):
+			try:
+				coerced[row] = coerce(name, python_value(values[row]), declared)
+			except TypeMismatch as error:
+				self.fail(np.arange(self.size) == row, error)
+		return self.pack(coerced, mask)
+	
+	# Valeurs
+	
+	def read(self, name: str, mask: Mask) -> Column:
+		"""Renvoie la colonne d’une variable, en arrêtant les lignes où elle n’est pas encore assignée."""
+		if name not in self.columns:
+			self.fail(mask, KeyError(name))
+			return self.broadcast(None)
+		undefined = mask & ~self.defined[name]
+		if undefined.any(): self.fail(undefined, KeyError(name))
+		return self.columns[name]
+	
+	def value(self, node: ASTNode, mask: Mask) -> Column | Value:
+		match node:
+			case ASTNodeLiteral(value=value):
+				return value
+			
+			case ASTNodeVariable(name=name):
+				return self.read(name, mask)
+			
+			case ASTNodeOperation(rpn=rpn):
+				try:
+					return self.calculate(rpn, mask)
+				except IntegerOverflow:
+					return self.per_row(node, list(self.columns), mask)
+			
+			case ASTNodeMathExpression(operation=operation, names=names):
+				columns = [self.read(name, mask) for name in names]
+				if all(column.dtype.kind in NUMERIC_KINDS for column in columns):
+					try:
+						result = self.calculate(operation.rpn, mask)
+					except IntegerOverflow:
+						return self.per_row(node, names, mask)
+					# Comme 'normalize' : un booléen devient un entier.
+					if isinstance(result, np.ndarray) and result.dtype.kind == "b": return result.astype(np.int64)
+					if isinstance(result, (bool, np.bool_)): return int(result)
+					return result
+				return self.per_row(node, names, mask)
+			
+			case ASTNodeValue(template=template) if template is not None:
+				return self.per_row(node, [name for _, name in template.holes], mask)
+			
+			case _:
+				return self.per_row(node, [], mask)
+	
+	def calculate(self, rpn: list[ASTNode | str], mask: Mask) -> Column | Value:
+		"""Évalue un calcul sur les colonnes. Lève 'IntegerOverflow' si un résultat pourrait être faux."""
+		stack = []
+		for item in rpn:
+			if type(item) is str:
+				right = stack.pop()
+				stack[-1] = self.operation(item, stack[-1], right, mask)
+			else:
+				stack.append(self.value(item, mask))
+		return stack[0]
+	
+	def operation(self, operator: str, left: Column | Value, right: Column | Value, mask: Mask) -> Column | Value:
+		rows = mask & self.alive
+		left_size, right_size = integer_size(left, rows), integer_size(right, rows)
+		if left_size is not None and right_size is not None:
+			# Entiers : le résultat doit tenir dans un int64, et une division être exacte en float64.
+			match operator:
+				case "+" | "-": overflow = left_size + right_size > INT64_MAX
+				case "*": overflow = left_size * right_size > INT64_MAX
+				case "/": overflow = max(left_size, right_size) > EXACT_FLOAT_INT
+				case _: overflow = False
+			if overflow: raise IntegerOverflow(operator)
+		elif operator in "<>" and max(left_size or 0, right_size or 0) > EXACT_FLOAT_INT:
+			raise IntegerOverflow(operator)  # Un entier comparé à un flottant n’est converti exactement que jusqu’à 2**53.
+		match operator:
+			case "+": return left + right
+			case "-": return left - right
+			case "*": return left * right
+			case "/":
+				zero = self.truth(right, mask) ^ mask
+				if zero.any(): self.fail(zero, ZeroDivisionError("division by zero"))
+				return np.true_divide(left, right)
+			case ">": return np.greater(left, right)
+			case "<": return np.less(left, right)
+	
+	def per_row(self, node: ASTNode, names: list[str], mask: Mask) -> Column:
+		"""Évalue une valeur ligne par ligne avec l’interpréteur de référence (textes et valeurs mélangées)."""
+		result = np.full(self.size, None, object)
+		columns = {name: (self.columns[name], self.defined[name]) for name in names if name in self.columns}
+		for row in np.flatnonzero(mask & self.alive):
+			variables = {name: python_value(column[row]) for name, (column, defined) in columns.items()
+			             if defined[row]}
+			try:
+				result[row] = node.execute(variables)
+			except Exception as error:
+				self.fail(np.arange(self.size) == row, error)
+		return self.pack(result, mask)
+
+
+def run_batch(node: ASTNodeSequence, inputs: dict[str, list | np.ndarray],
+              limits: ExecutionLimits | None = None) -> BatchResult:
+	"""Exécute le programme une fois par ligne des valeurs de départ données (une colonne par variable)."""
+	return VectorExecutor(inputs, limits).run(node)
@@ -0,0 +1,123 @@
+"""Ce programme python exécute les programmes dans un processus séparé, pour que l’éditeur garde
+sa fréquence d’affichage pendant un long calcul. Les résultats sont renvoyés au fur et à mesure."""
+import sys
+from multiprocessing import get_context
+from queue import Empty
+
+from AST import ASTNode, ERROR_EVENT, Event, LIMIT_EVENT, PRINT_EVENT, PROFILE_EVENT, RETURN_EVENT,\
+	compile_program
+from Interpreter.Bytecode import Bytecode
+from Interpreter.Limits import Budget, ExecutionLimits, LimitExceeded
+from Interpreter.Profiler import Profiler
+
+
+class EventWriter:
+	"""Remplace la sortie standard du processus : chaque ligne affichée devient un événement."""
+	
+	def __init__(self, events):
+		self.events = events
+		self.buffer: str = ""
+	
+	def write(self, text: str) -> int:
+		self.buffer += text
+		*lines, self.buffer = self.buffer.split("\n")
+		for line in lines:
+			self.events.put((PRINT_EVENT, line))
+		return len(text)
+	
+	def flush(self):
+		if not self.buffer: return
+		self.events.put((PRINT_EVENT, self.buffer))
+		self.buffer = ""
+
+
+def work(jobs, events):
+	"""Boucle du processus : exécute chaque programme reçu jusqu’à recevoir None."""
+	sys.stdout = EventWriter(events)
+	
+	while (job := jobs.get()) is not None:
+		mode, program, limits, profile = job
+		profiler = Profiler() if profile else None
+		try:
+			match mode:
+				case "reference":
+					result = program.execute({}, Budget(limits))
+				case "closures":
+					result = compile_program(program, profiler).run(limits=limits)
+				case "bytecode":
+					result = program.run(limits=limits)
+				case _:
+					raise ValueError(f"unknown execution mode '{mode}'")
+		except LimitExceeded as limit:
+			event = LIMIT_EVENT, limit
+		except Exception as error:
+			event = ERROR_EVENT, f"{error.__class__.__name__}: {error}"
+		else:
+			event = RETURN_EVENT, result
+		
+		sys.stdout.flush()
+		if profiler is not None:  # Même une exécution interrompue montre où son temps est passé.
+			events.put((PROFILE_EVENT, profiler.stats()))
+		events.put(event)
+
+
+class ExecutionWorker:
+	"""Processus d’exécution des programmes. Il est démarré au premier lancement
+	et arrêté (puis recréé au lancement suivant) quand une exécution est annulée."""
+	
+	def __init__(self):
+		self._context = get_context("spawn")  # Le processus n’hérite pas de l’état de pygame.
+		self._process = None
+		self._jobs = None
+		self._events = None
+		
+		self.running: bool = False
+		"""Indique si un programme est en cours d’exécution."""
+	
+	def start(self, mode: str, program: ASTNode | Bytecode, limits: ExecutionLimits | None = None,
+	          profile: bool = False):
+		"""Envoie une copie du programme au processus, qui l’exécute selon le mode et les limites donnés.
+		Un programme profilé (en mode "closures") renvoie ses mesures avant la fin de son exécution."""
+		if self._process is None or not self._process.is_alive():
+			self._jobs = self._context.Queue()
+			self._events = self._context.Queue()
+			self._process = self._context.Process(target=work, args=(self._jobs, self._events), daemon=True)
+			self._process.start()
+		
+		self._jobs.put((mode, program, limits, profile))
+		self.running = True
+	
+	def cancel(self):
+		"""Arrête le programme en cours en arrêtant le processus."""
+		if self._process is not None:
+			self._process.terminate()
+			self._process.join()
+			self._process = None
+		self.running = False
+	
+	def poll(self) -> list[Event]:
+		"""Renvoie les événements arrivés depuis le dernier appel, sans attendre."""
+		events = []
+		if self._events is None: return events
+		
+		while True:
+			try:
+				event = self._events.get_nowait()
+			except Empty:
+				break
+			events.append(event)
+			if event[0] in (RETURN_EVENT, ERROR_EVENT, LIMIT_EVENT):
+				self.running = False
+		
+		if self.running and not self._process.is_alive():
+			events.append((ERROR_EVENT, f"execution process stopped (exit code {self._process.exitcode})"))
+			self._process = None
+			self.running = False
+		return events
+	
+	def close(self):
+		"""Arrête le processus, à la fermeture de l’application."""
+		if self._process is not None and self._process.is_alive():
+			self._jobs.put(None)
+			self._process.join(1)
+		self.cancel()
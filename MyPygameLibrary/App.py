@@ -1,5 +1,5 @@
 """Ce programme python contient la classe mère Application."""
-from pygame import Color, RESIZABLE, Surface, Vector2 as Vec2, display, draw, event, init,\
+from pygame import Color, RESIZABLE, Rect, Surface, Vector2 as Vec2, display, draw, event, init,\
 	quit as pygame_quit
 from pygame.time import Clock
 
@@ -12,6 +12,10 @@ from MyPygameLibrary.World import draw_line, draw_rect
 class App:
 	LONG_CLICK_TIME: int = 300
 	LONG_CLICK_SPEED: int = 0.02
+	MAX_DAMAGED_RECTS: int = 8
+	"""Au-delà, les zones à réafficher sont réunies en une seule."""
+	MAX_DAMAGED_RATIO: float = .5
+	"""Part de la fenêtre au-delà de laquelle toute la fenêtre est réaffichée."""
 	
 	def __init__(self, name: str = "My game", color: Color = "sky blue",
 	             size: tuple[int, int] = (1200, 750), fps: int = 60,
@@ -51,6 +55,10 @@ class App:
 		
 		self.running: bool = True
 		self.changed: bool = True
+		"""Indique si toute la fenêtre est à réafficher."""
+		self.damaged: list[Rect] = []
+		"""Zones de la fenêtre à réafficher (voir 'damage')."""
+		self._fps_rect: Rect | None = None
 		
 		self.key_down_timer: int = 0
 		self.rot = 0
@@ -66,14 +74,29 @@ class App:
 			self.update(delta)
 			
 			if self.changed:
+				rects = None
+			else:
+				if self._draw_fps and self._fps_rect is not None: self.damage(self._fps_rect)
+				rects = self.damaged_rects()
+			
+			if rects is None:
 				self.window_surface.fill(self.window_color)
 				self.draw_world()
 				self.draw_ui()
+			else:
+				self.redraw(rects)
+			
+			if self._draw_fps:
+				self._fps_rect = self.draw_fps()
+				if rects is not None and self._fps_rect is not None: rects.append(self._fps_rect)
 			
-			if self._draw_fps: self.draw_fps()
-			display.flip()
+			if rects is None:
+				display.flip()
+			elif rects:
+				display.update(rects)
 			
 			self.changed = False
+			self.damaged = []
 		self.quit()
 	
 	def quit(self):
@@ -101,13 +124,48 @@ class App:
 		for ui_object in self.ui_objects.values():
 			ui_object.update(delta, self.inputs, self.camera)
 			if ui_object.changed:
-				self.changed = True
+				self.damage(ui_object.hit_box)
 		
 		self.key_down_timer += delta
 	
 	def update(self, delta):
 		"""Calculs de l'application."""
 	
+	def damage(self, rect: Rect | None = None):
+		"""Marque une zone de la fenêtre (en pixels) à réafficher à la prochaine image,
+		ou toute la fenêtre si aucune n’est donnée."""
+		if rect is None:
+			self.changed = True
+		else:
+			self.damaged.append(Rect(rect).inflate(2, 2))  # Les bordures dépassent d’un pixel.
+	
+	def damaged_rects(self) -> list[Rect] | None:
+		"""Renvoie les zones à réafficher, réunies quand elles se chevauchent et coupées au bord de la fenêtre.
+		Renvoie None s’il est plus simple de réafficher toute la fenêtre."""
+		window = self.window_surface.get_rect()
+		rects = []
+		for rect in self.damaged:
+			rect = rect.clip(window)
+			if not rect.width or not rect.height: continue
+			while (index := rect.collidelist(rects)) != -1:
+				rect.union_ip(rects.pop(index))
+			rects.append(rect)
+		
+		if len(rects) > self.MAX_DAMAGED_RECTS:
+			rects = [rects[0].unionall(rects[1:])]
+		if sum(rect.width * rect.height for rect in rects) > self.MAX_DAMAGED_RATIO * window.width * window.height:
+			return None
+		return rects
+	
+	def redraw(self, rects: list[Rect]):
+		"""Réaffiche seulement les zones données : tout dessin en dehors est coupé."""
+		for rect in rects:
+			self.window_surface.set_clip(rect)
+			self.window_surface.fill(self.window_color, rect)
+			self.draw_world()
+			self.draw_ui()
+		self.window_surface.set_clip(None)
+	
 	def reset(self):
 		"""Réinitialise l'application."""
 	
@@ -160,8 +218,8 @@ class App:
 		for ui_object in self.ui_objects.values():
 			ui_object.draw(self.window_surface)
 	
-	def draw_fps(self):
-		draw_text(self.window_surface, f"{self.clock.get_fps():.1f} FPS",
+	def draw_fps(self) -> Rect | None:
+		return draw_text(self.window_surface, f"{self.clock.get_fps():.1f} FPS",
 		          Vec2(100, 50), 30, "black", back_framed=True, framed=True)
 	
 	def draw_grid(self, color: Color = None, scale: float = 1 / 100, draw_border: bool = False):
@@ -1,9 +1,14 @@
 """Ce programme python contient une caméra virtuelle 2D."""
+from math import log2
+
 from pygame import Vector2 as Vec2
 
 from MyPygameLibrary import Inputs
 from MyPygameLibrary.Inputs import Key
 
+RENDER_SCALE_STEPS: int = 8
+"""Échelles de rendu des textes par doublement de l’échelle."""
+
 
 class Camera:
 	"""Objet virtuel permettant de se déplacer et de zoomer dans un monde."""
@@ -113,6 +118,12 @@ class Camera:
 		"""Renvoie la position d'un point dans le monde en position à l'écran."""
 		return (Vec2(point) - self.position) * self.scale
 	
+	@property
+	def render_scale(self) -> float:
+		"""Échelle arrondie à la plus proche des échelles de rendu, à laquelle les textes sont dessinés
+		avant d’être redimensionnés à l’échelle de la caméra."""
+		return 2 ** (round(log2(self.scale) * RENDER_SCALE_STEPS) / RENDER_SCALE_STEPS)
+	
 	@property
 	def left_top(self) -> Vec2: return self.screen2world(Vec2(0))
 	
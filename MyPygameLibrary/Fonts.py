@@ -0,0 +1,114 @@
+"""Ce programme python garde les polices déjà chargées, la taille des textes déjà mesurés et l’image
+des textes déjà dessinés : 'SysFont' cherche la police dans les polices du système à chaque appel,
+et 'Font.render' redessine le texte à chaque image."""
+from collections import OrderedDict
+
+from pygame import Color, Surface, font, transform
+from pygame.font import Font, SysFont
+
+MAX_SIZES: int = 4096
+"""Nombre de tailles de textes gardées - les moins récemment demandées sont oubliées."""
+MAX_SURFACES: int = 1024
+"""Nombre d’images de textes gardées - les moins récemment affichées sont oubliées."""
+
+FontKey = tuple[str, int, bool, bool]
+
+
+class FontRegistry:
+	"""Polices partagées selon leur nom, leur taille et leur style, et taille des textes mesurés avec elles."""
+	
+	def __init__(self, max_sizes: int = MAX_SIZES, max_surfaces: int = MAX_SURFACES):
+		self._fonts: dict[FontKey, Font] = {}
+		self._sizes: OrderedDict[tuple[FontKey, str], tuple[int, int]] = OrderedDict()
+		self._surfaces: OrderedDict[tuple[FontKey, str, tuple[int, ...], int], Surface] = OrderedDict()
+		self.max_sizes = max_sizes
+		self.max_surfaces = max_surfaces
+		
+		self.font_hits: int = 0
+		self.font_misses: int = 0
+		self.size_hits: int = 0
+		self.size_misses: int = 0
+		self.surface_hits: int = 0
+		self.surface_misses: int = 0
+	
+	def get(self, name: str, size: int, bold: bool = False, italic: bool = False) -> Font:
+		"""Renvoie la police, chargée seulement à sa première demande."""
+		key = name, int(size), bold, italic
+		loaded = self._fonts.get(key)
+		if loaded is not None:
+			self.font_hits += 1
+			return loaded
+		
+		self.font_misses += 1
+		if not font.get_init(): font.init()
+		loaded = self._fonts[key] = SysFont(*key)
+		return loaded
+	
+	def size(self, text: str, name: str, size: int, bold: bool = False, italic: bool = False) -> tuple[int, int]:
+		"""Renvoie la taille (en pixels) du texte écrit avec la police, mesurée seulement à sa première demande."""
+		key = (name, int(size), bold, italic), text
+		text_size = self._sizes.get(key)
+		if text_size is not None:
+			self._sizes.move_to_end(key)
+			self.size_hits += 1
+			return text_size
+		
+		self.size_misses += 1
+		text_size = self._sizes[key] = self.get(name, size, bold, italic).size(text)
+		if len(self._sizes) > self.max_sizes:
+			self._sizes.popitem(last=False)
+		return text_size
+	
+	def render(self, text: str, name: str, size: int, color: Color, bold: bool = False, italic: bool = False,
+	           render_size: int | None = None) -> Surface:
+		"""Renvoie l’image du texte, dessinée seulement à sa première demande.
+		Le texte est dessiné à 'render_size' puis redimensionné à 'size' si les deux tailles diffèrent :
+		les échelles proches partagent ainsi la même police."""
+		size = int(size)
+		render_size = size if render_size is None else max(1, int(render_size))
+		key = (name, render_size, bold, italic), text, tuple(Color(color)), size
+		text_surface = self._surfaces.get(key)
+		if text_surface is not None:
+			self._surfaces.move_to_end(key)
+			self.surface_hits += 1
+			return text_surface
+		
+		self.surface_misses += 1
+		text_surface = self.get(name, render_size, bold, italic).render(text, True, color)
+		if render_size != size and text_surface.get_width():
+			text_surface = transform.smoothscale(
+			  text_surface, (max(1, round(text_surface.get_width() * size / render_size)),
+			                 max(1, round(text_surface.get_height() * size / render_size))))
+		self._surfaces[key] = text_surface
+		if len(self._surfaces) > self.max_surfaces:
+			self._surfaces.popitem(last=False)
+		return text_surface
+	
+	def stats(self) -> dict[str, int]:
+		"""Renvoie les compteurs du cache (appels évités et chargements, mesures ou dessins faits)."""
+		return {"fonts": len(self._fonts), "font_hits": self.font_hits, "font_misses": self.font_misses,
+		        "sizes": len(self._sizes), "size_hits": self.size_hits, "size_misses": self.size_misses,
+		        "surfaces": len(self._surfaces), "surface_hits": self.surface_hits,
+		        "surface_misses": self.surface_misses}
+	
+	def clear(self):
+		self._fonts.clear()
+		self._sizes.clear()
+		self._surfaces.clear()
+
+
+FONTS = FontRegistry()
+"""Registre partagé par toute l’application."""
+
+
+def get_font(name: str, size: int, bold: bool = False, italic: bool = False) -> Font:
+	return FONTS.get(name, size, bold, italic)
+
+
+def measure_text(text: str, name: str, size: int, bold: bool = False, italic: bool = False) -> tuple[int, int]:
+	return FONTS.size(text, name, size, bold, italic)
+
+
+def render_text(text: str, name: str, size: int, color: Color, bold: bool = False, italic: bool = False,
+                render_size: int | None = None) -> Surface:
+	return FONTS.render(text, name, size, color, bold, italic, render_size)
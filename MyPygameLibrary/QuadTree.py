@@ -0,0 +1,122 @@
+"""Ce programme python contient un arbre quaternaire (quadtree) de zones rectangulaires du monde,
+pour trouver celles qui touchent un point ou un rectangle sans les parcourir toutes."""
+from collections.abc import Hashable, Iterator
+
+from pygame import Vector2 as Vec2
+
+MAX_ITEMS: int = 8
+"""Nombre de zones d’un nœud au-delà duquel il est divisé en quatre."""
+MAX_DEPTH: int = 8
+
+Box = tuple[float, float, float, float]
+"""Zone rectangulaire : gauche, haut, droite, bas."""
+
+
+def make_box(position: Vec2, size: Vec2) -> Box:
+	return position.x, position.y, position.x + size.x, position.y + size.y
+
+
+def boxes_collide(a: Box, b: Box) -> bool:
+	return a[0] <= b[2] and b[0] <= a[2] and a[1] <= b[3] and b[1] <= a[3]
+
+
+def box_contains(a: Box, b: Box) -> bool:
+	"""Indique si la zone 'a' contient entièrement la zone 'b'."""
+	return a[0] <= b[0] and a[1] <= b[1] and b[2] <= a[2] and b[3] <= a[3]
+
+
+class QuadNode:
+	__slots__ = "box", "depth", "items", "children"
+	
+	def __init__(self, box: Box, depth: int):
+		self.box = box
+		self.depth = depth
+		self.items: dict[Hashable, Box] = {}
+		self.children: list[QuadNode] | None = None
+	
+	def insert(self, key: Hashable, box: Box, nodes: dict[Hashable, "QuadNode"]):
+		"""Range la zone dans le plus petit nœud qui la contient entièrement, et note ce nœud dans 'nodes'."""
+		node = self
+		while True:
+			if node.children is None:
+				if len(node.items) < MAX_ITEMS or node.depth >= MAX_DEPTH: break
+				node.split(nodes)
+			
+			child = next((child for child in node.children if box_contains(child.box, box)), None)
+			if child is None: break
+			node = child
+		
+		node.items[key] = box
+		nodes[key] = node
+	
+	def split(self, nodes: dict[Hashable, "QuadNode"]):
+		"""Divise le nœud en quatre, et descend ses zones dans les enfants qui les contiennent."""
+		left, top, right, bottom = self.box
+		x, y = (left + right) / 2, (top + bottom) / 2
+		self.children = [QuadNode(box, self.depth + 1) for box in
+		                 [(left, top, x, y), (x, top, right, y), (left, y, x, bottom), (x, y, right, bottom)]]
+		
+		items, self.items = self.items, {}
+		for key, box in items.items():
+			child = next((child for child in self.children if box_contains(child.box, box)), None)
+			node = self if child is None else child
+			node.items[key] = box
+			nodes[key] = node
+	
+	def query(self, box: Box) -> Iterator[Hashable]:
+		nodes = [self]
+		while nodes:
+			node = nodes.pop()
+			for key, item_box in node.items.items():
+				if boxes_collide(item_box, box): yield key
+			if node.children is not None:
+				nodes.extend(child for child in node.children if boxes_collide(child.box, box))
+
+
+class QuadTree:
+	"""Zones rectangulaires du monde, rangées par position. Les zones qui dépassent les limites
+	de l’arbre restent à sa racine : elles sont toujours testées, mais jamais perdues.
+	Les requêtes renvoient les clés dans leur ordre d’ajout."""
+	
+	def __init__(self, position: Vec2, size: Vec2):
+		self._root = QuadNode(make_box(position, size), 0)
+		self._nodes: dict[Hashable, QuadNode] = {}
+		"""Nœud où est rangée chaque zone (pour la retirer sans la chercher)."""
+		self._orders: dict[Hashable, int] = {}
+		self._next_order: int = 0
+	
+	def __len__(self) -> int: return len(self._nodes)
+	
+	def __contains__(self, key: Hashable) -> bool: return key in self._nodes
+	
+	def insert(self, key: Hashable, position: Vec2, size: Vec2):
+		"""Ajoute une zone (après toutes les autres dans l’ordre des requêtes)."""
+		if key in self._nodes: self.remove(key)
+		self._orders[key] = self._next_order
+		self._next_order += 1
+		self._root.insert(key, make_box(position, size), self._nodes)
+	
+	def update(self, key: Hashable, position: Vec2, size: Vec2):
+		"""Déplace ou redimensionne une zone, en gardant sa place dans l’ordre des requêtes."""
+		box = make_box(position, size)
+		node = self._nodes[key]
+		if node.items[key] == box: return
+		del node.items[key]
+		self._root.insert(key, box, self._nodes)
+	
+	def remove(self, key: Hashable):
+		del self._nodes.pop(key).items[key]
+		del self._orders[key]
+	
+	def clear(self):
+		self._root = QuadNode(self._root.box, 0)
+		self._nodes.clear()
+		self._orders.clear()
+	
+	def query_rect(self, position: Vec2, size: Vec2) -> list[Hashable]:
+		"""Renvoie les clés des zones en collision avec le rectangle."""
+		return sorted(self._root.query(make_box(position, size)), key=self._orders.__getitem__)
+	
+	def query_point(self, point: Vec2) -> list[Hashable]:
+		"""Renvoie les clés des zones qui contiennent le point."""
+		return self.query_rect(point, Vec2(0))
@@ -4,12 +4,12 @@ from copy import copy
 from dataclasses import dataclass, field
 
 from pygame import SRCALPHA, Surface, Vector2 as Vec2, Color, Rect, draw, transform
-from pygame.font import SysFont
 
 from MyPygameLibrary.Camera import Camera
+from MyPygameLibrary.Fonts import get_font, measure_text, render_text
 from MyPygameLibrary.Inputs import Inputs, Key, Mouse
 from MyPygameLibrary.World import draw_rect
-from benday_rust import fuzzy_find
+from backends import fuzzy_find
 
 clip = lambda value, min_value, max_value: max(min(value, max_value), min_value)
 
@@ -459,9 +459,7 @@ class TextBox(UiObject):
 	def update_size(self, camera: Camera | None = None):
 		margin = MARGIN if camera is None else MARGIN * camera.scale
 		font_size = self._text_size if camera is None else int(self._text_size * camera.scale)
-		font = SysFont(self._font, font_size, self._bold, self._italic)
-		text_surface = font.render(self.text, False, "black")
-		text_width = text_surface.get_width()
+		text_width = measure_text(self.text, self._font, font_size, self._bold, self._italic)[0]
 		width = text_width if camera is None else int(text_width / camera.scale)
 		
 		self.size.x = max(self._default_size.x, width + 2 * margin)
@@ -492,18 +490,17 @@ class TextBox(UiObject):
 		size = self.size if camera is None else self.size * camera.scale
 		
 		font_size = self._text_size if camera is None else int(self._text_size * camera.scale)
-		font = SysFont(self._font, font_size, self._bold, self._italic)
 		
 		if self.hovered:
 			color = change_color(self._default_color, s_fonc=lambda s: s * .3, v_fonc=lambda v: .3)
 		else:
 			color = change_color(self._text_color, s_fonc=lambda s: s, v_fonc=lambda v: v)
 		
-		left_text_surface = font.render(self.text[:self.char], True, color)
+		left_text_surface = render_text(self.text[:self.char], self._font, font_size, color, self._bold, self._italic)
 		left_text = left_text_surface.get_rect()
 		left_text.centery = size.y / 2
 		
-		right_text_surface = font.render(self.text[self.char:], True, color)
+		right_text_surface = render_text(self.text[self.char:], self._font, font_size, color, self._bold, self._italic)
 		right_text = right_text_surface.get_rect()
 		right_text.centery = size.y / 2
 		
@@ -533,14 +530,13 @@ class TextBox(UiObject):
 		size = self.size if camera is None else self.size * camera.scale
 		
 		font_size = self._text_size if camera is None else int(self._text_size * camera.scale)
-		font = SysFont(self._font, font_size, self._bold, self._italic)
 		
 		if self.hovered:
 			color = change_color(self._default_color, s_fonc=lambda s: s * .3, v_fonc=lambda v: .3)
 		else:
 			color = change_color(self._text_color, s_fonc=lambda s: s / 2, v_fonc=lambda v: .4)
 		
-		text_surface = font.render(self._default_text, True, color)
+		text_surface = render_text(self._default_text, self._font, font_size, color, self._bold, self._italic)
 		text_rect = text_surface.get_rect()
 		text_rect.centery = size.y / 2
 		
@@ -730,8 +726,8 @@ class RollingList(UiObject):
 			self.slider_color = darker(self.color, .7)
 		self.words = self.base_words
 		
-		font = SysFont(self.font, self.text_size)
-		width = max([font.size(word)[0] for word in self.words])
+		font = get_font(self.font, self.text_size)
+		width = max([measure_text(word, self.font, self.text_size)[0] for word in self.words])
 		self.size = Vec2(width + SLIDER_WIDTH + 3 * MARGIN, self.height)
 		
 		self.line_height = font.get_height()
@@ -917,7 +913,7 @@ class RollingList(UiObject):
 		self.selected_word = None
 		self.slider_position = 0
 		
-		font = SysFont(self.font, self.text_size)
+		font = get_font(self.font, self.text_size)
 		width = self.size.x - 3 * MARGIN - SLIDER_WIDTH
 		self.text_surface = Surface((width, len(self.words) * self.line_height), SRCALPHA)
 		for i, text in enumerate(self.words):
@@ -940,20 +936,24 @@ class RollingList(UiObject):
 	def selected_text(self) -> str:
 		if self.selected_word is None: return None
 		return self.words[self.selected_word]
+	
+	@property
+	def hit_box(self) -> Rect: return Rect(self.position, self.size)
 
 
 def draw_text(surface: Surface, text: str, position: Vec2, size: int = 20, color: Color = "black",
               font: str = "tw cen", bold: bool = False, italic: bool = False,
               align: str = "center", camera: Camera = None,
-              back_framed: bool = False, framed: bool = False, contoured: bool = False, **kwargs):
-	"""Cette fonction permet d'afficher du texte."""
+              back_framed: bool = False, framed: bool = False, contoured: bool = False, **kwargs) -> Rect | None:
+	"""Cette fonction permet d'afficher du texte. Renvoie la zone dessinée (None si le texte n’est pas visible)."""
+	render_size = size
 	if camera:
 		position = camera.world2screen(position)
+		render_size = size * camera.render_scale
 		size *= camera.scale
 	text = str(text)
 	color = Color(color)
-	font = SysFont(font, int(size), bold, italic)
-	text_surface = font.render(text, True, color)
+	text_surface = render_text(text, font, size, color, bold, italic, render_size)
 	rect = text_surface.get_rect()
 	if align == "left":
 		rect.midleft = position
@@ -964,7 +964,8 @@ def draw_text(surface: Surface, text: str, position: Vec2, size: int = 20, color
 	
 	if camera:
 		if not camera.sees_rect(camera.screen2world(
-		  Vec2(rect.bottomleft)), Vec2(rect.size) / camera.scale): return
+		  Vec2(rect.bottomleft)), Vec2(rect.size) / camera.scale): return None
+	drawn_rect = rect.copy()
 	
 	if back_framed:
 		back_frame_color = kwargs.get("back_frame_color",
@@ -974,6 +975,7 @@ def draw_text(surface: Surface, text: str, position: Vec2, size: int = 20, color
 		back_frame_rect.center -= Vec2(0.5, 0.25) * size / 2
 		back_frame_radius = int(size / 4)
 		draw.rect(surface, back_frame_color, back_frame_rect, False, back_frame_radius)
+		drawn_rect.union_ip(back_frame_rect)
 	
 	if framed:
 		frame_color = kwargs.get("frame_color", color)
@@ -983,16 +985,19 @@ def draw_text(surface: Surface, text: str, position: Vec2, size: int = 20, color
 		frame_rect.center -= Vec2(0.5, 0.25) * size / 2
 		frame_radius = int(size / 4)
 		draw.rect(surface, frame_color, frame_rect, frame_width, frame_radius)
+		drawn_rect.union_ip(frame_rect)
 	
 	if contoured:
 		contour_color = kwargs.get("contour_color", change_color(color, v_fonc=lambda v: 1 - v))
-		contour_surface = font.render(text, True, contour_color)
+		contour_surface = render_text(text, font, size, contour_color, bold, italic, render_size)
 		for pos in [Vec2(x, y) for y in [-1, 0, 1] for x in [-1, 0, 1] if x or y]:
 			contour_rect = rect.copy()
 			contour_rect.center += Vec2(pos) * size / 20
 			surface.blit(contour_surface, contour_rect)
+			drawn_rect.union_ip(contour_rect)
 	
 	surface.blit(text_surface, rect)
+	return drawn_rect
 
 
 def do_nothing(x: float) -> float: return x
@@ -0,0 +1,74 @@
+"""Ce programme python choisit, pour chaque fonction du module compilé 'benday_rust', entre lui et son
+équivalent en Python ('math_foncs', 'fuzzy_finder'). Le module compilé est facultatif, et pour les petites
+entrées un appel Python peut coûter moins que le passage de la frontière avec Rust : à partir de quelle
+taille d’entrée le module compilé est utilisé se mesure avec 'Benchmarks.Backends'."""
+import json
+import os
+from typing import Callable
+
+import fuzzy_finder
+import math_foncs
+
+try:
+	import benday_rust
+except ImportError:
+	benday_rust = None
+
+THRESHOLDS_PATH: str = os.path.join(os.path.expanduser("~"), ".cache", "benday", "backends.json")
+"""Seuils mesurés par 'Benchmarks.Backends --write', qui remplacent ceux par défaut."""
+
+DEFAULT_THRESHOLDS: dict[str, int | None] = {"is_math_parsable": 0, "math_expression": 0, "fuzzy_find": 0}
+"""Taille d’entrée à partir de laquelle le module compilé est utilisé (0 : toujours, None : jamais)."""
+
+PYTHON_FUNCTIONS: dict[str, Callable] = {
+	"is_math_parsable": math_foncs.is_math_parsable,
+	"math_expression": math_foncs.math_expression,
+	"fuzzy_find": fuzzy_finder.fuzzy_find,
+}
+RUST_FUNCTIONS: dict[str, Callable] = {name: getattr(benday_rust, name) for name in PYTHON_FUNCTIONS
+                                       if hasattr(benday_rust, name)}
+"""Fonctions du module compilé (aucune s’il n’est pas installé)."""
+
+INPUT_SIZES: dict[str, Callable[..., int]] = {
+	"is_math_parsable": len,
+	"math_expression": len,
+	"fuzzy_find": lambda elements, query: len(elements),
+}
+"""Taille de l’entrée d’un appel : longueur du texte ou nombre de mots."""
+
+
+def load_thresholds(path: str = THRESHOLDS_PATH) -> dict[str, int | None]:
+	"""Renvoie les seuils mesurés s’il y en a, sinon ceux par défaut."""
+	thresholds = DEFAULT_THRESHOLDS.copy()
+	try:
+		with open(path) as file:
+			thresholds.update({name: threshold for name, threshold in json.load(file).items()
+			                   if name in thresholds})
+	except (OSError, ValueError, AttributeError):
+		pass
+	return thresholds
+
+
+def select(name: str, threshold: int | None) -> Callable:
+	"""Renvoie l’implémentation d’une fonction selon son seuil : une seule des deux si possible,
+	sinon une fonction qui choisit selon la taille de chaque entrée."""
+	python_function = PYTHON_FUNCTIONS[name]
+	rust_function = RUST_FUNCTIONS.get(name)
+	if rust_function is None or threshold is None: return python_function
+	if threshold <= 0: return rust_function
+	size = INPUT_SIZES[name]
+	
+	def select_by_size(*arguments):
+		if size(*arguments) >= threshold:
+			return rust_function(*arguments)
+		return python_function(*arguments)
+	
+	select_by_size.__name__ = name
+	return select_by_size
+
+
+THRESHOLDS: dict[str, int | None] = load_thresholds()
+
+is_math_parsable: Callable[[str], bool] = select("is_math_parsable", THRESHOLDS["is_math_parsable"])
+math_expression: Callable[[str], float | int] = select("math_expression", THRESHOLDS["math_expression"])
+fuzzy_find: Callable[[list[str], str], list[str]] = select("fuzzy_find", THRESHOLDS["fuzzy_find"])
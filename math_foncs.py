@@ -1,6 +1,10 @@
 from dataclasses import dataclass
 from typing import Any
 
+PRECEDENCES: dict[str, int] = {"<": 0, ">": 0, "+": 1, "-": 1, "*": 2, "/": 2}
+"""Priorité des opérateurs - tous sont associatifs à gauche."""
+
+
 @dataclass()
 class MathNode:
     operator: str
@@ -8,47 +12,101 @@ class MathNode:
     right: Any
 
 
-def parse_math_expression(tokens: list[str]) -> MathNode:
-    if len(tokens) == 1:
-        return tokens[0]
-    return MathNode(tokens[1], tokens[0], parse_math_expression(tokens[2:]))
-
-
-def get_math_expression(ast) -> int | float:
-    if type(ast) == str:
-        return float(ast)
-    if type(ast) != MathNode:
-        print("wtf is this type ??")
-        exit(1)
-    match ast.operator:
+def apply_operator(operator: str, left: float | bool, right: float | bool) -> float | bool:
+    match operator:
         case "+":
-            return get_math_expression(ast.left) + get_math_expression(ast.right)
+            return left + right
         case "-":
-            return get_math_expression(ast.left) - get_math_expression(ast.right)
+            return left - right
         case "*":
-            return get_math_expression(ast.left) * get_math_expression(ast.right)
+            return left * right
         case "/":
-            return get_math_expression(ast.left) / get_math_expression(ast.right)
+            return left / right
         case ">":
-            return get_math_expression(ast.left) > get_math_expression(ast.right)
+            return left > right
         case "<":
-            return get_math_expression(ast.left) < get_math_expression(ast.right)
+            return left < right
+    raise ValueError(f"unknown operator '{operator}'")
+
+
+def parse_math_expression(tokens: list[str]) -> MathNode | float | bool | str:
+    """Analyse les mots d'une expression en une seule passe (shunting-yard), selon la priorité
+    des opérateurs. Les sous-expressions constantes sont calculées directement, les opérandes
+    qui ne sont pas des nombres (ex: '{x}') sont laissées telles quelles."""
+    operands: list[MathNode | float | bool | str] = []
+    operators: list[str] = []
+
+    for i, token in enumerate(tokens):
+        if i % 2:
+            precedence = PRECEDENCES[token]
+            while operators and PRECEDENCES[operators[-1]] >= precedence:
+                _reduce(operands, operators.pop())
+            operators.append(token)
+        else:
+            try:
+                operands.append(float(token))
+            except ValueError:
+                operands.append(token)
+
+    while operators:
+        _reduce(operands, operators.pop())
+    return operands[0]
+
+
+def _reduce(operands: list, operator: str):
+    """Remplace les deux dernières opérandes par leur opération (calculée si elle est constante)."""
+    right = operands.pop()
+    left = operands.pop()
+    if type(left) is not MathNode and type(left) is not str\
+            and type(right) is not MathNode and type(right) is not str:
+        try:
+            operands.append(apply_operator(operator, left, right))
+            return
+        except ArithmeticError:
+            pass  # L'erreur sera levée au moment du calcul.
+    operands.append(MathNode(operator, left, right))
+
+
+def get_math_expression(ast) -> int | float:
+    """Calcule un arbre d'expression sans récursion."""
+    if type(ast) is not MathNode:
+        return float(ast)
+
+    stack: list[tuple[Any, bool]] = [(ast, False)]
+    values: list[float | bool] = []
+    while stack:
+        node, reduced = stack.pop()
+        if type(node) is not MathNode:
+            values.append(float(node))
+        elif reduced:
+            right = values.pop()
+            values.append(apply_operator(node.operator, values.pop(), right))
+        else:
+            stack.append((node, True))
+            stack.append((node.right, False))
+            stack.append((node.left, False))
+    return values[0]
 
 
 def math_expression(expression: str) -> float | int:
-    ast: MathNode = parse_math_expression(expression.split(" "))
+    ast = parse_math_expression(expression.split(" "))
     res: float = get_math_expression(ast)
-    if res == int(res):
-        return int(res)
-    return res
+    if type(res) is float and not res.is_integer():
+        return res  # Décimal ou non fini (nan, inf).
+    return int(res)
 
 
 def is_math_parsable(expression: str) -> bool:
-    for token in expression.split(" "):
-        if token in ["+", "-", "*", "/", ">", "<"]:
+    tokens = expression.split(" ")
+    if len(tokens) % 2 == 0:
+        return False
+    for i, token in enumerate(tokens):
+        if i % 2:
+            if token not in PRECEDENCES:
+                return False
             continue
         try:
             float(token)
-        except:
+        except ValueError:
             return False
     return True
@@ -0,0 +1,49 @@
+"""Tests de 'Interpreter.Optimizer' : un programme simplifié s’exécute comme l’original, avec chaque moteur."""
+from contextlib import redirect_stdout
+from io import StringIO
+
+import pytest
+
+from AST import ASTNodeIfElse, ASTNodePrint, ASTNodeSequence, ASTNodeVariableAssignment, ASTNodeVariableReturn,\
+	ASTNodeWhile, compile_program, parse_slot
+from Interpreter.Bytecode import compile_bytecode
+from Interpreter.Optimizer import optimize
+
+
+def run(engine: str, node: ASTNodeSequence) -> tuple[object, str]:
+	"""Renvoie la valeur de retour du programme et ce qu’il affiche."""
+	output = StringIO()
+	with redirect_stdout(output):
+		match engine:
+			case "reference":
+				value = node.execute({})
+			case "closures":
+				value = compile_program(node).run()
+			case "bytecode":
+				value = compile_bytecode(node).run()
+	return value, output.getvalue()
+
+
+def never(*elements) -> ASTNodeIfElse:
+	"""Bloc "if" qui n’est jamais pris (et sans "else") : le simplifier le retire."""
+	return ASTNodeIfElse(parse_slot("1 < 0"), ASTNodeSequence(list(elements)), [], None)
+
+
+STATEMENTS_IN_SLOTS: dict[str, ASTNodeSequence] = {
+	"print": ASTNodeSequence([ASTNodePrint(never(ASTNodePrint(parse_slot("1"))))]),
+	"assignment": ASTNodeSequence([
+		ASTNodeVariableAssignment("x", ASTNodeWhile(parse_slot("1 < 0"), ASTNodeSequence([]), False)),
+		ASTNodePrint(parse_slot("{x}"))]),
+	"return": ASTNodeSequence([ASTNodeVariableReturn(never())]),
+	"condition": ASTNodeSequence([
+		ASTNodeIfElse(never(), ASTNodeSequence([ASTNodePrint(parse_slot("a"))]), [],
+		              ASTNodeSequence([ASTNodePrint(parse_slot("b"))]))]),
+}
+
+
+@pytest.mark.parametrize("engine", ["reference", "closures", "bytecode"])
+@pytest.mark.parametrize("name", list(STATEMENTS_IN_SLOTS))
+def test_statement_removed_from_slot(name: str, engine: str):
+	"""Une instruction jamais exécutée dans un slot vaut None : elle n’est retirée que d’une séquence."""
+	node = STATEMENTS_IN_SLOTS[name]
+	assert run(engine, optimize(node)) == run("reference", node)